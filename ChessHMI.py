@@ -1,10 +1,20 @@
 import os
 import sys
 import tkinter as tk
-from tkinter import ttk, messagebox
+from datetime import date
+from tkinter import ttk, messagebox, filedialog
 from theme_ihm import setup_theme, BASE_BG, FONT_BODY
-from ChessRules import ChessRules
-from pieceEchec import Pion, Tour, Cavalier, Fou, Reine, Roi
+from ChessRules import ChessRules, START_FEN, move_start, move_end, move_promotion
+from pieceEchec import Pion, Tour, Cavalier, Fou, Reine, Roi, piece_depuis_code
+from plateau import INDEX_CASES, NOMS_CASES
+from pgn import write_game, move_to_san
+from search import TimeManager
+from clock import ChessClock, FISCHER, MODE_LABELS
+from engine import EngineWorker
+from evaluation import evaluate_white
+from book import OpeningBook
+from tablebase import Tablebases
+from skin_cache import piece_images
 
 class ChessHMI(tk.Frame):
     SKINS = {
@@ -13,8 +23,26 @@ class ChessHMI(tk.Frame):
         'Bois':      {'light_color': '#D2B48C', 'dark_color': '#8B5A2B', 'piece_images_dir': 'skins/bois'},
     }
 
+    # Temps de réflexion de l'ordinateur (secondes) quand la partie n'a pas de pendule
+    COMPUTER_MOVETIME = 3
+    # Réflexion sur le temps du joueur (secondes) : au-delà, le fil du moteur
+    # ne disputerait plus le GIL à la boucle Tk que pour un gain marginal
+    PONDER_MOVETIME = 5
+    EVAL_BAR_WIDTH = 200
+    ENGINE_POLL_MS = 50
+    # En dessous de ce temps restant (secondes), l'ordinateur joue immédiatement
+    ENGINE_PANIC_TIME = 2
+    # Redimensionnement : délai entre deux redessins, taille minimale et pas des cases (pixels)
+    RESIZE_DELAY_MS = 100
+    MIN_SQUARE_SIZE = 24
+    SQUARE_STEP = 4
+    # Livre d'ouvertures Polyglot, chargé s'il est présent
+    BOOK_PATH = 'books/book.bin'
+    # Tables de finales (python tablebase.py --generate all), utilisées si présentes
+    TABLEBASE_DIR = 'tablebases'
+
     def __init__(self, parent, time_control=None, input_mode="click only",
-                 skin='Classique', on_exit_callback=None):
+                 skin='Classique', on_exit_callback=None, computer=None, renderer='boutons'):
         super().__init__(parent, bg=BASE_BG)
         self.parent = parent
         self.on_exit_callback = on_exit_callback
@@ -28,12 +56,18 @@ class ChessHMI(tk.Frame):
         # Paramètres
         self.time_control = time_control
         self.input_mode   = input_mode
+        # 'boutons' : un tk.Button par case ; 'canevas' : cases et pièces dessinées sur un seul Canvas
+        self.renderer     = renderer
+        self.computer     = computer  # couleur jouée par l'ordinateur, ou None
+        # Recherche en arrière-plan, interrogée par after() (voir _poll_engine)
+        self.engine       = EngineWorker(tablebases=self._open_tablebases()) if computer else None
+        self.engine_request = None
+        self.book         = self._open_book(self.BOOK_PATH)
         self.current_skin = self.SKINS[skin]
 
         # Plateau et skins
         self.square_size = 60
         self.margin      = 20
-        self.piece_images = {}
         self._load_piece_images(self.current_skin['piece_images_dir'])
 
         # États du jeu
@@ -44,18 +78,20 @@ class ChessHMI(tk.Frame):
         self.move_number    = 1
         self.moves_list     = []
 
-        # Temps
+        # Temps : pendule monotone (voir clock.py), None sans contrôle de temps
         if time_control:
-            self.white_time, self.increment = self._parse_time_control(time_control)
-            self.black_time = self.white_time
+            initial, increment, mode = self._parse_time_control(time_control)
+            self.clock = ChessClock(int(initial * 1000), int(increment * 1000), mode)
         else:
-            self.white_time = self.black_time = 0
-            self.increment = 0
+            self.clock = None
+        self.timer_job   = None
+        self.clock_texts = {}
 
         # Construction de l’IHM
         self.pack(fill="both", expand=True)
         self.columnconfigure(0, weight=1)
         self.columnconfigure(1, weight=0)
+        self.rowconfigure(0, weight=1)
         self._build_board()
         self._build_side_panel()
 
@@ -66,26 +102,34 @@ class ChessHMI(tk.Frame):
         self.message_label.grid(row=2, column=0, columnspan=2, pady=(10,0))
 
         if time_control:
+            self.clock.start(self.rules.current_turn)
             self._update_timer()
+        if self.computer == self.rules.current_turn:
+            self.after(500, self._computer_move)
 
 
     def _load_piece_images(self, images_dir):
-        self.piece_images.clear()
+        # Images décodées une fois par (skin, taille) pour tout le processus (voir skin_cache.py)
+        self.piece_images = piece_images(self._resource_path(images_dir), self.square_size, master=self)
+
+
+
+    def _resource_path(self, path):
         if getattr(sys, 'frozen', False):
             base = sys._MEIPASS
         else:
             base = os.path.dirname(__file__)
-        full = os.path.join(base, images_dir)
-        for cls in ['Pion','Tour','Cavalier','Fou','Reine','Roi']:
-            for col in ['blanc','noir']:
-                fn = f"{col}_{cls.lower()}.png"
-                path = os.path.join(full, fn)
-                if os.path.exists(path):
-                    img = tk.PhotoImage(file=path)
-                    sw = max(1, img.width()  // self.square_size)
-                    sh = max(1, img.height() // self.square_size)
-                    self.piece_images[(cls, col)] = img.subsample(sw, sh)
+        return os.path.join(base, path)
+
+
+    def _open_book(self, path):
+        full = self._resource_path(path)
+        return OpeningBook(full) if os.path.exists(full) else None
+
 
+    def _open_tablebases(self):
+        tablebases = Tablebases(self._resource_path(self.TABLEBASE_DIR))
+        return tablebases if tablebases.max_pieces else None
 
 
     def _build_board(self):
@@ -97,70 +141,173 @@ class ChessHMI(tk.Frame):
             self.board_frame, width=cw, height=cw,
             bg=BASE_BG, highlightthickness=0
         )
-        self.board_canvas.pack()
+        self.board_canvas.pack(fill="both", expand=True)
         self.buttons = {}
+        self.resize_job  = None
+        self.resize_size = None
+        self._draw_board()
+        if self.renderer == 'canevas':
+            self.board_canvas.bind("<ButtonPress-1>",   self._on_canvas_press)
+            self.board_canvas.bind("<B1-Motion>",       self._on_canvas_drag)
+            self.board_canvas.bind("<ButtonRelease-1>", self._on_canvas_release)
+        self.board_canvas.bind("<Configure>", self._on_canvas_configure)
+
+
+    def _draw_board(self):
+        """
+        (Re)dessine le plateau entier à la taille de case courante.
+        """
+        self.board_canvas.delete("all")
+        # Code de la pièce affichée sur chaque case, pour ne repeindre que les différences ;
+        # -1 force le premier dessin de toutes les cases
+        self.shown_codes = [-1] * 64
+        if self.renderer == 'canevas':
+            self._build_canvas_board()
+        else:
+            self._build_buttons()
+        self._update_board()
+        half = self.margin // 2
+        for i in range(8):
+            x  = self.margin + i*self.square_size + self.square_size/2
+            y  = self.margin + 8*self.square_size + half
+            x2 = half
+            y2 = self.margin + i*self.square_size + self.square_size/2
+            self.board_canvas.create_text(x,  y,  text=chr(ord('a')+i), font=FONT_BODY)
+            self.board_canvas.create_text(x2, y2, text=str(8-i),       font=FONT_BODY)
+
+
+    def _on_canvas_configure(self, event):
+        # Pendant un redimensionnement à la souris, au plus un redessin toutes les RESIZE_DELAY_MS
+        self.resize_size = (event.width, event.height)
+        if self.resize_job is None:
+            self.resize_job = self.after(self.RESIZE_DELAY_MS, self._resize_board)
+
+
+    def _resize_board(self):
+        self.resize_job = None
+        if not self.winfo_exists():
+            return
+        width, height = self.resize_size
+        size = (min(width, height) - 2 * self.margin) // 8
+        # Tailles arrondies à SQUARE_STEP : moins de tailles distinctes à mettre en cache
+        size = max(self.MIN_SQUARE_SIZE, size - size % self.SQUARE_STEP)
+        if size == self.square_size:
+            return
+        self.square_size = size
+        self._load_piece_images(self.current_skin['piece_images_dir'])
+        self._draw_board()
+
+
+    def _build_buttons(self):
+        # Les boutons sont créés une fois puis replacés à chaque redessin
         for r in range(8):
             for c in range(8):
                 coord = self.rules.plateau.notation_lettre((r, c))
-                piece = self.rules.plateau[coord]
-                color = (
-                    self.current_skin['light_color']
-                    if (r + c) % 2 == 0
-                    else self.current_skin['dark_color']
-                )
-                btn = tk.Button(
-                    self.board_canvas, bg=color,
-                    width=self.square_size, height=self.square_size,
-                    relief='flat'
-                )
-                btn.coord = coord
-                if piece:
-                    key = (piece.__class__.__name__, piece.couleur)
-                    img = self.piece_images.get(key)
-                    if img:
-                        btn.config(image=img, text='')
-                        btn.image = img
-                    else:
-                        btn.config(text=str(piece), font=("Segoe UI",16))
-                if "click" in self.input_mode:
-                    btn.config(command=lambda c=coord: self._on_click(c))
-                if "drag" in self.input_mode:
-                    btn.bind("<ButtonPress-1>",   self._on_press)
-                    btn.bind("<B1-Motion>",       self._on_drag)
-                    btn.bind("<ButtonRelease-1>", self._on_release)
+                btn = self.buttons.get(coord)
+                if btn is None:
+                    color = (
+                        self.current_skin['light_color']
+                        if (r + c) % 2 == 0
+                        else self.current_skin['dark_color']
+                    )
+                    btn = tk.Button(
+                        self.board_canvas, bg=color, relief='flat', font=("Segoe UI",16)
+                    )
+                    btn.coord = coord
+                    if "click" in self.input_mode:
+                        btn.config(command=lambda c=coord: self._on_click(c))
+                    if "drag" in self.input_mode:
+                        btn.bind("<ButtonPress-1>",   self._on_press)
+                        btn.bind("<B1-Motion>",       self._on_drag)
+                        btn.bind("<ButtonRelease-1>", self._on_release)
+                    self.buttons[coord] = btn
                 x = self.margin + c*self.square_size + self.square_size/2
                 y = self.margin + r*self.square_size + self.square_size/2
                 self.board_canvas.create_window(
                     x, y, window=btn,
                     width=self.square_size, height=self.square_size
                 )
-                self.buttons[coord] = btn
-        half = self.margin // 2
-        for i in range(8):
-            x  = self.margin + i*self.square_size + self.square_size/2
-            y  = self.margin + 8*self.square_size + half
-            x2 = half
-            y2 = self.margin + i*self.square_size + self.square_size/2
-            self.board_canvas.create_text(x,  y,  text=chr(ord('a')+i), font=FONT_BODY)
-            self.board_canvas.create_text(x2, y2, text=str(8-i),       font=FONT_BODY)
+
+
+    def _build_canvas_board(self):
+        # Cases en rectangles et pièces en images du canevas : aucun widget par case
+        canvas = self.board_canvas
+        self.piece_items = [None] * 64
+        self.drag_item   = None
+        self.drag_start  = None
+        for index in range(64):
+            r, c = divmod(index, 8)
+            x = self.margin + c*self.square_size
+            y = self.margin + r*self.square_size
+            color = (
+                self.current_skin['light_color']
+                if (r + c) % 2 == 0
+                else self.current_skin['dark_color']
+            )
+            canvas.create_rectangle(x, y, x + self.square_size, y + self.square_size,
+                                    fill=color, width=0, tags="case")
+
+
+    def _square_center(self, index):
+        r, c = divmod(index, 8)
+        return (self.margin + c*self.square_size + self.square_size/2,
+                self.margin + r*self.square_size + self.square_size/2)
+
+
+    def _square_at(self, x, y):
+        # Case sous un point du canevas, par simple division
+        c = int((x - self.margin) // self.square_size)
+        r = int((y - self.margin) // self.square_size)
+        return NOMS_CASES[r*8 + c] if 0 <= r < 8 and 0 <= c < 8 else None
+
+
+    def _draw_piece(self, index, code):
+        canvas = self.board_canvas
+        if self.piece_items[index] is not None:
+            canvas.delete(self.piece_items[index])
+            self.piece_items[index] = None
+        p = piece_depuis_code(code)
+        if not p:
+            return
+        x, y = self._square_center(index)
+        img = self.piece_images.get((p.__class__.__name__, p.couleur))
+        if img:
+            self.piece_items[index] = canvas.create_image(x, y, image=img, tags="piece")
+        else:
+            self.piece_items[index] = canvas.create_text(x, y, text=str(p), font=("Segoe UI",16), tags="piece")
 
 
     def _build_side_panel(self):
         self.side_frame = ttk.Frame(self, padding=10)
         self.side_frame.grid(row=0, column=1, sticky="n")
+        # Barre d'évaluation : part blanche proportionnelle aux chances des Blancs
+        self.eval_canvas = tk.Canvas(
+            self.side_frame, width=self.EVAL_BAR_WIDTH, height=16,
+            bg="#333333", highlightthickness=1, highlightbackground="gray"
+        )
+        self.eval_canvas.pack(pady=(0,2))
+        self.eval_white = self.eval_canvas.create_rectangle(0, 0, self.EVAL_BAR_WIDTH // 2, 16,
+                                                            fill="white", width=0)
+        self.eval_label = ttk.Label(self.side_frame, text="0.00", font=FONT_BODY)
+        self.eval_label.pack(pady=(0,8))
+        self._update_eval_bar()
         self.moves_listbox = tk.Listbox(
-            self.side_frame, width=24, height=15, font=FONT_BODY
+            self.side_frame, width=30, height=15, font=FONT_BODY
         )
-        self.moves_listbox.pack(pady=(0,10))
+        self.moves_listbox.pack(pady=(0,4))
+        # Coups du livre dans la position courante
+        self.book_label = ttk.Label(self.side_frame, text="", font=FONT_BODY, wraplength=self.EVAL_BAR_WIDTH)
+        self.book_label.pack(pady=(0,10))
+        self._update_book_label()
         self.black_clock_label = ttk.Label(
             self.side_frame,
-            text=f"Noir: {self._format_time(self.black_time)}" if self.time_control else "Noir: N/A",
+            text=f"Noir: {self.clock.display('noir')}" if self.clock else "Noir: N/A",
             font=FONT_BODY
         )
         self.black_clock_label.pack(pady=5)
         self.white_clock_label = ttk.Label(
             self.side_frame,
-            text=f"Blanc: {self._format_time(self.white_time)}" if self.time_control else "Blanc: N/A",
+            text=f"Blanc: {self.clock.display('blanc')}" if self.clock else "Blanc: N/A",
             font=FONT_BODY
         )
         self.white_clock_label.pack(pady=5)
@@ -187,8 +334,14 @@ class ChessHMI(tk.Frame):
         )
         self.black_draw_btn.pack(side="left", expand=True)
 
+        ttk.Button(self.side_frame, text="Exporter PGN",
+                   command=self._export_pgn,
+                   style="TButton").pack(fill="x", pady=(10,0))
+
 
     def _on_click(self, coord):
+        if self.rules.current_turn == self.computer:
+            return
         if not self.selected_piece:
             piece = self.rules.plateau[coord]
             if piece and piece.couleur == self.rules.current_turn:
@@ -197,49 +350,123 @@ class ChessHMI(tk.Frame):
 
         start  = self.selected_piece
         piece  = self.rules.plateau[start]
+
+        if self.rules.is_valid_move(piece, start, coord):
+            self._play_move(start, coord)
+        else:
+            self._show_message("Coup invalide", "red")
+            self.after(3000, lambda: self._show_message(f"Tour des {self.rules.current_turn}", "black"))
+
+        self.selected_piece = None
+
+
+    def _play_move(self, start, coord, promotion=None):
+        piece  = self.rules.plateau[start]
         target = self.rules.plateau[coord]
         was_capture = bool(target and target.couleur != piece.couleur)
         moved = piece.couleur
+        self._cancel_draw()
 
-        if self.rules.is_valid_move(piece, start, coord):
-            self._cancel_draw()
+        # La levée d'ambiguïté se calcule sur la position avant le coup
+        notation = self.generate_move_notation(piece, start, coord, was_capture)
+        book_moves = [move for move, _ in self.book.moves(self.rules)] if self.book else []
+
+        # execute_move détecte toutes les fins de partie (game_status) et appelle _on_game_over
+        self.rules.execute_move(piece, start, coord, promotion)
+        if self.rules.game_over:
+            return
 
-            # Laisse ChessRules.execute_move gérer TOUTES les nulles
-            self.rules.execute_move(piece, start, coord)
-            self.rules.update_repetition()
-            if self.rules.game_over:
+        # Mise à jour IHM : seules les cases touchées par le coup sont repeintes
+        self._update_board(self.rules.changed_squares)
+        self._update_eval_bar()
+        self._update_book_label()
+
+        # Notation promotion
+        if isinstance(piece, Pion) and coord[1] in ('1','8'):
+            prom = self.rules.plateau[coord]
+            notation = f"{coord}={self.get_piece_letter(prom)}"
+        if self.rules.undo_stack[-1][0] in book_moves:
+            notation += " (livre)"
+
+        self._record_move(notation, moved)
+        if self.clock:
+            # Le temps passé dans ce traitement est compté au joueur qui vient de jouer
+            if not self.clock.press():
+                self.rules.game_over_callback(f"Temps: {'Noir' if moved == 'blanc' else 'Blanc'}")
                 return
+            self._restart_timer()
 
-            # Mise à jour IHM
-            self._update_board()
+        # Mat et pat ont déjà été traités par execute_move : reste l'annonce de l'échec
+        if self.rules.is_in_check(self.rules.current_turn):
+            self._show_message(f"Échec à {self.rules.current_turn}", "orange")
+        else:
+            self._show_message(f"Tour des {self.rules.current_turn}", "black")
 
-            # Notation promotion
-            if isinstance(piece, Pion) and coord[1] in ('1','8'):
-                prom = self.rules.plateau[coord]
-                notation = f"{coord}={self.get_piece_letter(prom)}"
-            else:
-                notation = self.generate_move_notation(piece, start, coord, was_capture)
+        if self.rules.current_turn == self.computer:
+            # Laisse Tk afficher le coup du joueur avant que l'ordinateur réfléchisse
+            self.after(50, self._computer_move)
+        elif self.engine:
+            # Réflexion sur le temps du joueur : la table de transposition servira au coup suivant
+            self.engine.ponder(START_FEN, self._played_moves(), self.PONDER_MOVETIME)
 
-            self._record_move(notation, moved)
-            self._add_increment(moved)
 
-            # Check/checkmate/stalemate
-            if self.rules.is_checkmate(self.rules.current_turn):
-                winner = "Noir" if self.rules.current_turn=='blanc' else "Blanc"
-                self._on_game_over(f"Échec et mat ! {winner} gagne !")
-                return
-            if self.rules.is_stalemate(self.rules.current_turn):
-                self._on_game_over("Pat ! Match nul !")
-                return
-            if self.rules.is_in_check(self.rules.current_turn):
-                self._show_message(f"Échec à {self.rules.current_turn}", "orange")
-            else:
-                self._show_message(f"Tour des {self.rules.current_turn}", "black")
+    def _update_eval_bar(self):
+        score = evaluate_white(self.rules)
+        share = 1 / (1 + 10 ** (-score / 400))
+        self.eval_canvas.coords(self.eval_white, 0, 0, int(self.EVAL_BAR_WIDTH * share), 16)
+        self.eval_label.config(text=f"{score / 100:+.2f}")
+
+
+    def _update_book_label(self):
+        moves = self.book.moves(self.rules) if self.book else []
+        if not moves:
+            self.book_label.config(text="Hors livre" if self.book else "")
+            return
+        total = sum(weight for _, weight in moves) or 1
+        names = ", ".join(f"{move_to_san(self.rules, move)} {100 * weight // total}%" for move, weight in moves[:5])
+        self.book_label.config(text=f"Livre : {names}")
+
+
+    def _computer_move(self):
+        if self.game_over or self.rules.current_turn != self.computer:
+            return
+        # Tant que la position est dans le livre, l'ordinateur joue sans réfléchir
+        move = self.book.choose(self.rules) if self.book else None
+        if move is not None:
+            start, end = NOMS_CASES[move_start(move)], NOMS_CASES[move_end(move)]
+            self._play_move(start, end, move_promotion(move) or None)
+            return
+        self._show_message("L'ordinateur réfléchit…", "blue")
+        if self.clock:
+            manager = TimeManager(remaining=self.clock.remaining_ms(self.computer) / 1000,
+                                  increment=self.clock.increment / 1000)
         else:
-            self._show_message("Coup invalide", "red")
-            self.after(3000, lambda: self._show_message(f"Tour des {self.rules.current_turn}", "black"))
+            manager = TimeManager(movetime=self.COMPUTER_MOVETIME)
+        # La recherche tourne dans le fil du moteur ; la boucle Tk relève ses messages
+        self.engine_request = self.engine.start_search(START_FEN, self._played_moves(), manager)
+        self.after(self.ENGINE_POLL_MS, self._poll_engine)
 
-        self.selected_piece = None
+
+    def _poll_engine(self):
+        if self.game_over:
+            return
+        for request, kind, result in self.engine.poll():
+            if request != self.engine_request:
+                continue
+            if kind == 'info':
+                self._show_message(f"L'ordinateur réfléchit… (profondeur {result.depth})", "blue")
+            elif kind == 'bestmove':
+                self.engine_request = None
+                if result.move is not None:
+                    start, end = NOMS_CASES[move_start(result.move)], NOMS_CASES[move_end(result.move)]
+                    self._play_move(start, end, move_promotion(result.move) or None)
+                return
+        self.after(self.ENGINE_POLL_MS, self._poll_engine)
+
+
+    def _played_moves(self):
+        # La pile d'annulation contient tous les coups joués depuis le début
+        return [entry[0] for entry in self.rules.undo_stack]
 
 
     def _on_press(self, event):
@@ -259,24 +486,69 @@ class ChessHMI(tk.Frame):
             if coord:
                 self._on_click(coord)
         else:
-            dest = None
-            for coord_, btn in self.buttons.items():
-                x1, y1 = btn.winfo_rootx(), btn.winfo_rooty()
-                x2, y2 = x1+btn.winfo_width(), y1+btn.winfo_height()
-                if x1 <= event.x_root <= x2 and y1 <= event.y_root <= y2:
-                    dest = coord_; break
+            canvas = self.board_canvas
+            dest = self._square_at(event.x_root - canvas.winfo_rootx(), event.y_root - canvas.winfo_rooty())
             if dest and self.selected_piece:
                 self._on_click(dest)
         self.selected_piece = None
         self.dragging = False
 
 
-    def _update_board(self):
-        for coord, btn in self.buttons.items():
-            p = self.rules.plateau[coord]
+    def _on_canvas_press(self, event):
+        self.drag_item = None
+        self.dragging = False
+        coord = self._square_at(event.x, event.y)
+        if not coord or "drag" not in self.input_mode or self.rules.current_turn == self.computer:
+            return
+        p = self.rules.plateau[coord]
+        if p and p.couleur == self.rules.current_turn:
+            self.drag_start = coord
+            self.drag_item = self.piece_items[INDEX_CASES[coord]]
+            self.board_canvas.tag_raise(self.drag_item)
+
+    def _on_canvas_drag(self, event):
+        # La pièce suit le pointeur : on déplace l'élément, rien n'est redessiné
+        if self.drag_item is not None:
+            self.dragging = True
+            self.board_canvas.coords(self.drag_item, event.x, event.y)
+
+    def _on_canvas_release(self, event):
+        coord = self._square_at(event.x, event.y)
+        if self.dragging:
+            # Retour sur la case de départ ; si le coup est joué, _update_board redessine les cases
+            self.board_canvas.coords(self.drag_item, *self._square_center(INDEX_CASES[self.drag_start]))
+        if self.dragging and coord != self.drag_start:
+            if coord:
+                self.selected_piece = self.drag_start
+                self._on_click(coord)
+        elif coord and "click" in self.input_mode:
+            self._on_click(coord)
+        self.drag_item = None
+        self.dragging = False
+
+
+    def _update_board(self, squares=None):
+        """
+        Repeint les cases d'indices `squares` (tout le plateau par défaut) ;
+        une case dont la pièce affichée n'a pas changé ne coûte aucun appel Tk.
+        """
+        cases = self.rules.plateau.cases
+        shown = self.shown_codes
+        changes = []
+        for index in (range(64) if squares is None else squares):
+            code = cases[index]
+            if shown[index] != code:
+                shown[index] = code
+                changes.append((index, code))
+        if self.renderer == 'canevas':
+            for index, code in changes:
+                self._draw_piece(index, code)
+            return
+        # Un seul configure par case, options regroupées
+        for index, code in changes:
+            btn, p = self.buttons[NOMS_CASES[index]], piece_depuis_code(code)
             if p:
-                key = (p.__class__.__name__, p.couleur)
-                img = self.piece_images.get(key)
+                img = self.piece_images.get((p.__class__.__name__, p.couleur))
                 if img:
                     btn.config(image=img, text='')
                     btn.image = img
@@ -307,12 +579,22 @@ class ChessHMI(tk.Frame):
             self.move_number += 1
 
 
-    def _add_increment(self, couleur):
-        if self.increment > 0:
-            if couleur == 'blanc':
-                self.white_time += self.increment
-            else:
-                self.black_time += self.increment
+    def _export_pgn(self):
+        path = filedialog.asksaveasfilename(
+            parent=self, defaultextension=".pgn", filetypes=[("Partie PGN", "*.pgn")]
+        )
+        if not path:
+            return
+        moves = self._played_moves()
+        headers = {
+            'Event': "Chess App",
+            'Date': date.today().strftime("%Y.%m.%d"),
+            'White': "Blanc",
+            'Black': "Noir",
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            write_game(f, moves, headers)
+        self._show_message("Partie exportée", "black")
 
 
     def _show_message(self, text, color):
@@ -370,31 +652,44 @@ class ChessHMI(tk.Frame):
             if 'min' in m:
                 mv *= 60
             iv = ''.join(ch for ch in inc if ch.isdigit() or ch == '.')
-            return int(mv), int(float(iv)) if iv else 0
+            # Mode d'incrément précisé entre parenthèses, ex. "Personnalisé - 3 min + 2s (Bronstein)"
+            mode = next((m for m, label in MODE_LABELS.items() if f"({label})" in inc), FISCHER)
+            return mv, float(iv) if iv else 0, mode
         except:
-            return 0, 0
-
-
-    def _format_time(self, sec):
-        return f"{sec//60:02d}:{sec%60:02d}"
+            return 0, 0, FISCHER
 
 
     def _update_timer(self):
+        """
+        Relève la pendule ; le prochain réveil est calé sur le prochain changement
+        d'affichage et un libellé n'est repeint que si son texte change.
+        """
+        self.timer_job = None
         if self.game_over: return
-        ct = self.rules.current_turn
-        if ct == 'blanc':
-            self.white_time -= 1
-            if self.white_time <= 0:
-                self.rules.game_over_callback("Temps: Noir")
-                return
-        else:
-            self.black_time -= 1
-            if self.black_time <= 0:
-                self.rules.game_over_callback("Temps: Blanc")
-                return
-        self.white_clock_label.config(text=f"Blanc: {self._format_time(self.white_time)}")
-        self.black_clock_label.config(text=f"Noir:  {self._format_time(self.black_time)}")
-        self.after(1000, self._update_timer)
+        ct = self.clock.turn
+        if ct is None:
+            return
+        if self.clock.flagged(ct):
+            self.clock.stop()
+            self.rules.game_over_callback("Temps: Noir" if ct == 'blanc' else "Temps: Blanc")
+            return
+        if self.engine_request is not None and ct == self.computer:
+            if self.clock.remaining_ms(ct) <= self.ENGINE_PANIC_TIME * 1000:
+                self.engine.stop()
+        for couleur, label, prefix in (('blanc', self.white_clock_label, "Blanc: "),
+                                       ('noir',  self.black_clock_label, "Noir: ")):
+            text = prefix + self.clock.display(couleur)
+            if self.clock_texts.get(couleur) != text:
+                self.clock_texts[couleur] = text
+                label.config(text=text)
+        self.timer_job = self.after(self.clock.next_change_ms(), self._update_timer)
+
+
+    def _restart_timer(self):
+        # La pendule a changé de camp : le réveil prévu pour l'autre camp ne vaut plus
+        if self.timer_job is not None:
+            self.after_cancel(self.timer_job)
+        self._update_timer()
 
 
     def ask_promotion_choice(self, couleur):
@@ -447,19 +742,29 @@ class ChessHMI(tk.Frame):
 
 
     def get_disambiguation(self, piece, start, end):
-        cands = [
-            c for c,p in self.rules.plateau.items()
-            if type(p)==type(piece)
-               and p.couleur==piece.couleur
-               and c!=start
-               and self.rules.is_legal(p, c, end)
-        ]
+        cases = self.rules.plateau.cases
+        start_idx, end_idx = INDEX_CASES[start], INDEX_CASES[end]
+        cands = {
+            NOMS_CASES[move_start(m)]
+            for m in self.rules.generate_legal_moves(piece.couleur)
+            if move_end(m) == end_idx
+               and move_start(m) != start_idx
+               and cases[move_start(m)] == piece.code
+        }
         if not cands: return ""
-        if any(c[0]!=start[0] for c in cands): return start[0]
-        return start[1]
+        if all(c[0]!=start[0] for c in cands): return start[0]
+        if all(c[1]!=start[1] for c in cands): return start[1]
+        return start
 
 
     def _on_game_over(self, reason):
+        if self.clock:
+            self.clock.stop()
+        if self.engine:
+            self.engine.shutdown()
+        if self.book:
+            self.book.close()
+            self.book = None
         messagebox.showinfo("Fin de partie", reason)
         self.disable_board()
         self.game_over = True
@@ -471,6 +776,9 @@ class ChessHMI(tk.Frame):
     def disable_board(self):
         for b in self.buttons.values():
             b.config(state=tk.DISABLED)
+        if self.renderer == 'canevas':
+            for sequence in ("<ButtonPress-1>", "<B1-Motion>", "<ButtonRelease-1>"):
+                self.board_canvas.unbind(sequence)
 
 
 if __name__=="__main__":
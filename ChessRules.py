@@ -1,48 +1,351 @@
-from pieceEchec import Pion, Tour, Cavalier, Fou, Reine, Roi
-from plateau import Plateau
+import json
+import logging
+
+from pieceEchec import (
+    Pion, Tour, Cavalier, Fou, Reine, Roi,
+    VIDE, PION, CAVALIER, FOU, TOUR, REINE, ROI, NOIR, MASQUE_TYPE,
+    couleur_code,
+)
+from plateau import (
+    Plateau, INDEX_CASES, NOMS_CASES, ENTRE, RAYONS_TOUR, RAYONS_FOU,
+)
+from zobrist import CLES_ROQUE, CLES_EN_PASSANT, CLE_TRAIT_NOIR
+
+# Journal du moteur de règles : muet tant que l'application ne configure pas logging
+logger = logging.getLogger(__name__)
+
+# Coups encodés en entier : départ | arrivée << 6 | promotion << 12 | type << 15
+MOVE_NORMAL, MOVE_DOUBLE_PUSH, MOVE_EN_PASSANT, MOVE_CASTLING = range(4)
+PROMOTION_TYPES = (REINE, TOUR, FOU, CAVALIER)
+
+# Droits de roque sous forme de masque de bits
+CASTLE_WHITE_KING, CASTLE_WHITE_QUEEN, CASTLE_BLACK_KING, CASTLE_BLACK_QUEEN = 1, 2, 4, 8
+CASTLING_BITS = {
+    'blanc': {'king_side': CASTLE_WHITE_KING, 'queen_side': CASTLE_WHITE_QUEEN},
+    'noir': {'king_side': CASTLE_BLACK_KING, 'queen_side': CASTLE_BLACK_QUEEN},
+}
+# Droits conservés quand une pièce quitte ou atteint la case (roi ou tour d'origine)
+CASTLING_MASK = [15] * 64
+CASTLING_MASK[60] = 15 & ~(CASTLE_WHITE_KING | CASTLE_WHITE_QUEEN)
+CASTLING_MASK[63] = 15 & ~CASTLE_WHITE_KING
+CASTLING_MASK[56] = 15 & ~CASTLE_WHITE_QUEEN
+CASTLING_MASK[4] = 15 & ~(CASTLE_BLACK_KING | CASTLE_BLACK_QUEEN)
+CASTLING_MASK[7] = 15 & ~CASTLE_BLACK_KING
+CASTLING_MASK[0] = 15 & ~CASTLE_BLACK_QUEEN
+
+# Lettres FEN des pièces (majuscules pour les blancs) et codes correspondants
+FEN_CODES = {
+    lettre: piece_type | couleur
+    for couleur, lettres in ((0, 'PNBRQK'), (NOIR, 'pnbrqk'))
+    for piece_type, lettre in zip((PION, CAVALIER, FOU, TOUR, REINE, ROI), lettres)
+}
+FEN_LETTERS = {code: lettre for lettre, code in FEN_CODES.items()}
+FEN_CASTLING = (('K', CASTLE_WHITE_KING), ('Q', CASTLE_WHITE_QUEEN), ('k', CASTLE_BLACK_KING), ('q', CASTLE_BLACK_QUEEN))
+START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+# Fins de partie renvoyées par game_status() et message annoncé pour chacune
+GAME_OVER_MESSAGES = {
+    'fifty_moves': "Match nul par règle des 50 coups !",
+    'repetition': "Match nul par répétition triple !",
+    'insufficient_material': "Match nul par matériel insuffisant !",
+    'checkmate': "Checkmate! {winner} gagne!",
+    'stalemate': "Pat! Match nul!",
+}
+
+# Motifs de refus d'un coup (clé de la trace JSON -> libellé du journal)
+REJECT_REASONS = {
+    'same_square': "la pièce ne peut pas rester sur place",
+    'wrong_turn': "ce n'est pas le tour de cette pièce",
+    'own_piece': "case occupée par une pièce alliée",
+    'illegal_pattern': "la pièce ne peut pas se déplacer ainsi",
+    'king_in_check': "ce coup laisse votre roi en échec",
+}
+
+
+def encode_move(start, end, promotion=VIDE, flag=MOVE_NORMAL):
+    return start | (end << 6) | (promotion << 12) | (flag << 15)
+
+
+def move_start(move):
+    return move & 63
+
+
+def move_end(move):
+    return (move >> 6) & 63
+
+
+def move_promotion(move):
+    return (move >> 12) & 7
+
+
+def move_flag(move):
+    return move >> 15
+
+
+def move_squares(move):
+    """
+    Indices des cases modifiées par un coup encodé : départ, arrivée, et case
+    du pion pris en passant ou cases de la tour pour un roque.
+    """
+    start, end = move_start(move), move_end(move)
+    flag = move_flag(move)
+    if flag == MOVE_EN_PASSANT:
+        return start, end, (start & ~7) | (end & 7)
+    if flag == MOVE_CASTLING:
+        return (start, end, start + 3, start + 1) if end > start else (start, end, start - 4, start - 1)
+    return start, end
+
+
+def move_to_uci(move):
+    """
+    Notation UCI d'un coup encodé (ex. "e2e4", "e7e8q").
+    """
+    promotion = move_promotion(move)
+    return NOMS_CASES[move_start(move)] + NOMS_CASES[move_end(move)] + ' pnbrqk'[promotion].strip()
+
 
 class ChessRules:
     """
     Classe pour gérer les règles du jeu d'échecs, y compris les mouvements spéciaux.
     """
 
-    def __init__(self):
-        self.plateau = Plateau()
+    def __init__(self, representation='tableau', fen=None):
+        """
+        `representation` choisit la structure interne du plateau :
+        'tableau' (64 cases) ou 'bitboard' (tableau + bitboards, voir bitboard.py).
+        `fen` met directement en place une position (par défaut la position initiale).
+        """
+        if representation == 'bitboard':
+            # Import différé : les tables d'attaques ne sont construites qu'à la demande
+            from bitboard import PlateauBitboard
+            self.plateau = PlateauBitboard()
+        elif representation == 'tableau':
+            self.plateau = Plateau()
+        else:
+            raise ValueError(f"Représentation inconnue : {representation}")
         self.current_turn = 'blanc'
-        self.en_passant_target = None
-        self.castling_rights = {
-            'blanc': {'king_side': True, 'queen_side': True},
-            'noir': {'king_side': True, 'queen_side': True}
-        }
+        self.ep_square = -1
+        self.castling = 15
         self.move_counter = 0
+        self.fullmove_number = 1
+        self.undo_stack = []
+        self.hash = 0
+        # Hachages des positions de la partie (un par demi-coup, le dernier est l'actuel)
+        self.hash_history = []
         self.game_over = False
-        self.positions_history = {}
         self.game_over_callback = None
-        self.initialize_pieces()
+        self.promotion_callback = None
+        self._attack_maps_hash = None
+        self._attack_maps = {}
+        # Flux texte recevant la trace JSON lines des coups refusés (voir set_trace)
+        self.trace = None
+        # Cases modifiées par le dernier execute_move (tout le plateau après une mise en place)
+        self.changed_squares = tuple(range(64))
+        if fen is None:
+            self.initialize_pieces()
+            self.reset_hash()
+        else:
+            self.set_fen(fen)
 
+    @classmethod
+    def from_fen(cls, fen, representation='tableau'):
+        """
+        Crée des règles directement dans la position FEN donnée,
+        sans passer par la position initiale.
+        """
+        return cls(representation, fen=fen)
 
-    def get_board_state(self):
-        state = []
-        for square in sorted(self.plateau.keys()):
-            piece = self.plateau[square]
-            if piece:
-                state.append(f"{square}:{piece.__class__.__name__}_{piece.couleur}")
-            else:
-                state.append(f"{square}:None")
-        state.append(f"turn:{self.current_turn}")
-        state.append(f"en_passant:{self.en_passant_target}")
-        state.append(f"castling:{self.castling_rights}")
-        return ";".join(state)
-    
-    def update_repetition(self):
-        state = self.get_board_state()
-        self.positions_history[state] = self.positions_history.get(state, 0) + 1
-        if self.positions_history[state] >= 3:
-            if self.game_over_callback:
-                self.game_over_callback("Match nul par répétition triple !")
+    def set_fen(self, fen):
+        """
+        Remplace la position courante par la position FEN donnée : plateau,
+        trait, droits de roque, case en passant, compteur de demi-coups et
+        numéro du coup. Lève ValueError si la chaîne est mal formée.
+        """
+        fields = fen.split()
+        if len(fields) < 4:
+            raise ValueError(f"FEN invalide (champs manquants) : {fen}")
+        placement, turn, castling, en_passant = fields[:4]
+
+        plateau = self.plateau
+        plateau.initialiser_plateau()
+        poser = plateau.poser
+        index = 0
+        rank_end = 8
+        for char in placement:
+            if char == '/':
+                if index != rank_end:
+                    raise ValueError(f"FEN invalide (rangée incomplète) : {fen}")
+                rank_end += 8
+            elif '1' <= char <= '8':
+                index += ord(char) - 48
             else:
-                print("GAME OVER: Match nul par répétition triple !")
-            self.game_over = True
+                code = FEN_CODES.get(char)
+                if code is None or index >= rank_end:
+                    raise ValueError(f"FEN invalide (placement) : {fen}")
+                poser(index, code)
+                index += 1
+        if index != 64 or rank_end != 64:
+            raise ValueError(f"FEN invalide (placement) : {fen}")
+
+        if turn == 'w':
+            self.current_turn = 'blanc'
+        elif turn == 'b':
+            self.current_turn = 'noir'
+        else:
+            raise ValueError(f"FEN invalide (trait) : {fen}")
+
+        self.castling = 0
+        if castling != '-':
+            for letter, bit in FEN_CASTLING:
+                if letter in castling:
+                    self.castling |= bit
+
+        if en_passant == '-':
+            self.ep_square = -1
+        elif en_passant in INDEX_CASES:
+            self.ep_square = INDEX_CASES[en_passant]
+        else:
+            raise ValueError(f"FEN invalide (en passant) : {fen}")
+
+        try:
+            self.move_counter = int(fields[4]) if len(fields) > 4 else 0
+            self.fullmove_number = int(fields[5]) if len(fields) > 5 else 1
+        except ValueError:
+            raise ValueError(f"FEN invalide (compteurs) : {fen}") from None
+
+        self.undo_stack = []
+        self.game_over = False
+        self.changed_squares = tuple(range(64))
+        self.reset_hash()
+
+    def to_fen(self):
+        """
+        Position courante au format FEN.
+        """
+        cases = self.plateau.cases
+        ranks = []
+        for rank_start in range(0, 64, 8):
+            rank = ''
+            empty = 0
+            for code in cases[rank_start:rank_start + 8]:
+                if code:
+                    if empty:
+                        rank += str(empty)
+                        empty = 0
+                    rank += FEN_LETTERS[code]
+                else:
+                    empty += 1
+            if empty:
+                rank += str(empty)
+            ranks.append(rank)
+        castling = ''.join(letter for letter, bit in FEN_CASTLING if self.castling & bit) or '-'
+        return ' '.join((
+            '/'.join(ranks),
+            'w' if self.current_turn == 'blanc' else 'b',
+            castling,
+            self.en_passant_target or '-',
+            str(self.move_counter),
+            str(self.fullmove_number),
+        ))
+
+
+    @property
+    def en_passant_target(self):
+        """
+        Case cible de la prise en passant en notation algébrique (ou None).
+        """
+        return NOMS_CASES[self.ep_square] if self.ep_square >= 0 else None
+
+    @en_passant_target.setter
+    def en_passant_target(self, square):
+        self.ep_square = INDEX_CASES[square] if square else -1
+        self._rehash()
+
+    @property
+    def castling_rights(self):
+        """
+        Vue dictionnaire des droits de roque, construite depuis le masque `castling`.
+        """
+        return {
+            couleur: {side: bool(self.castling & bit) for side, bit in sides.items()}
+            for couleur, sides in CASTLING_BITS.items()
+        }
+
+    @castling_rights.setter
+    def castling_rights(self, rights):
+        self.castling = sum(
+            bit
+            for couleur, sides in CASTLING_BITS.items()
+            for side, bit in sides.items()
+            if rights[couleur][side]
+        )
+        self._rehash()
+
+    def set_piece(self, square, piece):
+        """
+        Modifie une case après la mise en place (éditeur de position, tests).
+        Écrire directement dans self.plateau laisserait le hachage et les
+        cartes d'attaque en cache périmés : passer par cette méthode.
+        """
+        self.plateau[square] = piece
+        self._rehash()
+
+    def _compute_hash(self):
+        """
+        Combine la part "pièces" tenue par le plateau avec le trait,
+        les droits de roque et la colonne en passant.
+        """
+        key = self.plateau.cle ^ CLES_ROQUE[self.castling]
+        if self.current_turn == 'noir':
+            key ^= CLE_TRAIT_NOIR
+        ep = self.ep_square
+        if ep >= 0:
+            # La colonne n'entre dans la clé que si la prise est réellement possible
+            pawn = PION | (NOIR if ep >= 32 else 0)
+            cases = self.plateau.cases
+            behind = ep - 8 if ep >= 32 else ep + 8
+            if ((ep & 7) > 0 and cases[behind - 1] == pawn) or ((ep & 7) < 7 and cases[behind + 1] == pawn):
+                key ^= CLES_EN_PASSANT[ep & 7]
+        return key
+
+    def reset_hash(self):
+        """
+        Recalcule le hachage après une mise en place de la position et
+        repart d'un historique de répétitions ne contenant qu'elle.
+        """
+        self.hash = self._compute_hash()
+        self.hash_history = [self.hash]
+
+    def _rehash(self):
+        """
+        Recalcule le hachage après une modification directe de la position,
+        qui remplace la position courante dans l'historique des répétitions.
+        """
+        self.hash = self._compute_hash()
+        self.hash_history[-1] = self.hash
+        self._attack_maps_hash = None
+
+    def get_board_state(self):
+        """
+        Identifiant de la position pour la répétition : son hachage de Zobrist.
+        """
+        return self.hash
+
+    def is_repetition(self, count=2):
+        """
+        Indique si la position actuelle est déjà apparue `count - 1` fois sur le
+        chemin de coups courant. Seules les positions depuis le dernier coup
+        irréversible (et avec le même trait) sont examinées.
+        """
+        history = self.hash_history
+        current = history[-1]
+        seen = 1
+        for index in range(len(history) - 3, max(-1, len(history) - 2 - self.move_counter), -2):
+            if history[index] == current:
+                seen += 1
+                if seen >= count:
+                    return True
+        return False
 
     def initialize_pieces(self):
         # Pièces blanches
@@ -79,215 +382,235 @@ class ChessRules:
         if start == end:
             return False
 
+        cases = self.plateau.cases
+        start_idx, end_idx = INDEX_CASES[start], INDEX_CASES[end]
+
         # On ne peut pas capturer une pièce de même couleur
-        target_piece = self.plateau[end]
-        if target_piece and target_piece.couleur == piece.couleur:
+        target_code = cases[end_idx]
+        if target_code and (target_code & NOIR) == couleur_code(piece.couleur):
             return False
 
-        # Récupération des coordonnées
-        start_row, start_col = self.plateau.notation_nombre(start)
-        end_row, end_col = self.plateau.notation_nombre(end)
-
         # Vérifier que le déplacement respecte les règles spécifiques de la pièce
-        if isinstance(piece, Pion):
-            if not self.is_valid_pawn_move(start_row, start_col, end_row, end_col, piece.couleur):
-                return False
-        elif isinstance(piece, Tour):
-            if not self.is_valid_rook_move(start_row, start_col, end_row, end_col):
-                return False
-        elif isinstance(piece, Cavalier):
-            if not self.is_valid_knight_move(start_row, start_col, end_row, end_col):
-                return False
-        elif isinstance(piece, Fou):
-            if not self.is_valid_bishop_move(start_row, start_col, end_row, end_col):
-                return False
-        elif isinstance(piece, Reine):
-            if not self.is_valid_queen_move(start_row, start_col, end_row, end_col):
-                return False
-        elif isinstance(piece, Roi):
-            if not self.is_valid_king_move(start_row, start_col, end_row, end_col):
-                return False
+        if not self._is_valid_piece_move(piece, start_idx, end_idx):
+            return False
 
         # Simulation du coup pour vérifier que le roi n'est pas en échec après le mouvement
-        original_piece = self.plateau[end]
-        self.plateau[end] = piece
-        self.plateau[start] = None
-        result = not self.is_in_check(piece.couleur)
-        # Restauration de l'état initial, même en cas d'erreur
-        self.plateau[start] = piece
-        self.plateau[end] = original_piece
+        self.make_move(self._encode_move(start_idx, end_idx))
+        try:
+            result = not self.is_in_check(piece.couleur)
+        finally:
+            # Restauration de l'état initial, même en cas d'erreur
+            self.unmake_move()
 
         return result
 
+    def _encode_move(self, start_idx, end_idx, promotion=REINE):
+        """
+        Encode le déplacement start -> end en déduisant son type de la position
+        (double pas, prise en passant, roque, promotion).
+        """
+        piece_type = self.plateau.cases[start_idx] & MASQUE_TYPE
+        if piece_type == PION:
+            if abs(end_idx - start_idx) == 16:
+                return encode_move(start_idx, end_idx, flag=MOVE_DOUBLE_PUSH)
+            if end_idx == self.ep_square and (end_idx - start_idx) & 7:
+                return encode_move(start_idx, end_idx, flag=MOVE_EN_PASSANT)
+            if end_idx < 8 or end_idx >= 56:
+                return encode_move(start_idx, end_idx, promotion)
+        elif piece_type == ROI and abs(end_idx - start_idx) == 2:
+            return encode_move(start_idx, end_idx, flag=MOVE_CASTLING)
+        return encode_move(start_idx, end_idx)
+
+    def make_move(self, move):
+        """
+        Joue un coup encodé (voir encode_move) sans vérifier sa légalité et
+        empile de quoi l'annuler avec unmake_move().
+        """
+        cases = self.plateau.cases
+        poser = self.plateau.poser
+        start, end = move & 63, (move >> 6) & 63
+        flag = move >> 15
+        moving = cases[start]
+        captured = cases[end]
+
+        if flag == MOVE_EN_PASSANT:
+            captured_idx = (start & ~7) | (end & 7)
+            captured = cases[captured_idx]
+            poser(captured_idx, VIDE)
+        elif flag == MOVE_CASTLING:
+            if end > start:
+                poser(start + 1, cases[start + 3])
+                poser(start + 3, VIDE)
+            else:
+                poser(start - 1, cases[start - 4])
+                poser(start - 4, VIDE)
+
+        self.undo_stack.append((move, captured, self.castling, self.ep_square, self.move_counter, self.hash))
+
+        promotion = (move >> 12) & 7
+        poser(start, VIDE)
+        poser(end, (promotion | (moving & NOIR)) if promotion else moving)
+
+        self.castling &= CASTLING_MASK[start] & CASTLING_MASK[end]
+        self.ep_square = (start + end) >> 1 if flag == MOVE_DOUBLE_PUSH else -1
+        if (moving & MASQUE_TYPE) == PION or captured:
+            self.move_counter = 0
+        else:
+            self.move_counter += 1
+        if self.current_turn == 'noir':
+            self.fullmove_number += 1
+        self.current_turn = 'noir' if self.current_turn == 'blanc' else 'blanc'
+        self.hash = self._compute_hash()
+        self.hash_history.append(self.hash)
+
+    def unmake_move(self):
+        """
+        Annule le dernier coup joué avec make_move() et le retourne.
+        """
+        move, captured, self.castling, self.ep_square, self.move_counter, self.hash = self.undo_stack.pop()
+        self.current_turn = 'noir' if self.current_turn == 'blanc' else 'blanc'
+        if self.current_turn == 'noir':
+            self.fullmove_number -= 1
+        self.hash_history.pop()
+
+        cases = self.plateau.cases
+        poser = self.plateau.poser
+        start, end = move & 63, (move >> 6) & 63
+        flag = move >> 15
+        moved = cases[end]
+        if (move >> 12) & 7:
+            moved = PION | (moved & NOIR)
+        poser(start, moved)
+
+        if flag == MOVE_EN_PASSANT:
+            poser(end, VIDE)
+            poser((start & ~7) | (end & 7), captured)
+        else:
+            poser(end, captured)
+            if flag == MOVE_CASTLING:
+                if end > start:
+                    poser(start + 3, cases[start + 1])
+                    poser(start + 1, VIDE)
+                else:
+                    poser(start - 4, cases[start - 1])
+                    poser(start - 1, VIDE)
+        return move
+
+    def _is_valid_piece_move(self, piece, start_idx, end_idx):
+        """
+        Applique la règle de déplacement propre au type de la pièce.
+        """
+        start_row, start_col = divmod(start_idx, 8)
+        end_row, end_col = divmod(end_idx, 8)
+        piece_type = piece.type_code
+
+        if piece_type == PION:
+            return self.is_valid_pawn_move(start_row, start_col, end_row, end_col, piece.couleur)
+        if piece_type == TOUR:
+            return self.is_valid_rook_move(start_row, start_col, end_row, end_col)
+        if piece_type == CAVALIER:
+            return self.is_valid_knight_move(start_row, start_col, end_row, end_col)
+        if piece_type == FOU:
+            return self.is_valid_bishop_move(start_row, start_col, end_row, end_col)
+        if piece_type == REINE:
+            return self.is_valid_queen_move(start_row, start_col, end_row, end_col)
+        if piece_type == ROI:
+            return self.is_valid_king_move(start_row, start_col, end_row, end_col)
+        return False
+
 
     def is_valid_move(self, piece, start, end):
         """
         Vérifie si un mouvement est valide pour la pièce donnée,
         en tenant compte de son type et de la possibilité d'échec.
         """
-        print(f"DEBUG: Tour actuel: {self.current_turn}, Pièce: {piece}, Déplacement: {start} -> {end}")
+        logger.debug("Tour actuel : %s, pièce : %s, déplacement : %s -> %s", self.current_turn, piece, start, end)
 
         # Vérifications de base
         if start == end:
-            print(f"Mouvement invalide : la pièce ne peut pas rester sur place ({start} -> {end})")
-            return False
+            return self._reject('same_square', piece, start, end)
 
         if piece.couleur != self.current_turn:
-            print(f"Mouvement invalide : ce n'est pas le tour de cette pièce ({start} -> {end}).")
-            return False
+            return self._reject('wrong_turn', piece, start, end)
 
-        target_piece = self.plateau[end]
-        if target_piece and target_piece.couleur == piece.couleur:
-            print(f"Mouvement invalide : case occupée par une pièce alliée ({start} -> {end}).")
-            return False
+        cases = self.plateau.cases
+        start_idx, end_idx = INDEX_CASES[start], INDEX_CASES[end]
 
-        # Règles spécifiques selon le type de pièce
-        start_row, start_col = self.plateau.notation_nombre(start)
-        end_row, end_col = self.plateau.notation_nombre(end)
+        target_code = cases[end_idx]
+        if target_code and (target_code & NOIR) == couleur_code(piece.couleur):
+            return self._reject('own_piece', piece, start, end)
 
-        if isinstance(piece, Pion):
-            if not self.is_valid_pawn_move(start_row, start_col, end_row, end_col, piece.couleur):
-                print("Mouvement invalide : le pion ne peut pas se déplacer ainsi.")
-                return False
-        elif isinstance(piece, Tour):
-            if not self.is_valid_rook_move(start_row, start_col, end_row, end_col):
-                print("Mouvement invalide : la tour ne peut pas se déplacer ainsi.")
-                return False
-        elif isinstance(piece, Cavalier):
-            if not self.is_valid_knight_move(start_row, start_col, end_row, end_col):
-                print("Mouvement invalide : le cavalier ne peut pas se déplacer ainsi.")
-                return False
-        elif isinstance(piece, Fou):
-            if not self.is_valid_bishop_move(start_row, start_col, end_row, end_col):
-                print("Mouvement invalide : le fou ne peut pas se déplacer ainsi.")
-                return False
-        elif isinstance(piece, Reine):
-            if not self.is_valid_queen_move(start_row, start_col, end_row, end_col):
-                print("Mouvement invalide : la reine ne peut pas se déplacer ainsi.")
-                return False
-        elif isinstance(piece, Roi):
-            if not self.is_valid_king_move(start_row, start_col, end_row, end_col):
-                print("Mouvement invalide : le roi ne peut pas se déplacer ainsi.")
-                return False
-        else:
-            return False
+        # Règles spécifiques selon le type de pièce
+        if not self._is_valid_piece_move(piece, start_idx, end_idx):
+            return self._reject('illegal_pattern', piece, start, end)
 
         # Simulation du coup pour vérifier que le roi n'est pas en échec.
-        original_piece = self.plateau[end]
-        # Sauvegarde de l'état initial
-        self.plateau[start], self.plateau[end] = None, piece
+        self.make_move(self._encode_move(start_idx, end_idx))
         try:
             if self.is_in_check(piece.couleur):
-                print("Mouvement invalide : ce coup laisse votre roi en échec.")
-                return False
+                return self._reject('king_in_check', piece, start, end)
         finally:
             # Restauration de l'état initial
-            self.plateau[start], self.plateau[end] = piece, original_piece
+            self.unmake_move()
 
-        print(f"Mouvement valide : {start} -> {end}")
+        logger.debug("Mouvement valide : %s -> %s", start, end)
         return True
+
+    def set_trace(self, stream):
         """
-        Vérifie si un mouvement est valide pour la pièce donnée,
-        en tenant compte de son type et de la possibilité d'échec.
+        Active la trace des coups refusés (une ligne JSON par refus) sur un
+        flux texte ouvert, ou la désactive avec None.
         """
-        print(f"DEBUG: Tour actuel: {self.current_turn}, Pièce: {piece}, Déplacement: {start} -> {end}")
-
-        # 1) Vérifications de base
-        if start == end:
-            print(f"Mouvement invalide : la pièce ne peut pas rester sur place ({start} -> {end})")
-            return False
-
-        if piece.couleur != self.current_turn:
-            print(f"Mouvement invalide : ce n'est pas le tour de cette pièce ({start} -> {end}).")
-            return False
-
-        target_piece = self.plateau[end]
-        if target_piece and target_piece.couleur == piece.couleur:
-            print(f"Mouvement invalide : tentative de déplacement sur une case occupée par une pièce alliée ({start} -> {end}).")
-            return False
-
-        # 2) Vérification du déplacement propre à chaque type de pièce
-        start_row, start_col = self.plateau.notation_nombre(start)
-        end_row, end_col = self.plateau.notation_nombre(end)
+        self.trace = stream
 
-        if isinstance(piece, Pion):
-            if not self.is_valid_pawn_move(start_row, start_col, end_row, end_col, piece.couleur):
-                print("Mouvement invalide : le pion ne peut pas se déplacer ainsi.")
-                return False
-        elif isinstance(piece, Tour):
-            if not self.is_valid_rook_move(start_row, start_col, end_row, end_col):
-                print("Mouvement invalide : la tour ne peut pas se déplacer ainsi (ligne/colonne obstruée ?).")
-                return False
-        elif isinstance(piece, Cavalier):
-            if not self.is_valid_knight_move(start_row, start_col, end_row, end_col):
-                print("Mouvement invalide : le cavalier ne peut pas se déplacer ainsi.")
-                return False
-        elif isinstance(piece, Fou):
-            if not self.is_valid_bishop_move(start_row, start_col, end_row, end_col):
-                print("Mouvement invalide : le fou ne peut pas se déplacer ainsi (diagonale obstruée ?).")
-                return False
-        elif isinstance(piece, Reine):
-            if not self.is_valid_queen_move(start_row, start_col, end_row, end_col):
-                print("Mouvement invalide : la reine ne peut pas se déplacer ainsi.")
-                return False
-        elif isinstance(piece, Roi):
-            if not self.is_valid_king_move(start_row, start_col, end_row, end_col):
-                print("Mouvement invalide : le roi ne peut pas se déplacer ainsi.")
-                return False
-        else:
-            # Type de pièce inconnu ?
-            return False
-
-        # 3) Simuler le coup pour vérifier si le roi reste (ou devient) en échec
-        original_piece = self.plateau[end]
-        self.plateau[end] = piece
-        self.plateau[start] = None
-
-        if self.is_in_check(piece.couleur):
-            # On remet le plateau dans son état initial
-            self.plateau[start] = piece
-            self.plateau[end] = original_piece
-            print("Mouvement invalide : ce coup laisse votre roi en échec.")
-            return False
-
-        # On restaure avant de renvoyer True (le mouvement est légal)
-        self.plateau[start] = piece
-        self.plateau[end] = original_piece
-
-        print(f"Mouvement valide : {start} -> {end}")
-        return True
+    def _reject(self, reason, piece, start, end):
+        """
+        Journalise le refus d'un coup et renvoie False.
+        """
+        logger.debug("Mouvement invalide (%s) : %s %s -> %s", REJECT_REASONS[reason], piece, start, end)
+        if self.trace is not None:
+            self.trace.write(json.dumps({
+                'reason': reason,
+                'turn': self.current_turn,
+                'piece': piece.__class__.__name__.lower(),
+                'color': piece.couleur,
+                'start': start,
+                'end': end,
+                'hash': format(self.hash, '016x'),
+            }) + '\n')
+        return False
 
 
     def is_valid_pawn_move(self, start_row, start_col, end_row, end_col, couleur):
         """
         Vérifie si un mouvement de pion est valide, y compris en passant.
         """
+        cases = self.plateau.cases
         direction = -1 if couleur == 'blanc' else 1  # Blanc va vers le haut, noir vers le bas
+        end_idx = end_row * 8 + end_col
 
         # Mouvement normal (1 case vers l'avant)
         if end_col == start_col and end_row == start_row + direction:
-            return self.plateau[self.plateau.notation_lettre((end_row, end_col))] is None
+            return cases[end_idx] == VIDE
 
         # Double mouvement (2 cases vers l'avant au premier coup)
         if end_col == start_col and end_row == start_row + 2 * direction:
             if (couleur == 'blanc' and start_row == 6) or (couleur == 'noir' and start_row == 1):
-                intermediate_pos = (start_row + direction, start_col)
-                return (
-                    self.plateau[self.plateau.notation_lettre(intermediate_pos)] is None and
-                    self.plateau[self.plateau.notation_lettre((end_row, end_col))] is None
-                )
+                intermediate_idx = (start_row + direction) * 8 + start_col
+                return cases[intermediate_idx] == VIDE and cases[end_idx] == VIDE
             return False
 
         # Capture (diagonale)
         if abs(end_col - start_col) == 1 and end_row == start_row + direction:
-            target_piece = self.plateau[self.plateau.notation_lettre((end_row, end_col))]
-            if target_piece is not None and target_piece.couleur != couleur:
+            own_color = couleur_code(couleur)
+            target_code = cases[end_idx]
+            if target_code and (target_code & NOIR) != own_color:
                 return True
 
             # En passant
-            if self.en_passant_target == self.plateau.notation_lettre((end_row, end_col)):
-                captured_pawn_pos = self.plateau.notation_lettre((start_row, end_col))
-                if isinstance(self.plateau[captured_pawn_pos], Pion) and self.plateau[captured_pawn_pos].couleur != couleur:
+            if self.ep_square == end_idx:
+                captured_code = cases[start_row * 8 + end_col]
+                if (captured_code & MASQUE_TYPE) == PION and (captured_code & NOIR) != own_color:
                     return True
 
         return False
@@ -300,15 +623,16 @@ class ChessRules:
             return False  # La tour doit se déplacer en ligne droite
 
         # Vérifie les obstacles sur le chemin
+        cases = self.plateau.cases
         if start_row == end_row:
             step = 1 if end_col > start_col else -1
             for col in range(start_col + step, end_col, step):
-                if self.plateau[self.plateau.notation_lettre((start_row, col))] is not None:
+                if cases[start_row * 8 + col] != VIDE:
                     return False
         else:
             step = 1 if end_row > start_row else -1
             for row in range(start_row + step, end_row, step):
-                if self.plateau[self.plateau.notation_lettre((row, start_col))] is not None:
+                if cases[row * 8 + start_col] != VIDE:
                     return False
 
         return True
@@ -329,11 +653,12 @@ class ChessRules:
             return False  # Le fou doit se déplacer en diagonale
 
         # Vérifie les obstacles sur le chemin
+        cases = self.plateau.cases
         row_step = 1 if end_row > start_row else -1
         col_step = 1 if end_col > start_col else -1
         row, col = start_row + row_step, start_col + col_step
         while row != end_row and col != end_col:
-            if self.plateau[self.plateau.notation_lettre((row, col))] is not None:
+            if cases[row * 8 + col] != VIDE:
                 return False
             row += row_step
             col += col_step
@@ -372,198 +697,129 @@ class ChessRules:
         """
         Vérifie si le roque est possible.
         """
-        couleur = self.plateau[self.plateau.notation_lettre((start_row, start_col))].couleur
+        cases = self.plateau.cases
+        couleur = 'noir' if cases[start_row * 8 + start_col] & NOIR else 'blanc'
         king_side = (end_col > start_col)
         # Correction : pour les blancs, le roi doit être sur la rangée 7 (et pour les noirs sur la rangée 0)
         if (couleur == 'blanc' and start_row != 7) or (couleur == 'noir' and start_row != 0):
             return False
 
-        if not self.castling_rights[couleur]['king_side' if king_side else 'queen_side']:
+        if not self.castling & CASTLING_BITS[couleur]['king_side' if king_side else 'queen_side']:
             return False
 
         if king_side:
             for col in range(start_col + 1, 7):
-                if self.plateau[self.plateau.notation_lettre((start_row, col))] is not None:
+                if cases[start_row * 8 + col] != VIDE:
                     return False
         else:
             for col in range(1, start_col):
-                if self.plateau[self.plateau.notation_lettre((start_row, col))] is not None:
+                if cases[start_row * 8 + col] != VIDE:
                     return False
 
         opponent_color = 'noir' if couleur == 'blanc' else 'blanc'
         for col in range(start_col, end_col + (1 if king_side else -1), (1 if king_side else -1)):
-            square = self.plateau.notation_lettre((start_row, col))
+            square = NOMS_CASES[start_row * 8 + col]
             if self.is_square_under_attack(square, opponent_color):
                 return False
 
         return True
 
-
-    def perform_castling(self, couleur, start_row, start_col, end_col):
-        """
-        Effectue le roque en déplaçant le roi et la tour.
-        """
-        king_pos = self.plateau.notation_lettre((start_row, start_col))
-        king = self.plateau[king_pos]
-
-        # Déplacement du roi
-        self.plateau[self.plateau.notation_lettre((start_row, end_col))] = king
-        self.plateau[king_pos] = None  # Supprime le roi de sa position initiale
-
-        # Déplacement de la tour
-        if end_col > start_col:  # Roque côté roi
-            rook_start = self.plateau.notation_lettre((start_row, 7))
-            rook_end = self.plateau.notation_lettre((start_row, end_col - 1))
-        else:  # Roque côté dame
-            rook_start = self.plateau.notation_lettre((start_row, 0))
-            rook_end = self.plateau.notation_lettre((start_row, end_col + 1))
-
-        self.plateau[rook_end] = self.plateau[rook_start]
-        self.plateau[rook_start] = None
-
-        # Mise à jour des droits de roque
-        self.castling_rights[couleur]['king_side'] = False
-        self.castling_rights[couleur]['queen_side'] = False
-
     def is_square_under_attack(self, square, attacker_color):
         """
         Vérifie si une case est sous attaque par une pièce de la couleur donnée.
         """
-        for coord, piece in self.plateau.items():
-            if piece and piece.couleur == attacker_color:
-                if self.is_valid_move(piece, coord, square):
-                    return True
-        return False
+        return bool(self.attack_map(attacker_color) >> INDEX_CASES[square] & 1)
 
-    def does_move_leave_king_in_check(self, piece, start, end):
+    def attack_map(self, couleur):
         """
-        Simule un mouvement et vérifie si le roi est en échec après le mouvement.
+        Ensemble (entier de 64 bits, bit i = case d'indice i) des cases attaquées
+        par la couleur donnée. Les cartes sont mises en cache pour la position
+        courante et recalculées dès que le hachage change.
+        """
+        if self._attack_maps_hash != self.hash:
+            self._attack_maps_hash = self.hash
+            self._attack_maps = {}
+        attacker = couleur_code(couleur)
+        attack_map = self._attack_maps.get(attacker)
+        if attack_map is None:
+            attack_map = self._attack_maps[attacker] = self.plateau.carte_attaques(attacker)
+        return attack_map
+
+    def execute_move(self, piece, start, end, promotion=None):
+        """
+        Joue un coup validé puis détecte la fin de partie. `promotion` impose le
+        type de la pièce promue ; à défaut promotion_callback est consulté.
         """
-        original_piece = self.plateau[end]
-        self.plateau[end] = piece
-        self.plateau[start] = None
-
-        king_pos = None
-        for coord, p in self.plateau.items():
-            if isinstance(p, Roi) and p.couleur == piece.couleur:
-                king_pos = coord
-                break
-
-        is_in_check = self.is_square_under_attack(king_pos, 'noir' if piece.couleur == 'blanc' else 'blanc')
-
-        self.plateau[start] = piece
-        self.plateau[end] = original_piece
-
-        return is_in_check
-
-    def execute_move(self, piece, start, end):
         if not self.is_valid_move(piece, start, end):
             return False
 
-        # Révoquer les droits de roque si le roi ou une tour bouge
-        if isinstance(piece, Roi):
-            self.castling_rights[piece.couleur]['king_side'] = False
-            self.castling_rights[piece.couleur]['queen_side'] = False
-        elif isinstance(piece, Tour):
-            # Tour quitte a1/a8 ⇒ plus de roque côté dame
-            if start == ('a1' if piece.couleur == 'blanc' else 'a8'):
-                self.castling_rights[piece.couleur]['queen_side'] = False
-            # Tour quitte h1/h8 ⇒ plus de roque côté roi
-            if start == ('h1' if piece.couleur == 'blanc' else 'h8'):
-                self.castling_rights[piece.couleur]['king_side'] = False
-
-        fr, fc = self.plateau.notation_nombre(start)
-        tr, tc = self.plateau.notation_nombre(end)
-
-        # Roque
-        if isinstance(piece, Roi) and abs(tc - fc) == 2:
-            self.perform_castling(piece.couleur, fr, fc, tc)
-            self.en_passant_target = None
-            self.switch_turn()
-            return True
-
-        # Prise en passant
-        if isinstance(piece, Pion) and fc != tc and self.plateau[end] is None:
-            captured = self.plateau.notation_lettre((fr, tc))
-            self.plateau[captured] = None
-
-        # Déplacement normal / capture
-        capture = self.plateau[end] is not None
-        self.plateau[end] = piece
-        self.plateau[start] = None
+        start_idx, end_idx = INDEX_CASES[start], INDEX_CASES[end]
 
-        # Règle des 50 coups
-        self.move_counter = 0 if isinstance(piece, Pion) or capture else self.move_counter + 1
+        # Promotion : la pièce est choisie avant de jouer le coup
+        if promotion is None:
+            promotion = REINE
+            if piece.type_code == PION and end_idx // 8 in (0, 7) and self.promotion_callback:
+                promotion = self.promotion_callback(piece.couleur).type_code
 
-        # Mise à jour de la cible en passant
-        if isinstance(piece, Pion) and abs(tr - fr) == 2:
-            mid = (fr + tr) // 2
-            self.en_passant_target = self.plateau.notation_lettre((mid, fc))
-        else:
-            self.en_passant_target = None
-
-        # Promotion
-        if isinstance(piece, Pion) and end[1] in ('1', '8'):
-            prom = self.promotion_callback(piece.couleur) if self.promotion_callback else Reine(piece.couleur)
-            self.promote_pawn(end, prom)
-
-        # Nulles et fin de partie
-        if self.move_counter >= 50:
-            self.game_over = True
-            if self.game_over_callback:
-                self.game_over_callback("Match nul par règle des 50 coups !")
-            return True
+        move = self._encode_move(start_idx, end_idx, promotion)
+        self.make_move(move)
+        self.changed_squares = move_squares(move)
+        self.check_game_over()
+        return True
 
-        self.update_repetition()
-        if self.game_over:
-            return True
+    def check_game_over(self):
+        """
+        Détecte les fins de partie après un coup ; le camp au trait est celui
+        qui vient de recevoir la main.
+        """
+        status = self.game_status()
+        if status is None:
+            return
+        self.game_over = True
+        if self.game_over_callback:
+            winner = 'Blanc' if self.current_turn == 'noir' else 'Noir'
+            self.game_over_callback(GAME_OVER_MESSAGES[status].format(winner=winner))
 
+    def game_status(self):
+        """
+        Fin de partie atteinte par le camp au trait (clé de GAME_OVER_MESSAGES),
+        ou None si la partie continue. Ne modifie rien.
+        """
+        # Un mat donné au 100e demi-coup l'emporte sur la règle des 50 coups
+        if not self.has_legal_move(self.current_turn):
+            return 'checkmate' if self.is_in_check(self.current_turn) else 'stalemate'
+        # move_counter compte des demi-coups (horloge de la FEN) : 50 coups = 100
+        if self.move_counter >= 100:
+            return 'fifty_moves'
+        if self.is_repetition(3):
+            return 'repetition'
         if self.is_insufficient_material():
-            self.game_over = True
-            if self.game_over_callback:
-                self.game_over_callback("Match nul par matériel insuffisant !")
-            return True
-
-        if self.is_checkmate(self.current_turn):
-            self.game_over = True
-            if self.game_over_callback:
-                self.game_over_callback(f"Checkmate! {'Blanc' if self.current_turn=='noir' else 'Noir'} gagne!")
-            return True
+            return 'insufficient_material'
+        return None
 
-        if self.is_stalemate(self.current_turn):
-            self.game_over = True
-            if self.game_over_callback:
-                self.game_over_callback("Pat! Match nul!")
-            return True
-
-        self.switch_turn()
-        return True
+    def game_result(self, status=None):
+        """
+        Résultat PGN ("1-0", "0-1", "1/2-1/2" ou "*") correspondant à une fin de partie.
+        """
+        status = status or self.game_status()
+        if status is None:
+            return '*'
+        if status == 'checkmate':
+            return '0-1' if self.current_turn == 'blanc' else '1-0'
+        return '1/2-1/2'
 
 
     def is_path_clear(self, start, end):
-        start_row, start_col = self.plateau.notation_nombre(start)
-        end_row, end_col = self.plateau.notation_nombre(end)
-            
-        # Calculer le pas en ligne et en colonne
-        if start_row != end_row:
-            row_step = (end_row - start_row) // abs(end_row - start_row)
-        else:
-            row_step = 0
-        if start_col != end_col:
-            col_step = (end_col - start_col) // abs(end_col - start_col)
-        else:
-            col_step = 0
-
-        current_row, current_col = start_row + row_step, start_col + col_step
-        while (current_row, current_col) != (end_row, end_col):
-            # Assurez-vous que l'indice est dans les limites
-            if not (0 <= current_row < 8 and 0 <= current_col < 8):
-                 return False
-            if self.plateau[self.plateau.notation_lettre((current_row, current_col))] is not None:
-                return False
-            current_row += row_step
-            current_col += col_step
+        return self._is_path_clear(INDEX_CASES[start], INDEX_CASES[end])
 
+    def _is_path_clear(self, start_idx, end_idx):
+        between = ENTRE[start_idx * 64 + end_idx]
+        if between is None:
+            return False
+        cases = self.plateau.cases
+        for index in between:
+            if cases[index] != VIDE:
+                return False
         return True
 
     def switch_turn(self):
@@ -572,82 +828,213 @@ class ChessRules:
         Vérifie si le joueur dont c'est le tour est en stalemate.
         """
         self.current_turn = 'noir' if self.current_turn == 'blanc' else 'blanc'
-        print(f"DEBUG: Changement de tour -> Nouveau tour : {self.current_turn}")
+        logger.debug("Changement de tour -> nouveau tour : %s", self.current_turn)
 
-       
-
-    def make_move(self, start, end):
+    def king_square(self, couleur):
         """
-        Effectue un mouvement si celui-ci est valide.
-        Le changement de tour est géré dans execute_move().
+        Indice de la case du roi de la couleur donnée (-1 s'il n'est pas sur le plateau).
         """
-        if self.game_over:
-            print("La partie est terminée.")
-            return
-        piece = self.plateau[start]
-        if piece and self.is_valid_move(piece, start, end):
-            self.execute_move(piece, start, end)
+        return self.plateau.rois[couleur_code(couleur) >> 3]
 
     def is_in_check(self, couleur):
-        king_pos = next((coord for coord, piece in self.plateau.items() if isinstance(piece, Roi) and piece.couleur == couleur), None)
-        if not king_pos:
+        own_color = couleur_code(couleur)
+        king = self.plateau.rois[own_color >> 3]
+        if king < 0:
             return False
+        return self._is_attacked(king, own_color ^ NOIR)
 
-        opponent_color = 'noir' if couleur == 'blanc' else 'blanc'
-
-        for coord, piece in self.plateau.items():
-            if piece and piece.couleur == opponent_color:
-                if self.can_attack(piece, coord, king_pos):
-                    return True
-        return False
-
-    def can_attack(self, piece, start, target):
-        start_row, start_col = self.plateau.notation_nombre(start)
-        target_row, target_col = self.plateau.notation_nombre(target)
-
-        if isinstance(piece, Pion):
-            direction = -1 if piece.couleur == 'blanc' else 1
-            return abs(target_col - start_col) == 1 and (target_row - start_row) == direction
+    def generate_moves(self, couleur):
+        """
+        Génère les coups pseudo-légaux (le roi peut rester en échec) de la couleur
+        donnée, encodés en entiers (voir encode_move). Le roque n'est proposé
+        que si le roi ne part pas, ne passe pas et n'arrive pas sur une case attaquée.
+        """
+        cases = self.plateau.cases
+        cibles = self.plateau.cibles
+        own_color = couleur_code(couleur)
+        moves = []
+        append = moves.append
+
+        for start, code in enumerate(cases):
+            if not code or (code & NOIR) != own_color:
+                continue
+            piece_type = code & MASQUE_TYPE
+
+            if piece_type == PION:
+                self._generate_pawn_moves(start, own_color, moves)
+            else:
+                for end in cibles(start, code):
+                    append(start | (end << 6))
 
-        elif isinstance(piece, Cavalier):
-            return (abs(start_row - target_row), abs(start_col - target_col)) in [(2, 1), (1, 2)]
+        self._generate_castling_moves(couleur, moves)
+        return moves
 
-        elif isinstance(piece, Fou):
-            return abs(start_row - target_row) == abs(start_col - target_col) and self.is_path_clear(start, target)
+    def _generate_pawn_moves(self, start, own_color, moves):
+        cases = self.plateau.cases
+        row, col = divmod(start, 8)
+        if own_color == NOIR:
+            step, start_row, last_row = 8, 1, 7
+        else:
+            step, start_row, last_row = -8, 6, 0
+        promotes = row + step // 8 == last_row
+
+        # Avance d'une case, puis de deux depuis la rangée de départ
+        end = start + step
+        if cases[end] == VIDE:
+            if promotes:
+                for promotion in PROMOTION_TYPES:
+                    moves.append(encode_move(start, end, promotion))
+            else:
+                moves.append(start | (end << 6))
+                if row == start_row and cases[end + step] == VIDE:
+                    moves.append(encode_move(start, end + step, flag=MOVE_DOUBLE_PUSH))
+
+        # Captures diagonales et prise en passant
+        en_passant = self.ep_square
+        for dc in (-1, 1):
+            if not 0 <= col + dc < 8:
+                continue
+            end = start + step + dc
+            target = cases[end]
+            if target and (target & NOIR) != own_color:
+                if promotes:
+                    for promotion in PROMOTION_TYPES:
+                        moves.append(encode_move(start, end, promotion))
+                else:
+                    moves.append(start | (end << 6))
+            elif end == en_passant and cases[start + dc] == (PION | (own_color ^ NOIR)):
+                moves.append(encode_move(start, end, flag=MOVE_EN_PASSANT))
+
+    def _generate_castling_moves(self, couleur, moves):
+        cases = self.plateau.cases
+        own_color = couleur_code(couleur)
+        king = 60 if own_color != NOIR else 4
+        if cases[king] != (ROI | own_color):
+            return
+        king_side = self.castling & CASTLING_BITS[couleur]['king_side']
+        queen_side = self.castling & CASTLING_BITS[couleur]['queen_side']
+        if not (king_side or queen_side):
+            return
+        rook = TOUR | own_color
+        opponent = own_color ^ NOIR
+        if self._is_attacked(king, opponent):
+            return
+        if king_side and cases[king + 3] == rook \
+                and cases[king + 1] == VIDE and cases[king + 2] == VIDE \
+                and not self._is_attacked(king + 1, opponent) \
+                and not self._is_attacked(king + 2, opponent):
+            moves.append(encode_move(king, king + 2, flag=MOVE_CASTLING))
+        if queen_side and cases[king - 4] == rook \
+                and cases[king - 1] == VIDE and cases[king - 2] == VIDE and cases[king - 3] == VIDE \
+                and not self._is_attacked(king - 1, opponent) \
+                and not self._is_attacked(king - 2, opponent):
+            moves.append(encode_move(king, king - 2, flag=MOVE_CASTLING))
+
+    def _is_attacked(self, index, attacker):
+        """
+        Indique si la case d'indice donné est attaquée par le camp `attacker` (BLANC ou NOIR).
+        """
+        return self.plateau.est_attaquee(index, attacker)
 
-        elif isinstance(piece, Tour):
-            return (start_row == target_row or start_col == target_col) and self.is_path_clear(start, target)
+    def _leaves_king_in_check(self, move, own_color):
+        """
+        Joue provisoirement le coup et vérifie si le roi du camp reste attaqué.
+        """
+        self.make_move(move)
+        try:
+            king = self.plateau.rois[own_color >> 3]
+            return king >= 0 and self._is_attacked(king, own_color ^ NOIR)
+        finally:
+            self.unmake_move()
 
-        elif isinstance(piece, Reine):
-            return (start_row == target_row or start_col == target_col or abs(start_row - target_row) == abs(start_col - target_col)) and self.is_path_clear(start, target)
+    def pinned_pieces(self, couleur):
+        """
+        Pièces clouées de la couleur donnée : une seule pièce alliée entre le roi
+        et une pièce glissante adverse. Retourne l'ensemble de leurs cases.
+        """
+        cases = self.plateau.cases
+        own_color = couleur_code(couleur)
+        king = self.plateau.rois[own_color >> 3]
+        pinned = set()
+        if king < 0:
+            return pinned
+        queen = REINE | (own_color ^ NOIR)
+        for rays, slider in ((RAYONS_TOUR[king], TOUR | (own_color ^ NOIR)),
+                             (RAYONS_FOU[king], FOU | (own_color ^ NOIR))):
+            for ray in rays:
+                candidate = -1
+                for index in ray:
+                    code = cases[index]
+                    if not code:
+                        continue
+                    if (code & NOIR) == own_color:
+                        if candidate >= 0:
+                            break
+                        candidate = index
+                    else:
+                        if candidate >= 0 and (code == slider or code == queen):
+                            pinned.add(candidate)
+                        break
+        return pinned
 
-        elif isinstance(piece, Roi):
-            return abs(start_row - target_row) <= 1 and abs(start_col - target_col) <= 1
+    def checkers(self, couleur):
+        """
+        Cases des pièces adverses qui donnent échec au roi de la couleur donnée.
+        """
+        own_color = couleur_code(couleur)
+        king = self.plateau.rois[own_color >> 3]
+        if king < 0:
+            return []
+        return self.plateau.attaquants(king, own_color ^ NOIR)
 
-        return False
+    def _iter_legal_moves(self, couleur):
+        """
+        Filtre les coups pseudo-légaux à partir des clouages et des échecs
+        calculés une fois pour la position : seuls les coups du roi, les prises
+        en passant et les coups de pièces clouées sont vérifiés en jouant le coup.
+        """
+        own_color = couleur_code(couleur)
+        king = self.plateau.rois[own_color >> 3]
+        moves = self.generate_moves(couleur)
+        if king < 0:
+            yield from moves
+            return
 
-    def is_path_obstructed(self, start, end):
-        start_row, start_col = self.plateau.notation_nombre(start)
-        end_row, end_col = self.plateau.notation_nombre(end)
-        # Calcul des pas (row_step et col_step)
-        row_diff = end_row - start_row
-        col_diff = end_col - start_col
-        row_step = row_diff // max(1, abs(row_diff))
-        col_step = col_diff // max(1, abs(col_diff))
-        
-        current_row, current_col = start_row + row_step, start_col + col_step
-        while (current_row, current_col) != (end_row, end_col):
-            # Vérifie que l'on reste dans les bornes du plateau
-            if not (0 <= current_row < 8 and 0 <= current_col < 8):
-                # Si la position calculée est hors plateau, on considère le chemin comme obstrué
-                return True
-            if self.plateau[self.plateau.notation_lettre((current_row, current_col))] is not None:
-                print(f"DEBUG: Chemin obstrué à {self.plateau.notation_lettre((current_row, current_col))}")
-                return True
-            current_row += row_step
-            current_col += col_step
-        return False
+        checkers = self.checkers(couleur)
+        pinned = self.pinned_pieces(couleur)
+        if len(checkers) == 1:
+            # Hors du roi, il faut prendre la pièce qui donne échec ou s'interposer
+            checker = checkers[0]
+            evasions = {checker}
+            evasions.update(ENTRE[king * 64 + checker] or ())
+        else:
+            evasions = None
+
+        for move in moves:
+            start = move & 63
+            if start == king:
+                # Le roque n'est généré qu'avec des cases de passage non attaquées
+                if (move >> 15) == MOVE_CASTLING or not self._leaves_king_in_check(move, own_color):
+                    yield move
+            elif len(checkers) > 1:
+                continue
+            elif (move >> 15) == MOVE_EN_PASSANT or start in pinned:
+                if not self._leaves_king_in_check(move, own_color):
+                    yield move
+            elif evasions is None or ((move >> 6) & 63) in evasions:
+                yield move
+
+    def generate_legal_moves(self, couleur):
+        """
+        Génère les coups légaux de la couleur donnée (coups encodés).
+        """
+        return list(self._iter_legal_moves(couleur))
 
+    def has_legal_move(self, couleur):
+        """
+        Indique si la couleur donnée dispose d'au moins un coup légal.
+        """
+        return next(self._iter_legal_moves(couleur), None) is not None
 
     def is_checkmate(self, couleur):
         """
@@ -656,12 +1043,7 @@ class ChessRules:
         if not self.is_in_check(couleur):
             return False
 
-        for start, piece in self.plateau.items():
-            if piece and piece.couleur == couleur:
-                for end in self.plateau.keys():
-                    if self.is_valid_move(piece, start, end):
-                        return False
-        return True
+        return not self.has_legal_move(couleur)
 
 
     def is_stalemate(self, couleur):
@@ -672,57 +1054,31 @@ class ChessRules:
           - Aucune de ses pièces ne peut effectuer de mouvement légal.
         """
         if self.is_in_check(couleur):
-            print(f"DEBUG: {couleur} est en échec, donc ce n'est pas un stalemate.")
+            logger.debug("%s est en échec, donc ce n'est pas un pat", couleur)
             return False
 
-        has_legal_moves = False
-        for start, piece in self.plateau.items():
-            if piece and piece.couleur == couleur:
-                for end in self.plateau.keys():
-                    if self.is_legal(piece, start, end):
-                        print(f"DEBUG: {couleur} peut bouger {piece} de {start} à {end}, donc pas un stalemate.")
-                        has_legal_moves = True
-                        break
-                if has_legal_moves:
-                    break
-
-        if not has_legal_moves:
-            print(f"DEBUG: Aucun coup légal possible pour {couleur}, stalemate détecté.")
+        if not self.has_legal_move(couleur):
+            logger.debug("Aucun coup légal possible pour %s, pat détecté", couleur)
             return True
         return False
 
     def is_fifty_move_rule(self):
         """
-        Vérifie la règle des 50 coups : nulle si 50 coups consécutifs sans capture ni déplacement de pion.
+        Vérifie la règle des 50 coups : nulle si 50 coups consécutifs (100 demi-coups)
+        sans capture ni déplacement de pion.
         """
-        return self.move_counter >= 50
+        return self.move_counter >= 100
 
-    def promote_pawn(self, position, new_piece):
+    def is_insufficient_material(self):
         """
-        Remplace un pion promu par une pièce choisie par le joueur.
+        Position morte : aucun mat n'est possible, quels que soient les coups
+        (roi contre roi, une seule pièce mineure, ou seulement des fous tous
+        sur des cases de même couleur). Fou et cavalier ou deux fous gagnent.
         """
-        piece = self.plateau[position]
-        if not isinstance(piece, Pion):
-            return  # Ce n'est pas un pion, donc pas de promotion
-
-        if (piece.couleur == 'blanc' and position[1] == '8') or (piece.couleur == 'noir' and position[1] == '1'):
-            self.plateau[position] = new_piece  # Remplace le pion par la nouvelle pièce
-
-
-    def is_insufficient_material(self):
-        # Récupère pièces non-roi
-        def pcs(color):
-            return [p for p in self.plateau.plateau.values() if p and p.couleur == color and not isinstance(p, Roi)]
-        def minor(p):
-            return isinstance(p, (Fou, Cavalier))
-        def insuf(color):
-            pieces = pcs(color)
-            if not pieces:
-                return True
-            if len(pieces) == 1 and minor(pieces[0]):
-                return True
-            if len(pieces) == 2 and all(minor(p) for p in pieces):
-                return True
-            return False
-        return insuf('blanc') and insuf('noir')
+        pieces = [(code & MASQUE_TYPE, index) for index, code in enumerate(self.plateau.cases)
+                  if code and (code & MASQUE_TYPE) != ROI]
+        if len(pieces) <= 1:
+            return all(piece_type in (FOU, CAVALIER) for piece_type, _ in pieces)
+        return (all(piece_type == FOU for piece_type, _ in pieces)
+                and len({(index // 8 + index % 8) % 2 for _, index in pieces}) == 1)
 
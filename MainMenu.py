@@ -19,13 +19,14 @@ class MainMenu(tk.Tk):
         self.resizable(False, False)
 
         # Charger les préférences sauvegardées
-        self.input_mode, self.selected_skin = self.load_preferences()
+        self.input_mode, self.selected_skin, self.opponent, self.renderer = self.load_preferences()
 
         self.show_menu()
 
     def show_menu(self):
         for w in self.winfo_children():
             w.destroy()
+        self.resizable(False, False)
         self.geometry("400x450")
         self.create_widgets()
 
@@ -60,7 +61,9 @@ class MainMenu(tk.Tk):
             time_control=time_control,
             input_mode=self.input_mode,
             skin=self.selected_skin,
-            on_exit_callback=self.show_menu
+            on_exit_callback=self.show_menu,
+            computer=self.opponent or None,
+            renderer=self.renderer
         )
         hmi.pack(fill="both", expand=True)
 
@@ -68,12 +71,14 @@ class MainMenu(tk.Tk):
         largeur = self.winfo_reqwidth()
         hauteur = self.winfo_reqheight()
         self.geometry(f"{largeur}x{hauteur}")
+        # Le plateau suit la taille de la fenêtre (voir ChessHMI._resize_board)
+        self.resizable(True, True)
 
     def open_settings(self):
         win = tk.Toplevel(self)
         setup_theme(win)
         win.title("Paramètres")
-        win.geometry("360x400")  # ✅ Plus grand et plus aéré
+        win.geometry("360x680")  # ✅ Plus grand et plus aéré
 
         content = ttk.Frame(win, padding=20)
         content.pack(fill="both", expand=True)
@@ -97,14 +102,34 @@ class MainMenu(tk.Tk):
             ttk.Radiobutton(fields, text=sk, value=sk, variable=skin_var)\
                 .pack(anchor="w", pady=5)
 
+        # Partie: Adversaire (couleur jouée par l'ordinateur, vide pour deux joueurs)
+        ttk.Label(fields, text="Adversaire :", font=FONT_TITLE).pack(anchor="w", pady=(20,10))
+        opponent_var = tk.StringVar(value=self.opponent)
+        for txt, val in [("Deux joueurs", ""),
+                        ("Ordinateur (Noirs)", "noir"),
+                        ("Ordinateur (Blancs)", "blanc")]:
+            ttk.Radiobutton(fields, text=txt, value=val, variable=opponent_var)\
+                .pack(anchor="w", pady=5)
+
+        # Partie: Rendu du plateau
+        ttk.Label(fields, text="Affichage du plateau :", font=FONT_TITLE).pack(anchor="w", pady=(20,10))
+        renderer_var = tk.StringVar(value=self.renderer)
+        for txt, val in [("Boutons", "boutons"),
+                        ("Canevas (plus léger)", "canevas")]:
+            ttk.Radiobutton(fields, text=txt, value=val, variable=renderer_var)\
+                .pack(anchor="w", pady=5)
+
         # Bouton Valider
         ttk.Button(content, text="Valider", style="Accent.TButton",
-                command=lambda: self.save_settings(mode_var.get(), skin_var.get(), win))\
+                command=lambda: self.save_settings(mode_var.get(), skin_var.get(), win, opponent_var.get(),
+                                                   renderer_var.get()))\
             .pack(pady=(10,0))
 
-    def save_settings(self, mode_choice, skin_choice, window):
+    def save_settings(self, mode_choice, skin_choice, window, opponent_choice="", renderer_choice="boutons"):
         self.input_mode = mode_choice
         self.selected_skin = skin_choice
+        self.opponent = opponent_choice
+        self.renderer = renderer_choice
         self.save_preferences()
         messagebox.showinfo("Paramètres", "Paramètres sauvegardés avec succès ! ✅")  # ✅ Message de confirmation
         window.destroy()
@@ -115,7 +140,9 @@ class MainMenu(tk.Tk):
     def save_preferences(self):
         data = {
             "input_mode": self.input_mode,
-            "selected_skin": self.selected_skin
+            "selected_skin": self.selected_skin,
+            "opponent": self.opponent,
+            "renderer": self.renderer
         }
         with open(CONFIG_FILE, "w") as f:
             json.dump(data, f)
@@ -124,9 +151,10 @@ class MainMenu(tk.Tk):
         if os.path.exists(CONFIG_FILE):
             with open(CONFIG_FILE, "r") as f:
                 data = json.load(f)
-                return data.get("input_mode", "click only"), data.get("selected_skin", "Classique")
+                return (data.get("input_mode", "click only"), data.get("selected_skin", "Classique"),
+                        data.get("opponent", ""), data.get("renderer", "boutons"))
         else:
-            return "click only", "Classique"
+            return "click only", "Classique", "", "boutons"
 
 if __name__ == "__main__":
     app = MainMenu()
@@ -0,0 +1,267 @@
+"""
+Validation en lot de corpus PGN ou FEN sur plusieurs processus.
+
+Chaque fichier est découpé en tranches d'octets alignées sur un début de
+partie (PGN) ou de ligne (FEN/EPD) ; chaque tranche est rejouée dans un
+processus du pool avec son propre ChessRules, sans aucun import de Tkinter.
+Le processus principal ne lit que quelques lignes par frontière de tranche
+puis agrège les résultats, les erreurs et les temps.
+
+Avec --tablebases, une partie est arbitrée dès qu'elle entre dans une table
+de finales (voir tablebase.py) : le résultat de la table remplace la fin de
+la partie, qui n'est pas rejouée.
+
+Exemples :
+    python batch.py archives/*.pgn --workers 8
+    python batch.py puzzles.epd --errors erreurs.jsonl --json
+    python batch.py tournoi.pgn --tablebases tablebases
+"""
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from ChessRules import ChessRules, START_FEN
+from pgn import PGNError, read_games, replay
+from tablebase import Tablebases
+
+FEN_SUFFIXES = ('.fen', '.epd')
+
+
+def shard_file(path, shards):
+    """
+    Découpe un fichier en au plus `shards` intervalles d'octets (début, fin),
+    chaque début tombant sur une ligne ouvrant une partie (PGN) ou sur une ligne (FEN).
+    """
+    size = os.path.getsize(path)
+    pgn = not path.lower().endswith(FEN_SUFFIXES)
+    starts = [0]
+    with open(path, 'rb') as f:
+        for shard in range(1, shards):
+            guess = size * shard // shards
+            if guess <= starts[-1]:
+                continue
+            f.seek(guess)
+            f.readline()
+            # En PGN, une partie commence par une ligne d'en-tête précédée d'une ligne vide
+            after_blank = False
+            while True:
+                position = f.tell()
+                line = f.readline()
+                if not line:
+                    position = size
+                    break
+                if not pgn or (after_blank and line.startswith(b'[')):
+                    break
+                after_blank = not line.strip()
+            if starts[-1] < position < size:
+                starts.append(position)
+    return list(zip(starts, starts[1:] + [size]))
+
+
+def _read_lines(path, start, end):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        position = start
+        while position < end:
+            line = f.readline()
+            if not line:
+                return
+            position += len(line)
+            yield line.decode('utf-8', 'replace')
+
+
+def _outcome(rules, tablebases=None):
+    """
+    Résultat imposé par la position finale, ou par les tables de finales
+    si elles la couvrent ('*' si la partie n'est pas terminée).
+    """
+    couleur = rules.current_turn
+    if not rules.has_legal_move(couleur):
+        if rules.is_in_check(couleur):
+            return '0-1' if couleur == 'blanc' else '1-0'
+        return '1/2-1/2'
+    # Les tables d'abord : elles tranchent aussi les finales de pièces mineures
+    probe = tablebases.probe(rules) if tablebases is not None else None
+    if probe is not None:
+        if not probe[0]:
+            return '1/2-1/2'
+        return '1-0' if (couleur == 'blanc') == (probe[0] > 0) else '0-1'
+    if rules.is_insufficient_material():
+        return '1/2-1/2'
+    return '*'
+
+
+def _adjudicable(rules, tablebases):
+    return (tablebases is not None and rules.plateau.nombre <= tablebases.max_pieces
+            and tablebases.probe(rules) is not None)
+
+
+def validate_pgn_shard(path, start, end, representation='tableau', tablebases_dir=None):
+    """
+    Rejoue les parties d'une tranche de fichier PGN ; renvoie un dictionnaire de statistiques.
+    """
+    began = time.perf_counter()
+    rules = ChessRules(representation)
+    tablebases = Tablebases(tablebases_dir) if tablebases_dir else None
+    stats = {'games': 0, 'plies': 0, 'adjudicated': 0, 'results': Counter(), 'errors': []}
+    for number, game in enumerate(read_games(_read_lines(path, start, end))):
+        stats['games'] += 1
+        error = None
+        played = 0
+        adjudicated = False
+        try:
+            rules.set_fen(game.headers.get('FEN', START_FEN))
+            adjudicated = _adjudicable(rules, tablebases)
+            if not adjudicated:
+                for _ in replay(rules, game.moves):
+                    played += 1
+                    if _adjudicable(rules, tablebases):
+                        adjudicated = True
+                        break
+        except (PGNError, ValueError) as exc:
+            error = str(exc)
+        stats['plies'] += played
+        if error is None:
+            if adjudicated:
+                stats['adjudicated'] += 1
+                outcome = _outcome(rules, tablebases)
+            else:
+                outcome = _outcome(rules)
+            stats['results'][outcome if outcome != '*' else game.result] += 1
+            if outcome != '*' and outcome != game.result:
+                source = "table de finales" if adjudicated else "position finale"
+                error = f"résultat annoncé {game.result}, {source} {outcome}"
+        if error is not None:
+            stats['errors'].append({
+                'file': path,
+                'shard_start': start,
+                'game': number,
+                'ply': played,
+                'event': game.headers.get('Event', '?'),
+                'white': game.headers.get('White', '?'),
+                'black': game.headers.get('Black', '?'),
+                'error': error,
+            })
+    if tablebases is not None:
+        tablebases.close()
+    stats['time'] = time.perf_counter() - began
+    return stats
+
+
+def validate_fen_shard(path, start, end, representation='tableau', tablebases_dir=None):
+    """
+    Charge chaque position FEN/EPD d'une tranche et classe sa situation (mat,
+    pat, gain ou nulle d'après les tables de finales, en cours).
+    """
+    began = time.perf_counter()
+    rules = ChessRules(representation)
+    tablebases = Tablebases(tablebases_dir) if tablebases_dir else None
+    stats = {'games': 0, 'plies': 0, 'adjudicated': 0, 'results': Counter(), 'errors': []}
+    for number, line in enumerate(_read_lines(path, start, end)):
+        fields = line.split(';')[0].split()
+        if not fields:
+            continue
+        # EPD : les opérations suivent les quatre premiers champs
+        if len(fields) > 4 and not fields[4].isdigit():
+            fields = fields[:4]
+        stats['games'] += 1
+        try:
+            rules.set_fen(' '.join(fields))
+        except ValueError as exc:
+            stats['errors'].append({'file': path, 'shard_start': start, 'line': number, 'error': str(exc)})
+            continue
+        if _adjudicable(rules, tablebases):
+            stats['adjudicated'] += 1
+        stats['results'][_outcome(rules, tablebases)] += 1
+    if tablebases is not None:
+        tablebases.close()
+    stats['time'] = time.perf_counter() - began
+    return stats
+
+
+def run(paths, workers=None, shards_per_worker=4, representation='tableau', tablebases_dir=None):
+    """
+    Valide les fichiers donnés et renvoie les statistiques agrégées.
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = []
+    for path in paths:
+        validate = validate_fen_shard if path.lower().endswith(FEN_SUFFIXES) else validate_pgn_shard
+        for start, end in shard_file(path, workers * shards_per_worker):
+            tasks.append((validate, path, start, end))
+
+    total = {'games': 0, 'plies': 0, 'adjudicated': 0, 'results': Counter(), 'errors': [], 'cpu_time': 0.0}
+    began = time.perf_counter()
+    if workers == 1:
+        outputs = (validate(path, start, end, representation, tablebases_dir)
+                   for validate, path, start, end in tasks)
+        _merge(total, outputs)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(validate, path, start, end, representation, tablebases_dir)
+                       for validate, path, start, end in tasks]
+            _merge(total, (future.result() for future in futures))
+    total['wall_time'] = time.perf_counter() - began
+    total['workers'] = workers
+    total['shards'] = len(tasks)
+    return total
+
+
+def _merge(total, outputs):
+    for stats in outputs:
+        total['games'] += stats['games']
+        total['plies'] += stats['plies']
+        total['adjudicated'] += stats['adjudicated']
+        total['results'].update(stats['results'])
+        total['errors'].extend(stats['errors'])
+        total['cpu_time'] += stats['time']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validation en lot de parties PGN ou de positions FEN/EPD.")
+    parser.add_argument('paths', nargs='+', help="fichiers .pgn, .fen ou .epd")
+    parser.add_argument('--workers', type=int, default=None, help="nombre de processus (défaut : nombre de cœurs)")
+    parser.add_argument('--shards-per-worker', type=int, default=4, help="tranches par processus (défaut : 4)")
+    parser.add_argument('--representation', default='tableau', choices=['tableau', 'bitboard'])
+    parser.add_argument('--errors', help="fichier JSON lines recevant le détail des erreurs")
+    parser.add_argument('--json', action='store_true', help="résumé au format JSON")
+    parser.add_argument('--tablebases', metavar='DIR', help="arbitrer les finales couvertes par ces tables")
+    args = parser.parse_args(argv)
+
+    total = run(args.paths, args.workers, args.shards_per_worker, args.representation, args.tablebases)
+    if args.errors:
+        with open(args.errors, 'w', encoding='utf-8') as f:
+            for error in total['errors']:
+                f.write(json.dumps(error, ensure_ascii=False) + '\n')
+
+    summary = {
+        'games': total['games'],
+        'plies': total['plies'],
+        'errors': len(total['errors']),
+        'adjudicated': total['adjudicated'],
+        'results': dict(total['results']),
+        'workers': total['workers'],
+        'shards': total['shards'],
+        'wall_time': round(total['wall_time'], 3),
+        'cpu_time': round(total['cpu_time'], 3),
+        'games_per_second': round(total['games'] / max(total['wall_time'], 1e-9), 1),
+        'speedup': round(total['cpu_time'] / max(total['wall_time'], 1e-9), 2),
+    }
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False))
+    else:
+        print(f"{summary['games']} parties, {summary['plies']} demi-coups, {summary['errors']} erreurs")
+        if args.tablebases:
+            print(f"Arbitrées par les tables de finales : {summary['adjudicated']}")
+        print(f"Résultats : {summary['results']}")
+        print(f"{summary['workers']} processus, {summary['shards']} tranches : "
+              f"{summary['wall_time']} s ({summary['games_per_second']} parties/s, "
+              f"accélération {summary['speedup']}x)")
+    return 1 if total['errors'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,150 @@
+"""
+Représentation bitboard optionnelle du plateau.
+
+Chaque code de pièce possède un entier Python utilisé comme ensemble de
+64 bits (bit i = case d'indice i, même numérotation que plateau.NOMS_CASES).
+Les attaques des pièces glissantes sont lues dans des tables précalculées
+indexées par l'occupation masquée de la case, à la manière des "magic
+bitboards" : le dictionnaire Python joue le rôle du hachage parfait que
+fournit la multiplication magique en C.
+
+S'utilise via ChessRules(representation='bitboard').
+"""
+from pieceEchec import PION, CAVALIER, FOU, TOUR, REINE, ROI, NOIR, MASQUE_TYPE
+from plateau import Plateau, SAUTS_CAVALIER, PAS_ROI, RAYONS_TOUR, RAYONS_FOU, PRISES_PION
+
+
+def masque(cases):
+    """
+    Bitboard contenant les cases d'indices donnés.
+    """
+    resultat = 0
+    for index in cases:
+        resultat |= 1 << index
+    return resultat
+
+
+def iterer_bits(bitboard):
+    """
+    Itère sur les indices des bits à 1, du plus faible au plus fort.
+    """
+    while bitboard:
+        bit = bitboard & -bitboard
+        yield bit.bit_length() - 1
+        bitboard ^= bit
+
+
+ATTAQUES_CAVALIER = [masque(SAUTS_CAVALIER[i]) for i in range(64)]
+ATTAQUES_ROI = [masque(PAS_ROI[i]) for i in range(64)]
+# ATTAQUES_PION[couleur >> 3][i] : cases prises par un pion de cette couleur posé en i
+ATTAQUES_PION = [[masque(prises[i]) for i in range(64)] for prises in PRISES_PION]
+
+
+def _construire_tables(rayons_par_case):
+    """
+    Pour chaque case : masque des cases pouvant bloquer (bord exclu) et table
+    occupation masquée -> attaques, énumérée par la méthode "carry-rippler".
+    """
+    masques, tables = [], []
+    for rayons in rayons_par_case:
+        bloqueurs = masque(c for rayon in rayons for c in rayon[:-1])
+        table = {}
+        occupation = 0
+        while True:
+            attaques = 0
+            for rayon in rayons:
+                for c in rayon:
+                    attaques |= 1 << c
+                    if occupation >> c & 1:
+                        break
+            table[occupation] = attaques
+            occupation = (occupation - bloqueurs) & bloqueurs
+            if not occupation:
+                break
+        masques.append(bloqueurs)
+        tables.append(table)
+    return masques, tables
+
+
+MASQUES_TOUR, TABLES_TOUR = _construire_tables(RAYONS_TOUR)
+MASQUES_FOU, TABLES_FOU = _construire_tables(RAYONS_FOU)
+
+
+def attaques_tour(index, occupation):
+    return TABLES_TOUR[index][occupation & MASQUES_TOUR[index]]
+
+
+def attaques_fou(index, occupation):
+    return TABLES_FOU[index][occupation & MASQUES_FOU[index]]
+
+
+class PlateauBitboard(Plateau):
+    """
+    Plateau tenant, en plus du tableau de 64 cases, un bitboard par code de
+    pièce et un bitboard d'occupation par couleur.
+    """
+
+    def __init__(self):
+        self.bitboards = [0] * 16
+        self.occupation = [0, 0]  # indexé par couleur >> 3 : blanc, noir
+        super().__init__()
+
+    def initialiser_plateau(self):
+        super().initialiser_plateau()
+        self.bitboards = [0] * 16
+        self.occupation = [0, 0]
+
+    def poser(self, index, code):
+        bit = 1 << index
+        ancien = self.cases[index]
+        if ancien:
+            self.bitboards[ancien] ^= bit
+            self.occupation[ancien >> 3] ^= bit
+        if code:
+            self.bitboards[code] |= bit
+            self.occupation[code >> 3] |= bit
+        # Hachage, rois et sommes incrémentales : tenus par Plateau.poser
+        super().poser(index, code)
+
+    def attaques(self, index, code):
+        """
+        Bitboard des cases attaquées par la pièce `code` posée en `index`.
+        """
+        piece_type = code & MASQUE_TYPE
+        if piece_type == CAVALIER:
+            return ATTAQUES_CAVALIER[index]
+        if piece_type == ROI:
+            return ATTAQUES_ROI[index]
+        if piece_type == PION:
+            return ATTAQUES_PION[code >> 3][index]
+        occupation = self.occupation[0] | self.occupation[1]
+        if piece_type == FOU:
+            return attaques_fou(index, occupation)
+        if piece_type == TOUR:
+            return attaques_tour(index, occupation)
+        return attaques_fou(index, occupation) | attaques_tour(index, occupation)
+
+    def carte_attaques(self, attaquant):
+        carte = 0
+        for code in range(attaquant | PION, (attaquant | ROI) + 1):
+            for index in iterer_bits(self.bitboards[code]):
+                carte |= self.attaques(index, code)
+        return carte
+
+    def cibles(self, index, code):
+        return list(iterer_bits(self.attaques(index, code) & ~self.occupation[code >> 3]))
+
+    def est_attaquee(self, index, attaquant):
+        bitboards = self.bitboards
+        if ATTAQUES_CAVALIER[index] & bitboards[CAVALIER | attaquant]:
+            return True
+        if ATTAQUES_ROI[index] & bitboards[ROI | attaquant]:
+            return True
+        # Un pion attaquant se trouve là où un pion adverse posé en `index` prendrait
+        if ATTAQUES_PION[(attaquant ^ NOIR) >> 3][index] & bitboards[PION | attaquant]:
+            return True
+        occupation = self.occupation[0] | self.occupation[1]
+        reine = bitboards[REINE | attaquant]
+        if attaques_fou(index, occupation) & (bitboards[FOU | attaquant] | reine):
+            return True
+        return bool(attaques_tour(index, occupation) & (bitboards[TOUR | attaquant] | reine))
@@ -0,0 +1,188 @@
+"""
+Livres d'ouvertures au format Polyglot (.bin).
+
+Un livre est une suite d'entrées de 16 octets gros-boutistes triées par clé :
+    clé (8) | coup (2) | poids (2) | apprentissage (4).
+Le fichier est projeté en mémoire (mmap) et les entrées d'une position sont
+trouvées par recherche dichotomique sur les clés : l'ouverture du livre ne
+lit rien et une consultation ne touche que O(log n) entrées, quelle que soit
+la taille du livre.
+
+La clé Polyglot n'est pas le hachage interne de ChessRules : elle utilise
+les clés publiées par la spécification (zobrist.CLES_POLYGLOT) et la
+numérotation a1 = 0, d'où polyglot_key() et les conversions `index ^ 56`.
+
+Exemple :
+    python book.py livre.bin --fen "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1"
+"""
+import argparse
+import bisect
+import mmap
+import random
+import struct
+
+from ChessRules import (
+    ChessRules, START_FEN, MOVE_CASTLING, move_start, move_end, move_promotion, move_flag,
+)
+from pieceEchec import PION, CAVALIER, FOU, TOUR, REINE, ROI, NOIR, MASQUE_TYPE
+from zobrist import CLES_POLYGLOT
+
+ENTRY = struct.Struct('>QHHI')
+
+_CASTLING_KEYS = ((1, 768), (2, 769), (4, 770), (8, 771))
+_PROMOTIONS = {1: CAVALIER, 2: FOU, 3: TOUR, 4: REINE}
+# Roque Polyglot (le roi « prend » sa tour) -> case d'arrivée réelle du roi
+_CASTLING_MOVES = {(60, 63): 62, (60, 56): 58, (4, 7): 6, (4, 0): 2}
+
+
+def polyglot_key(rules):
+    """
+    Clé Polyglot de la position courante de `rules`.
+    """
+    key = 0
+    for index, code in enumerate(rules.plateau.cases):
+        if code:
+            kind = 2 * ((code & MASQUE_TYPE) - 1) + (0 if code & NOIR else 1)
+            key ^= CLES_POLYGLOT[64 * kind + (index ^ 56)]
+    for bit, offset in _CASTLING_KEYS:
+        if rules.castling & bit:
+            key ^= CLES_POLYGLOT[offset]
+    ep = rules.ep_square
+    if ep >= 0:
+        # Comme dans ChessRules._compute_hash : seulement si un pion peut prendre
+        pawn = PION | (NOIR if ep >= 32 else 0)
+        cases = rules.plateau.cases
+        behind = ep - 8 if ep >= 32 else ep + 8
+        if ((ep & 7) > 0 and cases[behind - 1] == pawn) or ((ep & 7) < 7 and cases[behind + 1] == pawn):
+            key ^= CLES_POLYGLOT[772 + (ep & 7)]
+    if rules.current_turn == 'blanc':
+        key ^= CLES_POLYGLOT[780]
+    return key
+
+
+def decode_move(rules, raw):
+    """
+    Coup encodé (voir ChessRules.encode_move) correspondant au coup Polyglot
+    `raw` dans la position de `rules`, ou None s'il n'y est pas légal.
+    """
+    start = ((raw >> 6) & 63) ^ 56
+    end = (raw & 63) ^ 56
+    promotion = _PROMOTIONS.get((raw >> 12) & 7, 0)
+    if rules.plateau.cases[start] & MASQUE_TYPE == ROI:
+        end = _CASTLING_MOVES.get((start, end), end)
+    for move in rules.generate_legal_moves(rules.current_turn):
+        if move_start(move) == start and move_end(move) == end and move_promotion(move) == promotion:
+            return move
+    return None
+
+
+def encode_polyglot(move):
+    """
+    Coup Polyglot (16 bits) d'un coup encodé ; sert à écrire des livres.
+    """
+    start, end = move_start(move), move_end(move)
+    if move_flag(move) == MOVE_CASTLING:
+        end = next(rook for (king, rook), target in _CASTLING_MOVES.items() if (king, target) == (start, end))
+    promotion = {piece: code for code, piece in _PROMOTIONS.items()}.get(move_promotion(move), 0)
+    return (end ^ 56) | ((start ^ 56) << 6) | (promotion << 12)
+
+
+class OpeningBook:
+    """
+    Livre Polyglot projeté en mémoire, à fermer avec close() (ou via `with`).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        size = self._file.seek(0, 2)
+        # mmap refuse les fichiers vides
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self.size = size // ENTRY.size
+
+    def __len__(self):
+        return self.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __getitem__(self, i):
+        # Clé de la i-ième entrée : suffit à bisect pour la recherche dichotomique
+        return struct.unpack_from('>Q', self._map, i * ENTRY.size)[0]
+
+    def entries(self, key):
+        """
+        Entrées (coup Polyglot, poids, apprentissage) de la position de clé `key`.
+        """
+        i = bisect.bisect_left(self, key, 0, self.size)
+        entries = []
+        while i < self.size:
+            entry_key, raw, weight, learn = ENTRY.unpack_from(self._map, i * ENTRY.size)
+            if entry_key != key:
+                break
+            entries.append((raw, weight, learn))
+            i += 1
+        return entries
+
+    def moves(self, rules):
+        """
+        Coups du livre légaux dans la position de `rules` : [(coup encodé, poids)],
+        du plus joué au moins joué.
+        """
+        moves = []
+        for raw, weight, _ in self.entries(polyglot_key(rules)):
+            move = decode_move(rules, raw)
+            if move is not None:
+                moves.append((move, weight))
+        moves.sort(key=lambda item: -item[1])
+        return moves
+
+    def choose(self, rules, rng=random):
+        """
+        Coup du livre tiré au hasard proportionnellement aux poids, ou None hors livre.
+        """
+        moves = [(move, weight) for move, weight in self.moves(rules) if weight]
+        if not moves:
+            return None
+        return rng.choices([move for move, _ in moves], [weight for _, weight in moves])[0]
+
+
+def write_book(path, entries):
+    """
+    Écrit un livre à partir d'entrées (clé, coup Polyglot, poids[, apprentissage]),
+    triées au passage comme l'exige la recherche dichotomique.
+    """
+    with open(path, 'wb') as f:
+        for entry in sorted(entries, key=lambda entry: (entry[0], -entry[2])):
+            key, raw, weight = entry[:3]
+            f.write(ENTRY.pack(key, raw, min(weight, 0xFFFF), entry[3] if len(entry) > 3 else 0))
+
+
+def main(argv=None):
+    from pgn import move_to_san
+
+    parser = argparse.ArgumentParser(description="Coups d'un livre d'ouvertures Polyglot pour une position.")
+    parser.add_argument('book', help="fichier .bin")
+    parser.add_argument('--fen', default=START_FEN, help="position (défaut : position initiale)")
+    args = parser.parse_args(argv)
+
+    rules = ChessRules.from_fen(args.fen)
+    with OpeningBook(args.book) as book:
+        moves = book.moves(rules)
+        print(f"{len(book)} entrées, clé {polyglot_key(rules):016x}")
+        total = sum(weight for _, weight in moves) or 1
+        for move, weight in moves:
+            print(f"{move_to_san(rules, move):<8} {weight:>6} {100 * weight / total:5.1f} %")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,132 @@
+"""
+Pendule d'échecs, indépendante de Tkinter.
+
+Le temps n'est pas décompté par tranches : la pendule note l'instant
+(time.monotonic) où le camp au trait a commencé à réfléchir, et le temps
+restant se calcule à la demande, à la milliseconde. Un retard de la boucle
+d'événements ne fait donc jamais dériver la pendule ; il retarde seulement
+l'affichage. Les temps sont en millisecondes entières.
+
+Modes d'incrément (`increment` millisecondes par coup) :
+    FISCHER   : l'incrément est ajouté après chaque coup ;
+    BRONSTEIN : on rend le temps consommé par le coup, au plus l'incrément ;
+    DELAY     : délai simple, le décompte ne commence qu'après l'incrément.
+
+Exemple :
+    clock = ChessClock(30000, 1000)
+    clock.start('blanc')
+    ...
+    clock.press()              # fin du coup des Blancs, la pendule des Noirs part
+    clock.display('blanc')     # '00:30' ou, sous 10 secondes, '09.4'
+"""
+import time
+
+FISCHER, BRONSTEIN, DELAY = 'fischer', 'bronstein', 'delay'
+# Libellés des modes dans l'interface (sélection du temps, contrôle de temps)
+MODE_LABELS = {FISCHER: 'Fischer', BRONSTEIN: 'Bronstein', DELAY: 'Délai'}
+# En dessous de ce temps restant, l'affichage passe aux dixièmes de seconde
+TENTHS_BELOW_MS = 10000
+
+
+def format_time(ms):
+    """
+    Temps restant tel qu'affiché : MM:SS, ou SS.d sous TENTHS_BELOW_MS.
+    """
+    if ms < TENTHS_BELOW_MS:
+        return f"{ms // 1000:02d}.{ms // 100 % 10}"
+    seconds = ms // 1000
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+class ChessClock:
+    """
+    Pendule des deux camps. `turn` est le camp dont la pendule tourne (None à l'arrêt).
+    """
+
+    def __init__(self, initial, increment=0, mode=FISCHER, now=time.monotonic):
+        if mode not in MODE_LABELS:
+            raise ValueError(f"Mode de pendule inconnu : {mode}")
+        self.remaining = {'blanc': initial, 'noir': initial}
+        self.increment = increment
+        self.mode = mode
+        self.turn = None
+        self.started = 0.0
+        self._now = now
+
+    def start(self, couleur):
+        """
+        Lance la pendule de `couleur`.
+        """
+        self.turn = couleur
+        self.started = self._now()
+
+    def elapsed_ms(self):
+        """
+        Temps de réflexion du coup en cours.
+        """
+        if self.turn is None:
+            return 0
+        return int((self._now() - self.started) * 1000)
+
+    def _charged(self, elapsed):
+        # Temps réellement retiré de la pendule pour `elapsed` ms de réflexion
+        if self.mode == DELAY:
+            return max(0, elapsed - self.increment)
+        return elapsed
+
+    def remaining_ms(self, couleur):
+        """
+        Temps restant de `couleur` à cet instant (jamais négatif).
+        """
+        remaining = self.remaining[couleur]
+        if couleur == self.turn:
+            remaining -= self._charged(self.elapsed_ms())
+        return max(remaining, 0)
+
+    def flagged(self, couleur):
+        return self.remaining_ms(couleur) == 0
+
+    def press(self):
+        """
+        Fin du coup du camp au trait : son temps est débité, l'incrément appliqué
+        et la pendule adverse lancée. Renvoie False si le drapeau était déjà
+        tombé (aucun incrément n'est alors accordé et la pendule s'arrête).
+        """
+        couleur, elapsed = self.turn, self.elapsed_ms()
+        if couleur is None:
+            return False
+        self.stop()
+        if self.remaining[couleur] == 0:
+            return False
+        if self.mode == FISCHER:
+            self.remaining[couleur] += self.increment
+        elif self.mode == BRONSTEIN:
+            self.remaining[couleur] += min(elapsed, self.increment)
+        self.start('noir' if couleur == 'blanc' else 'blanc')
+        return True
+
+    def stop(self):
+        """
+        Arrête la pendule en débitant le temps du coup en cours.
+        """
+        if self.turn is None:
+            return
+        self.remaining[self.turn] = self.remaining_ms(self.turn)
+        self.turn = None
+
+    def display(self, couleur):
+        return format_time(self.remaining_ms(couleur))
+
+    def next_change_ms(self):
+        """
+        Délai avant le prochain changement d'affichage de la pendule qui tourne :
+        l'interface n'a pas besoin de se réveiller plus tôt.
+        """
+        if self.turn is None:
+            return None
+        remaining = self.remaining_ms(self.turn)
+        step = 100 if remaining < TENTHS_BELOW_MS else 1000
+        wait = remaining % step + 1
+        if self.mode == DELAY:
+            wait += max(0, self.increment - self.elapsed_ms())
+        return wait
@@ -0,0 +1,136 @@
+"""
+Moteur de recherche en arrière-plan pour l'interface.
+
+EngineWorker fait tourner la recherche (search.py) dans un fil dédié : la
+boucle Tk reste libre et récupère les messages en appelant poll() depuis
+un after(). Chaque recherche travaille sur sa propre copie de la partie
+(position de départ + coups joués), jamais sur le ChessRules de l'interface.
+
+Messages renvoyés par poll() : (identifiant, type, SearchResult) avec
+  'info'     après chaque profondeur complétée,
+  'bestmove' à la fin d'une recherche normale,
+  'ponder'   à la fin d'une réflexion sur le temps de l'adversaire.
+"""
+import queue
+import threading
+
+from ChessRules import ChessRules
+from search import Search, TimeManager
+from transposition import TranspositionTable
+
+
+class EngineWorker:
+    """
+    Fil de recherche piloté par files de messages. La table de transposition
+    est conservée d'une recherche à l'autre, ce qui rend la réflexion sur le
+    temps de l'adversaire (ponder) profitable au coup suivant.
+    """
+
+    def __init__(self, tt=None, representation='tableau', tablebases=None):
+        self.tt = tt if tt is not None else TranspositionTable()
+        self.representation = representation
+        self.tablebases = tablebases
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._current = None
+        self._thread = threading.Thread(target=self._run, name="moteur", daemon=True)
+        self._thread.start()
+
+    def start_search(self, fen, moves, time_manager, ponder=False):
+        """
+        Lance une recherche sur la position obtenue en jouant les coups encodés
+        `moves` depuis `fen`, après avoir abandonné la recherche en cours.
+        Renvoie l'identifiant porté par les messages de cette recherche.
+        """
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self._stop_current()
+            # Courante dès maintenant : un stop() reçu avant le démarrage du fil n'est pas perdu
+            self._current = time_manager
+        self._requests.put((generation, fen, list(moves), time_manager, ponder))
+        return generation
+
+    def ponder(self, fen, moves, movetime=None):
+        """
+        Réflexion pendant que l'adversaire joue, limitée à `movetime` secondes
+        (sans limite par défaut) ; s'arrête aussi avec cancel() ou au lancement
+        de la recherche suivante.
+        """
+        return self.start_search(fen, moves, TimeManager(movetime=movetime), ponder=True)
+
+    def stop(self):
+        """
+        Arrête la recherche en cours au plus vite ; son meilleur coup est tout de même renvoyé.
+        """
+        with self._lock:
+            self._stop_current()
+
+    def cancel(self):
+        """
+        Abandonne la recherche en cours sans en renvoyer le résultat.
+        """
+        with self._lock:
+            self._generation += 1
+            self._stop_current()
+
+    def is_searching(self):
+        return self._current is not None
+
+    def poll(self):
+        """
+        Messages disponibles, sans attendre (à appeler depuis la boucle Tk).
+        """
+        messages = []
+        while True:
+            try:
+                message = self._results.get_nowait()
+            except queue.Empty:
+                return messages
+            if message[0] == self._generation:
+                messages.append(message)
+
+    def shutdown(self):
+        self.cancel()
+        self._requests.put(None)
+
+    def _stop_current(self):
+        if self._current is not None:
+            self._current.stop()
+
+    def _release(self, time_manager):
+        # Une recherche plus récente a pu déjà prendre la place
+        with self._lock:
+            if self._current is time_manager:
+                self._current = None
+
+    def _run(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                if self.tablebases is not None:
+                    self.tablebases.close()
+                return
+            generation, fen, moves, time_manager, ponder = request
+            if generation != self._generation:
+                self._release(time_manager)
+                continue
+            rules = ChessRules.from_fen(fen, self.representation)
+            for move in moves:
+                rules.make_move(move)
+            search = Search(rules, tt=self.tt, tablebases=self.tablebases)
+            search.on_iteration = lambda result: self._publish(generation, 'info', result)
+            if generation != self._generation:
+                self._release(time_manager)
+                continue
+            try:
+                result = search.search(time_manager)
+            finally:
+                self._release(time_manager)
+            self._publish(generation, 'ponder' if ponder else 'bestmove', result)
+
+    def _publish(self, generation, kind, result):
+        if generation == self._generation:
+            self._results.put((generation, kind, result))
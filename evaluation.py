@@ -0,0 +1,76 @@
+"""
+Évaluation statique des positions.
+
+Matériel et tables pièce-case (pst.py) interpolés entre milieu et fin de
+partie selon la phase. Les sommes sont tenues à jour par Plateau.poser() à
+chaque make_move/unmake_move une fois suivre_evaluation() appelée (evaluate le
+fait au premier appel) : évaluer une position ne parcourt pas le plateau.
+Un plateau jamais évalué (perft, validation) ne tient pas ces sommes.
+
+Les scores sont en centipions ; evaluate() les donne du point de vue du camp
+au trait (pour la recherche), evaluate_white() du point de vue des blancs
+(barre d'évaluation, analyse).
+"""
+from ChessRules import ChessRules
+from pst import PST_MG, PST_EG, PHASE, PHASE_TOTALE
+
+
+def suivre_evaluation(rules):
+    """
+    Fournit les tables pièce-case au plateau de `rules` et initialise ses
+    sommes ; poser() les tient ensuite à jour.
+    """
+    plateau = rules.plateau
+    if plateau.pst is None:
+        plateau.pst = (PST_MG, PST_EG, PHASE)
+        plateau.mg, plateau.eg, plateau.phase = evaluate_from_scratch(plateau)
+
+
+def evaluate_white(rules):
+    """
+    Score de la position du point de vue des blancs.
+    """
+    plateau = rules.plateau
+    if plateau.pst is None:
+        suivre_evaluation(rules)
+    phase = min(plateau.phase, PHASE_TOTALE)
+    return (plateau.mg * phase + plateau.eg * (PHASE_TOTALE - phase)) // PHASE_TOTALE
+
+
+def evaluate(rules):
+    """
+    Score de la position du point de vue du camp au trait.
+    """
+    plateau = rules.plateau
+    if plateau.pst is None:
+        suivre_evaluation(rules)
+    phase = min(plateau.phase, PHASE_TOTALE)
+    score = (plateau.mg * phase + plateau.eg * (PHASE_TOTALE - phase)) // PHASE_TOTALE
+    return -score if rules.current_turn == 'noir' else score
+
+
+def evaluate_from_scratch(plateau):
+    """
+    Recalcule (mg, eg, phase) en parcourant le plateau ; sert à vérifier
+    les sommes incrémentales.
+    """
+    mg = eg = phase = 0
+    for index, code in enumerate(plateau.cases):
+        if code:
+            mg += PST_MG[code][index]
+            eg += PST_EG[code][index]
+            phase += PHASE[code]
+    return mg, eg, phase
+
+
+def evaluate_batch(fens, representation='tableau'):
+    """
+    Scores (point de vue des blancs) d'une suite de positions FEN, dans
+    l'ordre. Une seule instance de ChessRules est réutilisée pour toutes.
+    """
+    rules = ChessRules(representation)
+    scores = []
+    for fen in fens:
+        rules.set_fen(fen)
+        scores.append(evaluate_white(rules))
+    return scores
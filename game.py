@@ -0,0 +1,178 @@
+"""
+API de partie sans interface graphique.
+
+Game enveloppe ChessRules pour les processus de calcul, les serveurs et les
+scripts : aucun import de Tkinter, la promotion est portée par le coup
+lui-même et la fin de partie est renvoyée par play() au lieu de passer par
+des callbacks.
+
+Exemple :
+    game = Game()
+    for uci in ('f2f3', 'e7e5', 'g2g4', 'd8h4'):
+        status = game.play(uci)
+    status, game.result   # ('checkmate', '0-1')
+"""
+from ChessRules import (
+    ChessRules, START_FEN, GAME_OVER_MESSAGES,
+    move_start, move_end, move_promotion,
+)
+from pieceEchec import VIDE, CAVALIER, FOU, TOUR, REINE
+from plateau import INDEX_CASES, NOMS_CASES
+
+PROMOTION_LETTERS = {'q': REINE, 'r': TOUR, 'b': FOU, 'n': CAVALIER}
+
+
+class IllegalMoveError(ValueError):
+    """
+    Coup refusé par Game.play() : illégal, mal formé ou joué après la fin de partie.
+    """
+
+
+class Move:
+    """
+    Coup d'une partie : cases de départ et d'arrivée en notation algébrique
+    et type de la pièce de promotion (REINE, TOUR, FOU, CAVALIER) le cas échéant.
+    """
+
+    def __init__(self, start, end, promotion=None):
+        self.start = start
+        self.end = end
+        self.promotion = promotion
+
+    @classmethod
+    def from_uci(cls, text):
+        """
+        Coup depuis sa notation UCI ("e2e4", "e7e8q").
+        """
+        if len(text) not in (4, 5) or text[:2] not in INDEX_CASES or text[2:4] not in INDEX_CASES:
+            raise IllegalMoveError(f"Coup UCI mal formé : {text}")
+        promotion = None
+        if len(text) == 5:
+            if text[4] not in PROMOTION_LETTERS:
+                raise IllegalMoveError(f"Pièce de promotion inconnue : {text}")
+            promotion = PROMOTION_LETTERS[text[4]]
+        return cls(text[:2], text[2:4], promotion)
+
+    @classmethod
+    def from_encoded(cls, move):
+        """
+        Coup depuis son encodage entier (voir ChessRules.encode_move).
+        """
+        return cls(NOMS_CASES[move_start(move)], NOMS_CASES[move_end(move)], move_promotion(move) or None)
+
+    def uci(self):
+        return self.start + self.end + ' pnbrqk'[self.promotion or VIDE].strip()
+
+    def __eq__(self, other):
+        return isinstance(other, Move) and (self.start, self.end, self.promotion) == (other.start, other.end, other.promotion)
+
+    def __hash__(self):
+        return hash((self.start, self.end, self.promotion))
+
+    def __repr__(self):
+        return f"Move({self.uci()!r})"
+
+
+class Game:
+    """
+    Partie jouée coup par coup sur un ChessRules, sans interface graphique.
+    """
+
+    def __init__(self, fen=START_FEN, representation='tableau'):
+        self.start_fen = fen
+        self.rules = ChessRules.from_fen(fen, representation)
+        self.moves = []
+        self.status = self.rules.game_status()
+
+    @property
+    def turn(self):
+        """
+        Camp au trait : 'blanc' ou 'noir'.
+        """
+        return self.rules.current_turn
+
+    @property
+    def is_over(self):
+        return self.status is not None
+
+    @property
+    def result(self):
+        """
+        Résultat PGN de la partie ("*" tant qu'elle continue).
+        """
+        return self.rules.game_result(self.status)
+
+    @property
+    def message(self):
+        """
+        Annonce de fin de partie (None tant qu'elle continue).
+        """
+        if self.status is None:
+            return None
+        winner = 'Blanc' if self.turn == 'noir' else 'Noir'
+        return GAME_OVER_MESSAGES[self.status].format(winner=winner)
+
+    def fen(self):
+        return self.rules.to_fen()
+
+    def legal_moves(self):
+        """
+        Coups légaux du camp au trait.
+        """
+        if self.is_over:
+            return []
+        return [Move.from_encoded(m) for m in self.rules.generate_legal_moves(self.turn)]
+
+    def play(self, move):
+        """
+        Joue un coup (Move ou chaîne UCI) et renvoie la fin de partie atteinte
+        (clé de GAME_OVER_MESSAGES) ou None si la partie continue.
+        Une promotion sans pièce précisée se fait en dame.
+        Lève IllegalMoveError si le coup est refusé.
+        """
+        if isinstance(move, str):
+            move = Move.from_uci(move)
+        if self.is_over:
+            raise IllegalMoveError(f"Partie terminée ({self.status}) : {move.uci()}")
+        if move.start not in INDEX_CASES or move.end not in INDEX_CASES:
+            raise IllegalMoveError(f"Case inconnue : {move.start} -> {move.end}")
+
+        start, end = INDEX_CASES[move.start], INDEX_CASES[move.end]
+        promotion = move.promotion
+        encoded = None
+        for candidate in self.rules.generate_legal_moves(self.turn):
+            if move_start(candidate) != start or move_end(candidate) != end:
+                continue
+            if move_promotion(candidate) == VIDE:
+                # Une pièce de promotion n'a pas de sens pour un coup ordinaire
+                if promotion is None:
+                    encoded = candidate
+                break
+            if move_promotion(candidate) == (promotion or REINE):
+                encoded = candidate
+                break
+        if encoded is None:
+            raise IllegalMoveError(f"Coup illégal : {move.uci()}")
+
+        self.rules.make_move(encoded)
+        self.moves.append(Move.from_encoded(encoded))
+        self.status = self.rules.game_status()
+        self.rules.game_over = self.is_over
+        return self.status
+
+    def undo(self):
+        """
+        Annule le dernier coup joué et le renvoie (None s'il n'y en a aucun).
+        """
+        if not self.moves:
+            return None
+        self.rules.unmake_move()
+        self.status = self.rules.game_status()
+        self.rules.game_over = self.is_over
+        return self.moves.pop()
+
+    def encoded_moves(self):
+        """
+        Coups joués sous forme encodée, depuis `start_fen`, par exemple pour pgn.write_game().
+        """
+        return [entry[0] for entry in self.rules.undo_stack]
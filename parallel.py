@@ -0,0 +1,159 @@
+"""
+Recherche parallèle sur plusieurs processus par partage de la racine.
+
+À chaque profondeur de l'approfondissement itératif, les coups racine sont
+répartis en tranches (en alternance, pour que chaque tranche reçoive des
+coups prometteurs) et chaque tranche est cherchée par un processus du pool
+avec search.Search.search_moves(). Les processus gardent leur position,
+leurs killers, leur historique et leur table de transposition d'une
+profondeur à l'autre ; avec shared_tt=True, la table est une seule zone
+multiprocessing.shared_memory commune à tous (voir transposition.py).
+
+Exemples :
+    python parallel.py --depth 5 --workers 1 2 4 8
+    python parallel.py --fen "..." --movetime 10 --workers 8 --shared-tt
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from ChessRules import ChessRules, START_FEN, move_to_uci
+from search import Search, SearchResult, SearchTimeout, TimeManager, MATE_BOUND
+from transposition import TranspositionTable, table_bytes
+
+# État propre à chaque processus du pool
+_worker = {}
+
+
+def _init_worker(tt_size_mb, shm_name):
+    if shm_name:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _worker['shm'] = shm
+        _worker['tt'] = TranspositionTable(tt_size_mb, buffer=shm.buf)
+    else:
+        _worker['tt'] = TranspositionTable(tt_size_mb)
+    _worker['position'] = None
+
+
+def _search_chunk(fen, history, moves, depth, movetime):
+    """
+    Cherche une tranche de coups racine ; renvoie (score, coup, nœuds),
+    score et coup valant None si le temps est écoulé.
+    """
+    position = (fen, tuple(history))
+    if _worker['position'] != position:
+        rules = ChessRules.from_fen(fen)
+        for move in history:
+            rules.make_move(move)
+        _worker['search'] = Search(rules, tt=_worker['tt'])
+        _worker['position'] = position
+        _worker['tt'].new_search()
+    search = _worker['search']
+    search.nodes = 0
+    try:
+        score, move = search.search_moves(moves, depth, TimeManager(movetime=movetime))
+    except SearchTimeout:
+        return None, None, search.nodes
+    return score, move, search.nodes
+
+
+class ParallelSearch:
+    """
+    Pool de processus de recherche, à fermer avec close() (ou via `with`).
+    """
+
+    def __init__(self, workers=None, tt_size_mb=16, shared_tt=False):
+        self.workers = workers or os.cpu_count() or 1
+        self._shm = None
+        if shared_tt:
+            self._shm = shared_memory.SharedMemory(create=True, size=table_bytes(tt_size_mb))
+            # Zone neuve : toutes les places sont vides
+            self._shm.buf[:] = bytes(self._shm.size)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(tt_size_mb, self._shm.name if self._shm else None),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._pool.shutdown()
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def search(self, fen=START_FEN, history=(), movetime=5.0, max_depth=64, on_iteration=None):
+        """
+        Approfondissement itératif de la position obtenue en jouant les coups
+        encodés `history` depuis `fen`, jusqu'à `max_depth` ou `movetime` secondes.
+        """
+        rules = ChessRules.from_fen(fen)
+        for move in history:
+            rules.make_move(move)
+        order = rules.generate_legal_moves(rules.current_turn)
+        started = time.perf_counter()
+        result = SearchResult(order[0] if order else None)
+        if len(order) <= 1:
+            return result
+
+        nodes = 0
+        for depth in range(1, max_depth + 1):
+            elapsed = time.perf_counter() - started
+            # Comme TimeManager : pas de nouvelle itération au-delà de la moitié du budget
+            if depth > 1 and elapsed >= movetime / 2:
+                break
+            chunks = min(self.workers, len(order))
+            futures = [
+                self._pool.submit(_search_chunk, fen, list(history), order[i::chunks], depth, movetime - elapsed)
+                for i in range(chunks)
+            ]
+            outcomes = [future.result() for future in futures]
+            nodes += sum(outcome[2] for outcome in outcomes)
+            if any(outcome[1] is None for outcome in outcomes):
+                break
+            score, move, _ = max(outcomes, key=lambda outcome: outcome[0])
+            result = SearchResult(move, score, depth, nodes, time.perf_counter() - started)
+            if on_iteration:
+                on_iteration(result)
+            order.remove(move)
+            order.insert(0, move)
+            if abs(score) >= MATE_BOUND:
+                break
+        result.nodes = nodes
+        result.elapsed = time.perf_counter() - started
+        return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recherche parallèle et mesure du passage à l'échelle.")
+    parser.add_argument('--fen', default=START_FEN, help="position à analyser (défaut : position initiale)")
+    parser.add_argument('--depth', type=int, default=5, help="profondeur fixe (défaut : 5)")
+    parser.add_argument('--movetime', type=float, default=600.0, help="temps maximal en secondes")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1],
+                        help="nombres de processus à comparer")
+    parser.add_argument('--shared-tt', action='store_true', help="table de transposition en mémoire partagée")
+    parser.add_argument('--tt-size', type=int, default=16, help="taille de la table en Mo")
+    args = parser.parse_args(argv)
+
+    reference = None
+    for workers in args.workers:
+        with ParallelSearch(workers, args.tt_size, args.shared_tt) as search:
+            result = search.search(args.fen, movetime=args.movetime, max_depth=args.depth)
+        nps = result.nodes / max(result.elapsed, 1e-9)
+        reference = reference or result.elapsed
+        print(f"{workers:>3} processus : {move_to_uci(result.move)} score {result.score} "
+              f"profondeur {result.depth}, {result.nodes} nœuds en {result.elapsed:.2f} s "
+              f"({nps:.0f} n/s, accélération {reference / max(result.elapsed, 1e-9):.2f}x)")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
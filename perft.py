@@ -0,0 +1,217 @@
+"""
+Perft : comptage des feuilles de l'arbre des coups légaux jusqu'à une profondeur donnée.
+
+Sert à la fois de test de correction du générateur de coups (les totaux des
+positions de référence sont connus) et de banc d'essai de performance.
+
+Exemples :
+    python perft.py                          # suite de référence, profondeur 3
+    python perft.py --position kiwipete --depth 4 --divide
+    python perft.py --fen "8/8/8/8/8/8/8/K6k w - - 0 1" --depth 5
+    python perft.py --suite --depth 4 --representation tableau bitboard
+    python perft.py --position initiale --depth 4 --profile
+    python perft.py --suite --depth 2 --check-rules
+
+Avec --check-rules, chaque nœud confronte aussi le générateur aux
+validations utilisées par l'interface (is_valid_move, is_legal) sur tous
+les couples de cases : un coup généré doit y être accepté, et aucun autre.
+"""
+import argparse
+import time
+
+from ChessRules import ChessRules, START_FEN, move_to_uci, move_start, move_end
+from pieceEchec import NOIR, couleur_code, piece_depuis_code
+from plateau import NOMS_CASES
+
+# Positions de référence : FEN et nombre de feuilles attendu par profondeur
+POSITIONS = {
+    'initiale': (
+        START_FEN,
+        [20, 400, 8902, 197281, 4865609],
+    ),
+    'kiwipete': (
+        'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+        [48, 2039, 97862, 4085603],
+    ),
+    'finale-en-passant': (
+        '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+        [14, 191, 2812, 43238, 674624],
+    ),
+    'promotions': (
+        'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+        [6, 264, 9467, 422333],
+    ),
+    'roque-promotion': (
+        'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8',
+        [44, 1486, 62379, 2103487],
+    ),
+    'milieu-de-partie': (
+        'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+        [46, 2079, 89890, 3894594],
+    ),
+}
+
+
+def perft(rules, depth):
+    """
+    Nombre de feuilles à `depth` demi-coups de la position courante.
+    """
+    moves = rules.generate_legal_moves(rules.current_turn)
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+    nodes = 0
+    for move in moves:
+        rules.make_move(move)
+        nodes += perft(rules, depth - 1)
+        rules.unmake_move()
+    return nodes
+
+
+def check_rules(rules):
+    """
+    Désaccords entre generate_legal_moves et is_valid_move / is_legal dans la
+    position courante : liste de (FEN, coup UCI, généré, is_valid_move, is_legal).
+    """
+    generated = {(move_start(move), move_end(move)) for move in rules.generate_legal_moves(rules.current_turn)}
+    own = couleur_code(rules.current_turn)
+    mismatches = []
+    for start, code in enumerate(rules.plateau.cases):
+        if not code or (code & NOIR) != own:
+            continue
+        piece = piece_depuis_code(code)
+        for end in range(64):
+            if end == start:
+                continue
+            expected = (start, end) in generated
+            valid = rules.is_valid_move(piece, NOMS_CASES[start], NOMS_CASES[end])
+            legal = rules.is_legal(piece, NOMS_CASES[start], NOMS_CASES[end])
+            if valid != expected or legal != expected:
+                mismatches.append((rules.to_fen(), NOMS_CASES[start] + NOMS_CASES[end], expected, valid, legal))
+    return mismatches
+
+
+def perft_checked(rules, depth, mismatches):
+    """
+    Perft qui appelle check_rules à chaque nœud intérieur et ajoute les
+    désaccords à `mismatches`. Beaucoup plus lent : profondeurs 2 ou 3.
+    """
+    if depth <= 0:
+        return 1
+    mismatches.extend(check_rules(rules))
+    moves = rules.generate_legal_moves(rules.current_turn)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        rules.make_move(move)
+        nodes += perft_checked(rules, depth - 1, mismatches)
+        rules.unmake_move()
+    return nodes
+
+
+def _report(mismatches, limit=20):
+    for fen, uci, expected, valid, legal in mismatches[:limit]:
+        print(f"  DÉSACCORD {uci} ({fen}) : généré={expected} is_valid_move={valid} is_legal={legal}")
+    if len(mismatches) > limit:
+        print(f"  ... {len(mismatches) - limit} autres désaccords")
+
+
+def divide(rules, depth):
+    """
+    Détail du perft par coup à la racine : liste de (coup UCI, feuilles).
+    """
+    result = []
+    for move in rules.generate_legal_moves(rules.current_turn):
+        rules.make_move(move)
+        result.append((move_to_uci(move), perft(rules, depth - 1)))
+        rules.unmake_move()
+    return result
+
+
+def run_suite(depth, representations=('tableau',), check=False):
+    """
+    Lance toutes les positions de référence jusqu'à `depth` (bornée par les
+    totaux connus) et affiche nœuds, temps et nœuds/seconde.
+    Avec `check`, les validations de l'interface sont confrontées au générateur.
+    Retourne True si tous les totaux sont corrects (et sans désaccord).
+    """
+    ok = True
+    for representation in representations:
+        total_nodes, total_time = 0, 0.0
+        for name, (fen, expected) in POSITIONS.items():
+            rules = ChessRules.from_fen(fen, representation)
+            d = min(depth, len(expected))
+            mismatches = []
+            start = time.perf_counter()
+            nodes = perft_checked(rules, d, mismatches) if check else perft(rules, d)
+            elapsed = time.perf_counter() - start
+            total_nodes += nodes
+            total_time += elapsed
+            status = 'ok' if nodes == expected[d - 1] else f'ÉCHEC (attendu {expected[d - 1]})'
+            if mismatches:
+                status += f', {len(mismatches)} désaccords'
+            ok = ok and nodes == expected[d - 1] and not mismatches
+            print(f"[{representation}] {name:<18} d={d} {nodes:>10} nœuds "
+                  f"{elapsed:8.2f} s {nodes / max(elapsed, 1e-9):>10.0f} n/s  {status}")
+            _report(mismatches)
+        print(f"[{representation}] total {total_nodes} nœuds en {total_time:.2f} s "
+              f"({total_nodes / max(total_time, 1e-9):.0f} n/s)")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Perft sur le moteur de règles ChessRules.")
+    parser.add_argument('--depth', type=int, default=3, help="profondeur en demi-coups (défaut : 3)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--position', choices=sorted(POSITIONS), help="position de référence")
+    source.add_argument('--fen', help="position quelconque au format FEN")
+    source.add_argument('--suite', action='store_true', help="toutes les positions de référence (défaut)")
+    parser.add_argument('--divide', action='store_true', help="détail par coup à la racine")
+    parser.add_argument('--representation', nargs='+', default=['tableau'],
+                        choices=['tableau', 'bitboard'], help="représentation(s) du plateau")
+    parser.add_argument('--profile', action='store_true', help="profil cProfile des fonctions les plus coûteuses")
+    parser.add_argument('--check-rules', action='store_true',
+                        help="vérifie aussi is_valid_move et is_legal à chaque nœud (lent)")
+    args = parser.parse_args(argv)
+
+    if not (args.position or args.fen):
+        return 0 if run_suite(args.depth, args.representation, args.check_rules) else 1
+
+    fen = args.fen or POSITIONS[args.position][0]
+    expected = POSITIONS[args.position][1] if args.position else []
+    for representation in args.representation:
+        rules = ChessRules.from_fen(fen, representation)
+        start = time.perf_counter()
+        if args.profile:
+            import cProfile
+            import pstats
+            profiler = cProfile.Profile()
+            profiler.enable()
+        if args.divide:
+            detail = divide(rules, args.depth)
+            for uci, count in detail:
+                print(f"{uci}: {count}")
+            nodes = sum(count for _, count in detail)
+        elif args.check_rules:
+            mismatches = []
+            nodes = perft_checked(rules, args.depth, mismatches)
+            _report(mismatches)
+            if mismatches:
+                print(f"ÉCHEC : {len(mismatches)} désaccords avec is_valid_move / is_legal")
+                return 1
+        else:
+            nodes = perft(rules, args.depth)
+        elapsed = time.perf_counter() - start
+        if args.profile:
+            profiler.disable()
+            pstats.Stats(profiler).sort_stats('tottime').print_stats(15)
+        print(f"[{representation}] perft({args.depth}) = {nodes} en {elapsed:.2f} s "
+              f"({nodes / max(elapsed, 1e-9):.0f} n/s)")
+        if args.depth <= len(expected) and nodes != expected[args.depth - 1]:
+            print(f"ÉCHEC : attendu {expected[args.depth - 1]}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,267 @@
+"""
+Lecture et écriture de parties au format PGN.
+
+La lecture est en flux : read_games() parcourt le fichier ligne par ligne et
+produit une partie à la fois, de sorte que la mémoire ne dépend que de la
+taille d'une partie et non de celle du fichier. Les coups sont en notation
+algébrique standard (SAN) anglaise, comme l'exige le format (N, B, R, Q, K).
+
+Exemple :
+    with open('parties.pgn', encoding='utf-8') as f:
+        for game in read_games(f):
+            rules = game.rules()
+            for move in replay(rules, game.moves):
+                ...
+"""
+import re
+
+from ChessRules import (
+    ChessRules, START_FEN, MOVE_DOUBLE_PUSH, MOVE_EN_PASSANT, MOVE_CASTLING,
+    encode_move, move_start, move_end, move_promotion, move_flag,
+)
+from pieceEchec import VIDE, PION, CAVALIER, FOU, TOUR, REINE, ROI, NOIR, MASQUE_TYPE, couleur_code
+from plateau import INDEX_CASES, NOMS_CASES
+
+SAN_PIECES = {'N': CAVALIER, 'B': FOU, 'R': TOUR, 'Q': REINE, 'K': ROI}
+SAN_LETTERS = {piece_type: lettre for lettre, piece_type in SAN_PIECES.items()}
+SEVEN_TAG_ROSTER = ('Event', 'Site', 'Date', 'Round', 'White', 'Black', 'Result')
+RESULTS = ('1-0', '0-1', '1/2-1/2', '*')
+
+_TAG_RE = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+_TOKEN_RE = re.compile(r'\{[^}]*\}|;[^\n]*|\$\d+|[()]|1-0|0-1|1/2-1/2|\*|\d+\.+|[^\s{}();$.]+')
+_SAN_RE = re.compile(r'([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?')
+
+
+class PGNError(ValueError):
+    """
+    Partie ou coup PGN illisible ou illégal.
+    """
+
+
+class PGNGame:
+    """
+    Partie lue dans un fichier PGN : en-têtes, coups SAN et résultat.
+    """
+
+    def __init__(self, headers=None, moves=None, result='*'):
+        self.headers = headers if headers is not None else {}
+        self.moves = moves if moves is not None else []
+        self.result = result
+
+    def rules(self, representation='tableau'):
+        """
+        ChessRules dans la position de départ de la partie (en-tête FEN éventuel).
+        """
+        return ChessRules.from_fen(self.headers.get('FEN', START_FEN), representation)
+
+
+def read_games(stream):
+    """
+    Génère les parties (PGNGame) d'un flux texte PGN, une à la fois.
+    """
+    headers = {}
+    movetext = []
+    for line in stream:
+        if line.startswith('['):
+            if movetext:
+                yield _build_game(headers, movetext)
+                headers, movetext = {}, []
+            match = _TAG_RE.match(line)
+            if match:
+                headers[match.group(1)] = match.group(2).replace('\\"', '"').replace('\\\\', '\\')
+        elif line.startswith('%'):
+            # Ligne d'échappement : ignorée par le format
+            continue
+        elif line.strip() or movetext:
+            movetext.append(line)
+    if headers or any(line.strip() for line in movetext):
+        yield _build_game(headers, movetext)
+
+
+def _build_game(headers, movetext):
+    moves = []
+    result = headers.get('Result', '*')
+    depth = 0
+    for token in _TOKEN_RE.findall(''.join(movetext)):
+        first = token[0]
+        if first == '(':
+            depth += 1
+        elif first == ')':
+            depth -= 1
+        elif depth or first in '{;$' or token[-1] == '.':
+            continue
+        elif token in RESULTS:
+            result = token
+        else:
+            moves.append(token)
+    return PGNGame(headers, moves, result)
+
+
+def san_to_move(rules, san):
+    """
+    Coup encodé correspondant au SAN donné dans la position courante de `rules`.
+    Lève PGNError si le coup est illégal ou ambigu.
+    """
+    own_color = couleur_code(rules.current_turn)
+    text = san.rstrip('+#!?')
+    if text in ('O-O', '0-0', 'O-O-O', '0-0-0'):
+        king_side = len(text) == 3
+        candidates = [
+            m for m in rules.generate_moves(rules.current_turn)
+            if move_flag(m) == MOVE_CASTLING and (move_end(m) > move_start(m)) == king_side
+        ]
+    else:
+        match = _SAN_RE.fullmatch(text)
+        if not match:
+            raise PGNError(f"Coup SAN illisible : {san}")
+        letter, from_file, from_rank, square, promotion = match.groups()
+        end = INDEX_CASES[square]
+        promotion = SAN_PIECES[promotion] if promotion else VIDE
+        if letter:
+            candidates = _piece_candidates(rules, SAN_PIECES[letter] | own_color, end, from_file, from_rank)
+        else:
+            candidates = _pawn_candidates(rules, own_color, end, from_file, promotion)
+    if len(candidates) > 1 or (candidates and (candidates[0] >> 15) != MOVE_CASTLING):
+        candidates = [m for m in candidates if not rules._leaves_king_in_check(m, own_color)]
+    if len(candidates) != 1:
+        raise PGNError(f"Coup {'ambigu' if candidates else 'illégal'} : {san}")
+    return candidates[0]
+
+
+def _piece_candidates(rules, code, end, from_file, from_rank):
+    # Recherche inverse : seules les pièces du bon type qui attaquent la case d'arrivée
+    cases = rules.plateau.cases
+    target = cases[end]
+    if target and (target & NOIR) == (code & NOIR):
+        return []
+    return [
+        encode_move(start, end)
+        for start in rules.plateau.attaquants(end, code & NOIR)
+        if cases[start] == code
+        and (not from_file or NOMS_CASES[start][0] == from_file)
+        and (not from_rank or NOMS_CASES[start][1] == from_rank)
+    ]
+
+
+def _pawn_candidates(rules, own_color, end, from_file, promotion):
+    cases = rules.plateau.cases
+    pawn = PION | own_color
+    back = 8 if own_color != NOIR else -8
+    last_row = 0 if own_color != NOIR else 7
+    if (end >> 3 == last_row) != bool(promotion):
+        return []
+    if from_file:
+        start = end + back - (end & 7) + (ord(from_file) - ord('a'))
+        if not 0 <= start < 64 or cases[start] != pawn or abs((start & 7) - (end & 7)) != 1:
+            return []
+        if end == rules.ep_square:
+            return [encode_move(start, end, flag=MOVE_EN_PASSANT)]
+        target = cases[end]
+        if not target or (target & NOIR) == own_color:
+            return []
+        return [encode_move(start, end, promotion)]
+    if cases[end] or not 0 <= end + back < 64:
+        return []
+    if cases[end + back] == pawn:
+        return [encode_move(end + back, end, promotion)]
+    double = end + 2 * back
+    start_row = 6 if own_color != NOIR else 1
+    if not cases[end + back] and 0 <= double < 64 and double >> 3 == start_row and cases[double] == pawn:
+        return [encode_move(double, end, flag=MOVE_DOUBLE_PUSH)]
+    return []
+
+
+def move_to_san(rules, move):
+    """
+    Notation SAN d'un coup légal encodé, dans la position courante de `rules`.
+    """
+    cases = rules.plateau.cases
+    start, end = move_start(move), move_end(move)
+    code = cases[start]
+    piece_type = code & MASQUE_TYPE
+    own_color = code & NOIR
+
+    if move_flag(move) == MOVE_CASTLING:
+        san = 'O-O' if end > start else 'O-O-O'
+    elif piece_type == PION:
+        san = NOMS_CASES[start][0] + 'x' if (start & 7) != (end & 7) else ''
+        san += NOMS_CASES[end]
+        if move_promotion(move):
+            san += '=' + SAN_LETTERS[move_promotion(move)]
+    else:
+        rivals = [
+            move_start(m) for m in _piece_candidates(rules, code, end, None, None)
+            if move_start(m) != start and not rules._leaves_king_in_check(m, own_color)
+        ]
+        disambiguation = ''
+        if rivals:
+            if all((r & 7) != (start & 7) for r in rivals):
+                disambiguation = NOMS_CASES[start][0]
+            elif all((r >> 3) != (start >> 3) for r in rivals):
+                disambiguation = NOMS_CASES[start][1]
+            else:
+                disambiguation = NOMS_CASES[start]
+        san = SAN_LETTERS[piece_type] + disambiguation + ('x' if cases[end] else '') + NOMS_CASES[end]
+
+    rules.make_move(move)
+    try:
+        opponent = rules.current_turn
+        if rules.is_in_check(opponent):
+            san += '+' if rules.has_legal_move(opponent) else '#'
+    finally:
+        rules.unmake_move()
+    return san
+
+
+def replay(rules, sans):
+    """
+    Joue les coups SAN sur `rules` et génère les coups encodés au fur et à mesure.
+    """
+    for san in sans:
+        move = san_to_move(rules, san)
+        rules.make_move(move)
+        yield move
+
+
+def write_game(stream, moves, headers=None, start_fen=START_FEN, result='*', width=79):
+    """
+    Écrit une partie PGN : en-têtes (les sept obligatoires en tête) puis les
+    coups encodés `moves`, joués depuis `start_fen`, en SAN.
+    """
+    headers = dict(headers or {})
+    headers['Result'] = result
+    if start_fen != START_FEN:
+        headers['SetUp'] = '1'
+        headers['FEN'] = start_fen
+    for tag in SEVEN_TAG_ROSTER:
+        value = headers.pop(tag, '?')
+        stream.write(f'[{tag} "{_escape(value)}"]\n')
+    for tag, value in headers.items():
+        stream.write(f'[{tag} "{_escape(value)}"]\n')
+    stream.write('\n')
+
+    rules = ChessRules.from_fen(start_fen)
+    tokens = []
+    for index, move in enumerate(moves):
+        san = move_to_san(rules, move)
+        # Le numéro du coup reste collé au coup blanc (ou au premier coup noir)
+        if rules.current_turn == 'blanc':
+            san = f'{rules.fullmove_number}. {san}'
+        elif index == 0:
+            san = f'{rules.fullmove_number}... {san}'
+        tokens.append(san)
+        rules.make_move(move)
+    tokens.append(result)
+
+    line = ''
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > width:
+            stream.write(line + '\n')
+            line = token
+        else:
+            line = f'{line} {token}' if line else token
+    stream.write(line + '\n\n')
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
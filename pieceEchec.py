@@ -1,11 +1,34 @@
+# Codes entiers des pièces utilisés par la représentation interne du plateau.
+# Le type occupe les 3 bits de poids faible, la couleur le bit 3 (noir = 8).
+VIDE, PION, CAVALIER, FOU, TOUR, REINE, ROI = range(7)
+BLANC, NOIR = 0, 8
+MASQUE_TYPE = 7
+
+
+def couleur_code(couleur):
+    """
+    Retourne le bit de couleur associé à 'blanc' ou 'noir'.
+    """
+    return BLANC if couleur == 'blanc' else NOIR
+
+
 class PieceEchec:
     """
     Classe de base pour toutes les pièces d'échecs.
     """
+    type_code = VIDE
+
     def __init__(self, couleur, symbol):
         self.couleur = couleur  # 'blanc' ou 'noir'
         self.symbol = symbol  # Unicode symbol for the piece
 
+    @property
+    def code(self):
+        """
+        Code entier de la pièce (type | couleur).
+        """
+        return self.type_code | couleur_code(self.couleur)
+
     def __str__(self):
         return self.symbol
 
@@ -14,6 +37,8 @@ class Pion(PieceEchec):
     """
     Classe pour la pièce Pion.
     """
+    type_code = PION
+
     def __init__(self, couleur):
         symbol = '♙' if couleur == 'blanc' else '♟'
         super().__init__(couleur, symbol)
@@ -23,6 +48,8 @@ class Tour(PieceEchec):
     """
     Classe pour la pièce Tour.
     """
+    type_code = TOUR
+
     def __init__(self, couleur):
         symbol = '♖' if couleur == 'blanc' else '♜'
         super().__init__(couleur, symbol)
@@ -32,6 +59,8 @@ class Cavalier(PieceEchec):
     """
     Classe pour la pièce Cavalier.
     """
+    type_code = CAVALIER
+
     def __init__(self, couleur):
         symbol = '♘' if couleur == 'blanc' else '♞'
         super().__init__(couleur, symbol)
@@ -41,6 +70,8 @@ class Fou(PieceEchec):
     """
     Classe pour la pièce Fou.
     """
+    type_code = FOU
+
     def __init__(self, couleur):
         symbol = '♗' if couleur == 'blanc' else '♝'
         super().__init__(couleur, symbol)
@@ -50,6 +81,8 @@ class Reine(PieceEchec):
     """
     Classe pour la pièce Reine (ou Dame).
     """
+    type_code = REINE
+
     def __init__(self, couleur):
         symbol = '♕' if couleur == 'blanc' else '♛'
         super().__init__(couleur, symbol)
@@ -59,6 +92,32 @@ class Roi(PieceEchec):
     """
     Classe pour la pièce Roi.
     """
+    type_code = ROI
+
     def __init__(self, couleur):
         symbol = '♔' if couleur == 'blanc' else '♚'
-        super().__init__(couleur, symbol)
\ No newline at end of file
+        super().__init__(couleur, symbol)
+
+
+CLASSES_PAR_TYPE = {
+    PION: Pion,
+    CAVALIER: Cavalier,
+    FOU: Fou,
+    TOUR: Tour,
+    REINE: Reine,
+    ROI: Roi,
+}
+
+# Une instance partagée par code : le plateau ne stocke que des entiers et
+# reconstruit la vue objet à la demande sans allocation.
+PIECES_PAR_CODE = [None] * 16
+for _type, _classe in CLASSES_PAR_TYPE.items():
+    PIECES_PAR_CODE[_type | BLANC] = _classe('blanc')
+    PIECES_PAR_CODE[_type | NOIR] = _classe('noir')
+
+
+def piece_depuis_code(code):
+    """
+    Retourne l'instance de pièce correspondant à un code (None pour une case vide).
+    """
+    return PIECES_PAR_CODE[code]
@@ -1,37 +1,268 @@
+from pieceEchec import (
+    VIDE, PION, CAVALIER, FOU, TOUR, REINE, ROI, NOIR, MASQUE_TYPE,
+    piece_depuis_code,
+)
+from zobrist import CLES_PIECES
+
+# Cases indexées de 0 (a8) à 63 (h1) : index = ligne * 8 + colonne,
+# avec la même convention (ligne, colonne) que notation_nombre.
+NOMS_CASES = [
+    'abcdefgh'[colonne] + '12345678'[7 - ligne]
+    for ligne in range(8)
+    for colonne in range(8)
+]
+INDEX_CASES = {nom: index for index, nom in enumerate(NOMS_CASES)}
+
+
+def _cases_atteintes(index, decalages):
+    ligne, colonne = divmod(index, 8)
+    return tuple(
+        (ligne + dl) * 8 + colonne + dc
+        for dl, dc in decalages
+        if 0 <= ligne + dl < 8 and 0 <= colonne + dc < 8
+    )
+
+
+def _rayon(index, dl, dc):
+    ligne, colonne = divmod(index, 8)
+    cases = []
+    ligne, colonne = ligne + dl, colonne + dc
+    while 0 <= ligne < 8 and 0 <= colonne < 8:
+        cases.append(ligne * 8 + colonne)
+        ligne, colonne = ligne + dl, colonne + dc
+    return tuple(cases)
+
+
+DIRECTIONS_TOUR = ((-1, 0), (1, 0), (0, -1), (0, 1))
+DIRECTIONS_FOU = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+# Tables précalculées par case : cibles des sauts (cavalier, roi) et rayons
+# de glissement ordonnés depuis la case (tour, fou ; la reine combine les deux).
+SAUTS_CAVALIER = [
+    _cases_atteintes(i, ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)))
+    for i in range(64)
+]
+PAS_ROI = [_cases_atteintes(i, DIRECTIONS_TOUR + DIRECTIONS_FOU) for i in range(64)]
+RAYONS_TOUR = [tuple(r for r in (_rayon(i, dl, dc) for dl, dc in DIRECTIONS_TOUR) if r) for i in range(64)]
+RAYONS_FOU = [tuple(r for r in (_rayon(i, dl, dc) for dl, dc in DIRECTIONS_FOU) if r) for i in range(64)]
+RAYONS_REINE = [RAYONS_TOUR[i] + RAYONS_FOU[i] for i in range(64)]
+RAYONS_PAR_TYPE = {FOU: RAYONS_FOU, TOUR: RAYONS_TOUR, REINE: RAYONS_REINE}
+# PRISES_PION[couleur >> 3][i] : cases prises par un pion de cette couleur posé en i.
+# Vu depuis la cible, les pions attaquants de la couleur c se trouvent sur
+# PRISES_PION[(c ^ NOIR) >> 3][cible].
+PRISES_PION = [
+    [_cases_atteintes(i, ((-1, -1), (-1, 1))) for i in range(64)],
+    [_cases_atteintes(i, ((1, -1), (1, 1))) for i in range(64)],
+]
+
+
+def _alignements():
+    entre = [None] * 4096
+    ligne = [VIDE] * 4096
+    for depart in range(64):
+        for type_ligne, rayons in ((TOUR, RAYONS_TOUR[depart]), (FOU, RAYONS_FOU[depart])):
+            for rayon in rayons:
+                for position, arrivee in enumerate(rayon):
+                    entre[depart * 64 + arrivee] = rayon[:position]
+                    ligne[depart * 64 + arrivee] = type_ligne
+    return entre, ligne
+
+
+# ENTRE[a * 64 + b] : cases strictement entre a et b s'ils sont alignés (sinon None) ;
+# LIGNE[a * 64 + b] : TOUR (même ligne/colonne), FOU (même diagonale) ou VIDE.
+ENTRE, LIGNE = _alignements()
+
+
 class Plateau:
     """
     Classe représentant le plateau d'échecs.
+
+    Le plateau est stocké dans une liste de 64 codes entiers (voir pieceEchec) ;
+    l'accès par notation algébrique ("e4") n'est qu'une vue de compatibilité.
+    `cle` est la part "pièces" du hachage de Zobrist et `rois` la case de
+    chaque roi (indexée par couleur >> 3, -1 si absent) et `nombre` le nombre
+    de pièces (pour les tables de finales). Tous sont tenus à jour par poser().
+
+    `mg`, `eg` et `phase` sont les sommes pièce-case de l'évaluation ; elles ne
+    sont tenues que si l'évaluation a fourni ses tables dans `pst` (voir
+    evaluation.suivre_evaluation), pour que perft et la génération de coups
+    n'en paient pas le coût.
     """
 
     def __init__(self):
-        self.plateau = {}
+        self.cases = [VIDE] * 64
+        self.cle = 0
+        self.rois = [-1, -1]
+        self.mg = self.eg = self.phase = self.nombre = 0
+        self.pst = None
         self.initialiser_plateau()
 
     def initialiser_plateau(self):
-        for ligne in range(8):
-            for colonne in range(8):
-                coord = self.notation_lettre((ligne, colonne))
-                self.plateau[coord] = None
+        for index in range(64):
+            self.cases[index] = VIDE
+        self.cle = 0
+        self.rois = [-1, -1]
+        self.mg = self.eg = self.phase = self.nombre = 0
+
+    def poser(self, index, code):
+        """
+        Place un code de pièce (ou VIDE) sur la case d'indice donné.
+        Toute modification du plateau passe par ici pour que les
+        représentations dérivées (hachage, bitboards) restent synchronisées.
+        """
+        ancien = self.cases[index]
+        pst = self.pst
+        if ancien:
+            self.cle ^= CLES_PIECES[ancien][index]
+            if pst:
+                self.mg -= pst[0][ancien][index]
+                self.eg -= pst[1][ancien][index]
+                self.phase -= pst[2][ancien]
+            self.nombre -= 1
+            if (ancien & MASQUE_TYPE) == ROI and self.rois[ancien >> 3] == index:
+                self.rois[ancien >> 3] = -1
+        if code:
+            self.cle ^= CLES_PIECES[code][index]
+            if pst:
+                self.mg += pst[0][code][index]
+                self.eg += pst[1][code][index]
+                self.phase += pst[2][code]
+            self.nombre += 1
+            if (code & MASQUE_TYPE) == ROI:
+                self.rois[code >> 3] = index
+        self.cases[index] = code
+
+    def cibles(self, index, code):
+        """
+        Cases atteignables par une pièce autre qu'un pion : cases vides
+        ou occupées par une pièce adverse.
+        """
+        cases = self.cases
+        couleur = code & NOIR
+        piece_type = code & MASQUE_TYPE
+        if piece_type == CAVALIER or piece_type == ROI:
+            sauts = SAUTS_CAVALIER[index] if piece_type == CAVALIER else PAS_ROI[index]
+            return [c for c in sauts if not cases[c] or (cases[c] & NOIR) != couleur]
+
+        resultat = []
+        for rayon in RAYONS_PAR_TYPE[piece_type][index]:
+            for c in rayon:
+                cible = cases[c]
+                if not cible:
+                    resultat.append(c)
+                    continue
+                if (cible & NOIR) != couleur:
+                    resultat.append(c)
+                break
+        return resultat
+
+    def est_attaquee(self, index, attaquant):
+        """
+        Indique si la case d'indice donné est attaquée par le camp `attaquant` (BLANC ou NOIR).
+        Les rayons et sauts sont lancés depuis la case cible vers les attaquants possibles.
+        """
+        cases = self.cases
+        cavalier = CAVALIER | attaquant
+        for c in SAUTS_CAVALIER[index]:
+            if cases[c] == cavalier:
+                return True
+        pion = PION | attaquant
+        for c in PRISES_PION[(attaquant ^ NOIR) >> 3][index]:
+            if cases[c] == pion:
+                return True
+        roi = ROI | attaquant
+        for c in PAS_ROI[index]:
+            if cases[c] == roi:
+                return True
+        reine = REINE | attaquant
+        fou = FOU | attaquant
+        for rayon in RAYONS_FOU[index]:
+            for c in rayon:
+                code = cases[c]
+                if code:
+                    if code == fou or code == reine:
+                        return True
+                    break
+        tour = TOUR | attaquant
+        for rayon in RAYONS_TOUR[index]:
+            for c in rayon:
+                code = cases[c]
+                if code:
+                    if code == tour or code == reine:
+                        return True
+                    break
+        return False
+
+    def attaquants(self, index, attaquant):
+        """
+        Liste des cases des pièces du camp `attaquant` qui attaquent la case d'indice donné.
+        """
+        cases = self.cases
+        resultat = [c for c in SAUTS_CAVALIER[index] if cases[c] == CAVALIER | attaquant]
+        resultat += [c for c in PRISES_PION[(attaquant ^ NOIR) >> 3][index] if cases[c] == PION | attaquant]
+        resultat += [c for c in PAS_ROI[index] if cases[c] == ROI | attaquant]
+        reine = REINE | attaquant
+        for rayons, glisseur in ((RAYONS_FOU[index], FOU | attaquant), (RAYONS_TOUR[index], TOUR | attaquant)):
+            for rayon in rayons:
+                for c in rayon:
+                    code = cases[c]
+                    if code:
+                        if code == glisseur or code == reine:
+                            resultat.append(c)
+                        break
+        return resultat
+
+    def carte_attaques(self, attaquant):
+        """
+        Ensemble (entier de 64 bits) des cases attaquées par le camp `attaquant`.
+        """
+        cases = self.cases
+        carte = 0
+        for depart, code in enumerate(cases):
+            if not code or (code & NOIR) != attaquant:
+                continue
+            piece_type = code & MASQUE_TYPE
+            if piece_type == PION:
+                atteintes = PRISES_PION[attaquant >> 3][depart]
+            elif piece_type == CAVALIER:
+                atteintes = SAUTS_CAVALIER[depart]
+            elif piece_type == ROI:
+                atteintes = PAS_ROI[depart]
+            else:
+                atteintes = []
+                for rayon in RAYONS_PAR_TYPE[piece_type][depart]:
+                    for c in rayon:
+                        atteintes.append(c)
+                        if cases[c]:
+                            break
+            for c in atteintes:
+                carte |= 1 << c
+        return carte
 
     def deplacer(self, depart, arrivee):
-        if depart not in self.plateau or arrivee not in self.plateau:
+        if depart not in INDEX_CASES or arrivee not in INDEX_CASES:
             raise ValueError("Coordonnée invalide.")
 
-        piece = self.plateau[depart]
-        if not piece:
+        depart, arrivee = INDEX_CASES[depart], INDEX_CASES[arrivee]
+        code = self.cases[depart]
+        if not code:
             raise ValueError("Aucune pièce à cet emplacement.")
 
-        self.plateau[arrivee] = piece
-        self.plateau[depart] = None
+        self.poser(arrivee, code)
+        self.poser(depart, VIDE)
 
     def items(self):
-        return self.plateau.items()
+        cases = self.cases
+        return [(nom, piece_depuis_code(cases[index])) for index, nom in enumerate(NOMS_CASES)]
 
     def keys(self):
         """
         Retourne les coordonnées du plateau.
         """
-        return self.plateau.keys()
+        return NOMS_CASES
+
+    def values(self):
+        return [piece_depuis_code(code) for code in self.cases]
 
     def notation_nombre(self, coord):
         colonne = ord(coord[0]) - ord('a')
@@ -44,7 +275,7 @@ class Plateau:
         return lettres[position[1]] + chiffres[7 - position[0]]
 
     def __getitem__(self, coord):
-        return self.plateau[coord]
+        return piece_depuis_code(self.cases[INDEX_CASES[coord]])
 
     def __setitem__(self, coord, piece):
-        self.plateau[coord] = piece
\ No newline at end of file
+        self.poser(INDEX_CASES[coord], piece.code if piece else VIDE)
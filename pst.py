@@ -0,0 +1,118 @@
+"""
+Tables pièce-case de l'évaluation, en milieu et en fin de partie.
+
+Les tables sont écrites du point de vue des blancs avec la 8e rangée en
+premier, soit la même numérotation que plateau.NOMS_CASES (a8 = 0) ; la
+case d'une pièce noire est retournée verticalement (index ^ 56). Les
+tables finales PST_MG/PST_EG[code][index] incluent la valeur matérielle et
+sont signées (positives pour les blancs), pour que Plateau.poser() puisse
+tenir les deux scores à jour par simple addition.
+"""
+from pieceEchec import PION, CAVALIER, FOU, TOUR, REINE, ROI, NOIR
+
+MATERIEL_MG = {PION: 82, CAVALIER: 337, FOU: 365, TOUR: 477, REINE: 1025, ROI: 0}
+MATERIEL_EG = {PION: 94, CAVALIER: 281, FOU: 297, TOUR: 512, REINE: 936, ROI: 0}
+
+# Poids de chaque pièce dans la phase de jeu : 24 au départ, 0 sans pièces
+PHASE_PIECE = {PION: 0, CAVALIER: 1, FOU: 1, TOUR: 2, REINE: 4, ROI: 0}
+PHASE_TOTALE = 24
+
+_PION_MG = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+     50,  50,  50,  50,  50,  50,  50,  50,
+     10,  10,  20,  30,  30,  20,  10,  10,
+      5,   5,  10,  25,  25,  10,   5,   5,
+      0,   0,   0,  20,  20,   0,   0,   0,
+      5,  -5, -10,   0,   0, -10,  -5,   5,
+      5,  10,  10, -20, -20,  10,  10,   5,
+      0,   0,   0,   0,   0,   0,   0,   0,
+)
+_PION_EG = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+     80,  80,  80,  80,  80,  80,  80,  80,
+     50,  50,  50,  50,  50,  50,  50,  50,
+     30,  30,  30,  30,  30,  30,  30,  30,
+     15,  15,  15,  15,  15,  15,  15,  15,
+      5,   5,   5,   5,   5,   5,   5,   5,
+      0,   0,   0,   0,   0,   0,   0,   0,
+      0,   0,   0,   0,   0,   0,   0,   0,
+)
+_CAVALIER = (
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20,   0,   0,   0,   0, -20, -40,
+    -30,   0,  10,  15,  15,  10,   0, -30,
+    -30,   5,  15,  20,  20,  15,   5, -30,
+    -30,   0,  15,  20,  20,  15,   0, -30,
+    -30,   5,  10,  15,  15,  10,   5, -30,
+    -40, -20,   0,   5,   5,   0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+)
+_FOU = (
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,  10,  10,   5,   0, -10,
+    -10,   5,   5,  10,  10,   5,   5, -10,
+    -10,   0,  10,  10,  10,  10,   0, -10,
+    -10,  10,  10,  10,  10,  10,  10, -10,
+    -10,   5,   0,   0,   0,   0,   5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+)
+_TOUR_MG = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+      5,  10,  10,  10,  10,  10,  10,   5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+      0,   0,   0,   5,   5,   0,   0,   0,
+)
+_TOUR_EG = (0,) * 64
+_REINE = (
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,   5,   5,   5,   0, -10,
+     -5,   0,   5,   5,   5,   5,   0,  -5,
+      0,   0,   5,   5,   5,   5,   0,  -5,
+    -10,   5,   5,   5,   5,   5,   0, -10,
+    -10,   0,   5,   0,   0,   0,   0, -10,
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+)
+_ROI_MG = (
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+     20,  20,   0,   0,   0,   0,  20,  20,
+     20,  30,  10,   0,   0,  10,  30,  20,
+)
+_ROI_EG = (
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10,   0,   0, -10, -20, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -30,   0,   0,   0,   0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50,
+)
+
+_TABLES_MG = {PION: _PION_MG, CAVALIER: _CAVALIER, FOU: _FOU, TOUR: _TOUR_MG, REINE: _REINE, ROI: _ROI_MG}
+_TABLES_EG = {PION: _PION_EG, CAVALIER: _CAVALIER, FOU: _FOU, TOUR: _TOUR_EG, REINE: _REINE, ROI: _ROI_EG}
+
+
+def _combiner(tables, materiel):
+    resultat = [[0] * 64 for _ in range(16)]
+    for piece_type, table in tables.items():
+        for index in range(64):
+            resultat[piece_type][index] = materiel[piece_type] + table[index]
+            resultat[piece_type | NOIR][index] = -(materiel[piece_type] + table[index ^ 56])
+    return resultat
+
+
+# PST_MG[code][index], PST_EG[code][index] ; PHASE[code] (0 pour VIDE)
+PST_MG = _combiner(_TABLES_MG, MATERIEL_MG)
+PST_EG = _combiner(_TABLES_EG, MATERIEL_EG)
+PHASE = [PHASE_PIECE.get(code & 7, 0) if code & 7 else 0 for code in range(16)]
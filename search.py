@@ -0,0 +1,357 @@
+"""
+Moteur de recherche pour l'adversaire ordinateur.
+
+Negamax alpha-bêta en approfondissement itératif sur les coups encodés de
+ChessRules, avec :
+  - ordre des coups : coup de l'itération précédente, prises MVV-LVA,
+    promotions, coups "killer" et heuristique d'historique ;
+  - recherche de quiescence sur les prises pour éviter l'effet d'horizon ;
+  - extension d'échec et détection des nulles par répétition ;
+  - table de transposition (voir transposition.py) pour les coupures et l'ordre ;
+  - tables de finales (voir tablebase.py), si fournies, sondées dans l'arbre ;
+  - gestion du temps à partir de la pendule (temps restant et incrément).
+L'évaluation par défaut est evaluation.evaluate (matériel et tables pièce-case).
+
+Exemple :
+    rules = ChessRules.from_fen(fen)
+    result = Search(rules).search(TimeManager(remaining=180, increment=2))
+    result.move, result.score, result.depth
+"""
+import time
+
+from ChessRules import MOVE_EN_PASSANT
+from pieceEchec import PION, REINE, NOIR, MASQUE_TYPE, couleur_code
+from evaluation import evaluate
+from transposition import TranspositionTable, BOUND_EXACT, BOUND_LOWER, BOUND_UPPER
+
+# Valeurs pour l'ordre des prises (MVV-LVA) et l'élagage delta
+PIECE_VALUES = [0, 100, 320, 330, 500, 900, 0, 0]
+MATE_SCORE = 100000
+# Un score au-delà de ce seuil annonce un mat en (MATE_SCORE - |score|) demi-coups
+MATE_BOUND = MATE_SCORE - 1000
+MAX_PLY = 128
+
+_ORDER_PREVIOUS = 1 << 30
+_ORDER_CAPTURE = 1 << 24
+_ORDER_KILLER = 1 << 22
+
+
+def _score_to_tt(score, ply):
+    # Les scores de mat sont stockés relativement au nœud, pas à la racine
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score, ply):
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+
+class SearchTimeout(Exception):
+    """
+    Levée au cœur de la recherche quand le temps alloué est écoulé.
+    """
+
+
+class TimeManager:
+    """
+    Budget de réflexion pour un coup, en secondes.
+
+    `remaining` et `increment` viennent de la pendule du camp qui joue ;
+    `movetime` impose un temps fixe. La limite souple interdit de lancer une
+    nouvelle itération, la limite dure interrompt la recherche en cours.
+    """
+
+    def __init__(self, remaining=None, increment=0, movetime=None, moves_to_go=30, margin=0.05):
+        if movetime is not None:
+            soft = hard = movetime
+        elif remaining is not None:
+            # Part du temps restant plus l'essentiel de l'incrément, sans jamais risquer la chute
+            soft = remaining / moves_to_go + increment * 0.8
+            hard = min(soft * 3, max(remaining - margin, 0.01) * 0.5)
+            soft = min(soft, hard)
+        else:
+            soft = hard = float('inf')
+        self.soft = soft
+        self.hard = hard
+        self.started = time.perf_counter()
+        self.stopped = False
+
+    def start(self):
+        """
+        Remet le chronomètre à zéro ; un arrêt déjà demandé reste valable.
+        """
+        self.started = time.perf_counter()
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def stop(self):
+        """
+        Demande l'arrêt immédiat de la recherche (utilisable depuis un autre fil).
+        """
+        self.stopped = True
+
+    def out_of_time(self):
+        return self.stopped or self.elapsed() >= self.hard
+
+    def can_start_iteration(self):
+        return not self.stopped and self.elapsed() < self.soft
+
+
+class SearchResult:
+    """
+    Résultat d'une recherche : meilleur coup encodé, score (centipions, du
+    point de vue du camp au trait), profondeur complétée et nœuds visités.
+    """
+
+    def __init__(self, move=None, score=0, depth=0, nodes=0, elapsed=0.0):
+        self.move = move
+        self.score = score
+        self.depth = depth
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return (f"SearchResult(move={self.move}, score={self.score}, depth={self.depth}, "
+                f"nodes={self.nodes}, elapsed={self.elapsed:.2f})")
+
+
+class Search:
+    """
+    Recherche alpha-bêta sur une instance de ChessRules ; la position est
+    modifiée avec make_move/unmake_move puis restaurée.
+    """
+
+    def __init__(self, rules, evaluate=evaluate, tt=None, tt_size_mb=16, tablebases=None):
+        self.rules = rules
+        self.evaluate = evaluate
+        self.tablebases = tablebases
+        # Une table peut être partagée d'un coup à l'autre pour réutiliser les analyses
+        self.tt = tt if tt is not None else TranspositionTable(tt_size_mb)
+        self.nodes = 0
+        self.killers = [[0, 0] for _ in range(MAX_PLY)]
+        # history[couleur >> 3][départ * 64 + arrivée]
+        self.history = [[0] * 4096, [0] * 4096]
+        self.time_manager = None
+        self.on_iteration = None
+
+    def search(self, time_manager=None, max_depth=64):
+        """
+        Approfondissement itératif jusqu'à `max_depth` ou épuisement du temps.
+        `on_iteration(result)` est appelé après chaque profondeur complétée.
+        """
+        self.time_manager = time_manager or TimeManager()
+        self.time_manager.start()
+        self.nodes = 0
+        self.killers = [[0, 0] for _ in range(MAX_PLY)]
+        self.history = [[0] * 4096, [0] * 4096]
+        self.tt.new_search()
+
+        rules = self.rules
+        root_moves = rules.generate_legal_moves(rules.current_turn)
+        result = SearchResult()
+        if not root_moves:
+            return result
+        result.move = root_moves[0]
+        if len(root_moves) == 1:
+            return result
+
+        for depth in range(1, max_depth + 1):
+            if depth > 1 and not self.time_manager.can_start_iteration():
+                break
+            try:
+                score, move = self._search_root(root_moves, depth, result.move)
+            except SearchTimeout:
+                break
+            result = SearchResult(move, score, depth, self.nodes, self.time_manager.elapsed())
+            if self.on_iteration:
+                self.on_iteration(result)
+            if abs(score) >= MATE_BOUND:
+                break
+        result.nodes = self.nodes
+        result.elapsed = self.time_manager.elapsed()
+        return result
+
+    def search_moves(self, moves, depth, time_manager=None):
+        """
+        Recherche à profondeur fixe restreinte aux coups racine `moves`, pris
+        dans l'ordre donné (partage de la racine entre processus, voir
+        parallel.py). Renvoie (score, coup) du meilleur ; lève SearchTimeout
+        si le temps est écoulé avant la fin.
+        """
+        self.time_manager = time_manager or TimeManager()
+        rules = self.rules
+        alpha, beta = -MATE_SCORE - 1, MATE_SCORE + 1
+        best_move = moves[0]
+        for move in moves:
+            rules.make_move(move)
+            try:
+                score = -self._negamax(depth - 1, -beta, -alpha, 1)
+            finally:
+                rules.unmake_move()
+            if score > alpha:
+                alpha, best_move = score, move
+        return alpha, best_move
+
+    def _search_root(self, root_moves, depth, previous):
+        rules = self.rules
+        alpha, beta = -MATE_SCORE - 1, MATE_SCORE + 1
+        best_move = previous
+        ordered = self._order(root_moves, 0, previous)
+        for move in ordered:
+            rules.make_move(move)
+            try:
+                score = -self._negamax(depth - 1, -beta, -alpha, 1)
+            finally:
+                rules.unmake_move()
+            if score > alpha:
+                alpha, best_move = score, move
+        self.tt.store(rules.hash, best_move, alpha, depth, BOUND_EXACT)
+        # La racine est triée : le meilleur coup passe en tête pour l'itération suivante
+        root_moves.remove(best_move)
+        root_moves.insert(0, best_move)
+        return alpha, best_move
+
+    def _negamax(self, depth, alpha, beta, ply):
+        rules = self.rules
+        self.nodes += 1
+        if not self.nodes & 2047 and self.time_manager.out_of_time():
+            raise SearchTimeout
+
+        if rules.is_repetition(2):
+            return 0
+        if rules.move_counter >= 100:
+            # Un mat donné au 100e demi-coup l'emporte sur la règle des 50 coups
+            couleur = rules.current_turn
+            if rules.is_in_check(couleur) and not rules.has_legal_move(couleur):
+                return -MATE_SCORE + ply
+            return 0
+        if ply >= MAX_PLY - 1:
+            return self.evaluate(rules)
+        tablebases = self.tablebases
+        if tablebases is not None and rules.plateau.nombre <= tablebases.max_pieces:
+            probe = tablebases.probe(rules)
+            if probe is not None:
+                # Distance au mat exacte : même échelle que les mats trouvés par la recherche
+                result, distance = probe
+                return result * (MATE_SCORE - ply - distance) if result else 0
+
+        couleur = rules.current_turn
+        in_check = rules.is_in_check(couleur)
+        if in_check:
+            depth += 1
+        if depth <= 0:
+            return self._quiescence(alpha, beta, ply)
+
+        key = rules.hash
+        tt_move = 0
+        entry = self.tt.probe(key)
+        if entry is not None:
+            tt_move, tt_score, tt_depth, bound = entry
+            if tt_depth >= depth:
+                tt_score = _score_from_tt(tt_score, ply)
+                if (bound == BOUND_EXACT
+                        or (bound == BOUND_LOWER and tt_score >= beta)
+                        or (bound == BOUND_UPPER and tt_score <= alpha)):
+                    return tt_score
+
+        moves = rules.generate_legal_moves(couleur)
+        if not moves:
+            return -MATE_SCORE + ply if in_check else 0
+
+        cases = rules.plateau.cases
+        side = couleur_code(couleur) >> 3
+        best_move = 0
+        bound = BOUND_UPPER
+        for move in self._order(moves, ply, tt_move):
+            rules.make_move(move)
+            try:
+                score = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                rules.unmake_move()
+            if score >= beta:
+                if not cases[(move >> 6) & 63] and not (move >> 12) & 7 and (move >> 15) != MOVE_EN_PASSANT:
+                    killers = self.killers[ply]
+                    if killers[0] != move:
+                        killers[1] = killers[0]
+                        killers[0] = move
+                    self.history[side][move & 4095] += depth * depth
+                self.tt.store(key, move, _score_to_tt(beta, ply), depth, BOUND_LOWER)
+                return beta
+            if score > alpha:
+                alpha, best_move, bound = score, move, BOUND_EXACT
+        self.tt.store(key, best_move, _score_to_tt(alpha, ply), depth, bound)
+        return alpha
+
+    def _quiescence(self, alpha, beta, ply):
+        rules = self.rules
+        self.nodes += 1
+        if not self.nodes & 2047 and self.time_manager.out_of_time():
+            raise SearchTimeout
+
+        stand_pat = self.evaluate(rules)
+        if stand_pat >= beta or ply >= MAX_PLY - 1:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        couleur = rules.current_turn
+        own_color = couleur_code(couleur)
+        cases = rules.plateau.cases
+        plateau = rules.plateau
+        captures = [
+            m for m in rules.generate_moves(couleur)
+            if cases[(m >> 6) & 63] or (m >> 12) & 7 == REINE or (m >> 15) == MOVE_EN_PASSANT
+        ]
+        for move in self._order(captures, ply):
+            # Élagage delta : même en gagnant la pièce prise, alpha reste hors d'atteinte
+            gain = PIECE_VALUES[cases[(move >> 6) & 63] & MASQUE_TYPE] + PIECE_VALUES[(move >> 12) & 7]
+            if stand_pat + gain + 200 < alpha and not (move >> 12) & 7:
+                continue
+            rules.make_move(move)
+            try:
+                king = plateau.rois[own_color >> 3]
+                if king >= 0 and plateau.est_attaquee(king, own_color ^ NOIR):
+                    continue
+                score = -self._quiescence(-beta, -alpha, ply + 1)
+            finally:
+                rules.unmake_move()
+            if score >= beta:
+                return beta
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    def _order(self, moves, ply, previous=None):
+        """
+        Trie les coups : coup précédent, prises (victime la plus chère, attaquant
+        le moins cher), promotions, killers puis historique.
+        """
+        cases = self.rules.plateau.cases
+        killers = self.killers[ply]
+        history = self.history[couleur_code(self.rules.current_turn) >> 3]
+        scored = []
+        for move in moves:
+            end = (move >> 6) & 63
+            victim = cases[end]
+            promotion = (move >> 12) & 7
+            if move == previous:
+                score = _ORDER_PREVIOUS
+            elif victim or promotion or (move >> 15) == MOVE_EN_PASSANT:
+                attacker = cases[move & 63] & MASQUE_TYPE
+                victim_value = PIECE_VALUES[victim & MASQUE_TYPE] if victim else PIECE_VALUES[PION] * (not promotion)
+                score = _ORDER_CAPTURE + victim_value * 8 + PIECE_VALUES[promotion] - PIECE_VALUES[attacker] // 100
+            elif move == killers[0] or move == killers[1]:
+                score = _ORDER_KILLER + (move == killers[0])
+            else:
+                score = history[move & 4095]
+            scored.append((score, move))
+        scored.sort(reverse=True)
+        return [move for _, move in scored]
@@ -3,6 +3,7 @@
 import tkinter as tk
 from tkinter import ttk
 from theme_ihm import setup_theme, FONT_BODY
+from clock import MODE_LABELS, FISCHER
 
 class TimeSelectionWindow(tk.Toplevel):
     def __init__(self, parent, launch_game_callback):
@@ -57,6 +58,14 @@ class TimeSelectionWindow(tk.Toplevel):
         )
         self.increment_scale.pack(fill="x", padx=5)
 
+        # Fischer : incrément ajouté ; Bronstein : temps consommé rendu ; Délai : décompte retardé
+        self.mode_var = tk.StringVar(value=MODE_LABELS[FISCHER])
+        ttk.Label(custom_frame, text="Type d'incrément :", font=FONT_BODY).pack()
+        ttk.Combobox(
+            custom_frame, textvariable=self.mode_var,
+            values=list(MODE_LABELS.values()), state="readonly"
+        ).pack(padx=5)
+
         self.custom_time_label = ttk.Label(custom_frame, text="0.5 min + 0 s", font=FONT_BODY)
         self.custom_time_label.pack(pady=5)
 
@@ -72,6 +81,8 @@ class TimeSelectionWindow(tk.Toplevel):
         minutes = self.minutes_var.get()
         increment = self.increment_var.get()
         time_control = f"Personnalisé - {minutes} min + {increment}s"
+        if self.mode_var.get() != MODE_LABELS[FISCHER]:
+            time_control += f" ({self.mode_var.get()})"
         self.on_validate(time_control)
 
     def on_validate(self, time_control):
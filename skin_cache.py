@@ -0,0 +1,168 @@
+"""
+Cache des images de pièces, partagé par toutes les parties du processus.
+
+Les 12 images d'un skin sont décodées une seule fois par taille de case, à
+la première demande, puis réutilisées par chaque ChessHMI : changer de skin
+ou relancer une partie ne relit aucun PNG. Le cache garde les MAX_ENTRIES
+couples (skin, taille) les plus récemment utilisés ; les plus anciens sont
+oubliés (une partie en cours garde ses propres références aux images).
+
+Tk ne sait redimensionner une image que par facteurs entiers (zoom,
+subsample) : une taille quelconque est approchée par un rapport zoom/subsample
+(voir scale_factors), calculé une fois par taille puis servi par le cache.
+L'image n'est jamais plus grande que la case, mais peut être un peu plus
+petite : avec les sprites de 256 pixels et des cases de 24 à 128 pixels,
+elle en garde au moins 80 % du côté.
+
+Un skin peut fournir un atlas (atlas.png : les 6 pièces blanches puis les 6
+noires, dans l'ordre de PIECE_CLASSES) : un seul fichier est alors décodé et
+les pièces y sont découpées. Construction d'un atlas à partir des 12 PNG :
+    python skin_cache.py skins/classique
+"""
+import argparse
+import os
+import tkinter as tk
+from collections import OrderedDict
+
+PIECE_CLASSES = ('Pion', 'Tour', 'Cavalier', 'Fou', 'Reine', 'Roi')
+COLOURS = ('blanc', 'noir')
+ATLAS_FILE = 'atlas.png'
+# Plusieurs tailles d'un même skin pendant un redimensionnement de fenêtre
+MAX_ENTRIES = 8
+# Le zoom construit une image intermédiaire de (source * zoom)² pixels
+MAX_ZOOM = 2
+# Écart accepté sans essayer de zoom plus grand
+SCALE_TOLERANCE = 0.1
+
+
+def scale_factors(source, size):
+    """
+    Couple (zoom, subsample) amenant `source` pixels au plus près de `size`
+    sans la dépasser. Le plus petit zoom (au plus MAX_ZOOM) qui approche
+    `size` à SCALE_TOLERANCE près est retenu, sinon le meilleur essayé.
+    """
+    best = None
+    for zoom in range(1, MAX_ZOOM + 1):
+        subsample = max(1, -(-source * zoom // size))
+        scaled = source * zoom // subsample
+        if best is None or scaled > best[2]:
+            best = (zoom, subsample, scaled)
+        if scaled >= size * (1 - SCALE_TOLERANCE):
+            break
+    return best[:2]
+
+
+def _scale(image, size):
+    zoom, subsample = scale_factors(max(image.width(), image.height()), size)
+    if zoom > 1:
+        image = image.zoom(zoom)
+    return image.subsample(subsample) if subsample > 1 else image
+
+
+class SkinCache:
+    """
+    Images par (répertoire du skin, taille de case), en LRU borné.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.loads = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, images_dir, size, master=None):
+        """
+        Dictionnaire {(classe, couleur): PhotoImage} du skin à la taille donnée.
+        Le dictionnaire est partagé : ne pas le modifier.
+        """
+        key = (os.path.abspath(images_dir), size)
+        images = self._entries.get(key)
+        if images is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return images
+        images = self._load(images_dir, size, master)
+        self.loads += 1
+        self._entries[key] = images
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return images
+
+    def evict(self, images_dir=None):
+        """
+        Oublie un skin (toutes tailles), ou tout le cache sans argument.
+        """
+        if images_dir is None:
+            self._entries.clear()
+            return
+        path = os.path.abspath(images_dir)
+        for key in [key for key in self._entries if key[0] == path]:
+            del self._entries[key]
+
+    def _load(self, images_dir, size, master):
+        atlas_path = os.path.join(images_dir, ATLAS_FILE)
+        if os.path.exists(atlas_path):
+            return self._load_atlas(atlas_path, size, master)
+        images = {}
+        for cls in PIECE_CLASSES:
+            for col in COLOURS:
+                path = os.path.join(images_dir, f"{col}_{cls.lower()}.png")
+                if os.path.exists(path):
+                    img = tk.PhotoImage(master=master, file=path)
+                    images[(cls, col)] = _scale(img, size)
+        return images
+
+    def _load_atlas(self, path, size, master):
+        atlas = tk.PhotoImage(master=master, file=path)
+        width, height = atlas.width() // len(PIECE_CLASSES), atlas.height() // len(COLOURS)
+        images = {}
+        for row, col in enumerate(COLOURS):
+            for column, cls in enumerate(PIECE_CLASSES):
+                sprite = tk.PhotoImage(master=master)
+                x, y = column * width, row * height
+                sprite.tk.call(sprite, 'copy', atlas, '-from', x, y, x + width, y + height)
+                images[(cls, col)] = _scale(sprite, size)
+        return images
+
+
+# Cache unique de l'application
+SKIN_CACHE = SkinCache()
+
+
+def piece_images(images_dir, size, master=None):
+    return SKIN_CACHE.get(images_dir, size, master)
+
+
+def build_atlas(images_dir, master=None):
+    """
+    Assemble les 12 PNG d'un skin (de même taille) en un atlas.png ; renvoie son chemin.
+    """
+    sprites = {(cls, col): tk.PhotoImage(master=master, file=os.path.join(images_dir, f"{col}_{cls.lower()}.png"))
+               for cls in PIECE_CLASSES for col in COLOURS}
+    width, height = sprites[('Pion', 'blanc')].width(), sprites[('Pion', 'blanc')].height()
+    atlas = tk.PhotoImage(master=master, width=width * len(PIECE_CLASSES), height=height * len(COLOURS))
+    for row, col in enumerate(COLOURS):
+        for column, cls in enumerate(PIECE_CLASSES):
+            atlas.tk.call(atlas, 'copy', sprites[(cls, col)], '-to', column * width, row * height)
+    path = os.path.join(images_dir, ATLAS_FILE)
+    atlas.write(path, format='png')
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Construit l'atlas d'un ou plusieurs skins.")
+    parser.add_argument('skins', nargs='+', help="répertoires de skins (ex. skins/classique)")
+    args = parser.parse_args(argv)
+    root = tk.Tk()
+    root.withdraw()
+    for images_dir in args.skins:
+        print(build_atlas(images_dir, root))
+    root.destroy()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
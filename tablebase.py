@@ -0,0 +1,431 @@
+"""
+Tables de finales sans pions à 3 et 4 pièces (rois compris).
+
+Chaque table couvre une répartition du matériel, nommée comme « KQvKR » (le
+camp le plus fort d'abord ; une position où les noirs ont la dame est lue
+dans la table en échangeant les couleurs). Elle est construite par analyse
+rétrograde : les mats sont posés au demi-coup 0, puis on remonte les coups
+adverses demi-coup par demi-coup ; les prises sortent vers les tables plus
+petites, générées d'abord.
+
+Fichier : un octet par position, indexé par
+    (trait * 10 + triangle(roi blanc)) * 64**(n-1) + cases des autres pièces,
+le roi blanc étant ramené dans le triangle a1-d1-d4 par les 8 symétries du
+plateau. Octet 0 : nulle (ou position impossible) ; sinon distance au mat
+en demi-coups + 1. Cette distance est impaire si le camp au trait gagne,
+donc l'octet pair ; un octet impair est une perte (1 : il est mat). Les fichiers sont
+projetés en mémoire (mmap) à la consultation. La règle des 50 coups n'est
+pas prise en compte.
+
+Exemples :
+    python tablebase.py --generate all
+    python tablebase.py --generate KQvKR KRvKB --dir tablebases
+    python tablebase.py --fen "8/8/8/4k3/8/8/8/KQ6 w - - 0 1"
+"""
+import argparse
+import itertools
+import logging
+import mmap
+import os
+from array import array
+
+from ChessRules import ChessRules
+from pieceEchec import CAVALIER, FOU, TOUR, REINE, ROI, NOIR, MASQUE_TYPE
+from plateau import SAUTS_CAVALIER, PAS_ROI, RAYONS_PAR_TYPE, ENTRE, LIGNE, NOMS_CASES
+
+logger = logging.getLogger(__name__)
+
+TABLEBASE_DIR = 'tablebases'
+MAX_PIECES = 4
+SUFFIX = '.tbl'
+
+LETTERS = {ROI: 'K', REINE: 'Q', TOUR: 'R', FOU: 'B', CAVALIER: 'N'}
+TYPES = {letter: piece_type for piece_type, letter in LETTERS.items()}
+# Ordre des pièces dans un nom de table et dans l'index : roi d'abord, puis de la plus forte à la plus faible
+_ORDER = {ROI: 0, REINE: 1, TOUR: 2, FOU: 3, CAVALIER: 4}
+
+
+def _transform(index, symmetry):
+    ligne, colonne = divmod(index, 8)
+    if symmetry & 1:
+        colonne = 7 - colonne
+    if symmetry & 2:
+        ligne = 7 - ligne
+    if symmetry & 4:
+        # Réflexion par la grande diagonale a1-h8
+        ligne, colonne = 7 - colonne, 7 - ligne
+    return ligne * 8 + colonne
+
+
+SYMMETRIES = [[_transform(index, symmetry) for index in range(64)] for symmetry in range(8)]
+# Triangle a1-d1-d4 : colonnes a à d, rangées 1 à 4, sous la grande diagonale
+TRIANGLE = [index for index in range(64) if index & 7 <= 3 and index >> 3 >= 4 and (index & 7) + (index >> 3) >= 7]
+TRIANGLE_INDEX = [TRIANGLE.index(index) if index in TRIANGLE else -1 for index in range(64)]
+# Symétrie ramenant le roi blanc de chaque case dans le triangle
+CANONICAL = [next(s for s in range(8) if SYMMETRIES[s][index] in TRIANGLE) for index in range(64)]
+
+
+def table_size(pieces):
+    return 2 * len(TRIANGLE) * 64 ** (pieces - 1)
+
+
+def _material(codes):
+    """
+    (nom de table, couleurs échangées, ordre des pièces dans l'index) pour une liste de codes.
+    """
+    sides = ([], [])
+    for i, code in enumerate(codes):
+        sides[code >> 3].append(i)
+    for side in sides:
+        side.sort(key=lambda i: _ORDER[codes[i] & MASQUE_TYPE])
+    keys = [(len(side), [-_ORDER[codes[i] & MASQUE_TYPE] for i in side]) for side in sides]
+    swapped = keys[1] > keys[0]
+    strong, weak = (sides[1], sides[0]) if swapped else sides
+    name = ''.join(LETTERS[codes[i] & MASQUE_TYPE] for i in strong) + 'v' \
+        + ''.join(LETTERS[codes[i] & MASQUE_TYPE] for i in weak)
+    return name, swapped, [strong[0], weak[0]] + strong[1:] + weak[1:]
+
+
+def parse_name(name):
+    """
+    Codes des pièces d'une table dans l'ordre de son index ; lève ValueError si le nom est invalide.
+    """
+    try:
+        white, black = name.upper().split('V')
+        codes = [TYPES[letter] for letter in white] + [TYPES[letter] | NOIR for letter in black]
+    except (ValueError, KeyError):
+        raise ValueError(f"Nom de table invalide : {name}") from None
+    if white.count('K') != 1 or black.count('K') != 1 or len(codes) > MAX_PIECES:
+        raise ValueError(f"Nom de table invalide : {name}")
+    canonical, _, order = _material(codes)
+    return canonical, [codes[i] for i in order]
+
+
+def all_names(pieces=MAX_PIECES):
+    """
+    Noms de toutes les tables sans pions jusqu'à `pieces` pièces, des plus petites aux plus grandes.
+    """
+    names = []
+    for count in range(3, pieces + 1):
+        for extra in itertools.combinations_with_replacement('QRBN', count - 2):
+            for split in range(len(extra) + 1):
+                name = parse_name('K' + ''.join(extra[:split]) + 'vK' + ''.join(extra[split:]))[0]
+                if name not in names:
+                    names.append(name)
+    return names
+
+
+def _index(squares, stm):
+    symmetry = SYMMETRIES[CANONICAL[squares[0]]]
+    index = stm * len(TRIANGLE) + TRIANGLE_INDEX[symmetry[squares[0]]]
+    for square in squares[1:]:
+        index = index * 64 + symmetry[square]
+    return index
+
+
+def _decode(value):
+    # (1 gain, 0 nulle, -1 perte pour le camp au trait ; distance au mat en demi-coups)
+    if not value:
+        return 0, 0
+    return (1 if (value - 1) & 1 else -1), value - 1
+
+
+def _attacks(code, start, target, occupied):
+    piece_type = code & MASQUE_TYPE
+    if piece_type == ROI:
+        return target in PAS_ROI[start]
+    if piece_type == CAVALIER:
+        return target in SAUTS_CAVALIER[start]
+    line = LIGNE[start * 64 + target]
+    if not line or (piece_type != REINE and piece_type != line):
+        return False
+    return not any(square in occupied for square in ENTRE[start * 64 + target])
+
+
+def _attacked(codes, squares, target, attacker, skip=-1):
+    occupied = set(squares)
+    for i, code in enumerate(codes):
+        if i != skip and code & NOIR == attacker and _attacks(code, squares[i], target, occupied):
+            return True
+    return False
+
+
+def _targets(code, square, occupied):
+    """
+    Cases d'arrivée d'une pièce, occupées ou non, en s'arrêtant à la première pièce de chaque rayon.
+    """
+    piece_type = code & MASQUE_TYPE
+    if piece_type == ROI:
+        return PAS_ROI[square]
+    if piece_type == CAVALIER:
+        return SAUTS_CAVALIER[square]
+    targets = []
+    for rayon in RAYONS_PAR_TYPE[piece_type][square]:
+        for target in rayon:
+            targets.append(target)
+            if target in occupied:
+                break
+    return targets
+
+
+class Tablebases:
+    """
+    Tables de finales d'un répertoire, ouvertes à la demande. `max_pieces`
+    vaut le plus grand nombre de pièces des tables présentes (0 sans table),
+    ce qui permet à la recherche de ne rien sonder quand il n'y en a pas.
+    """
+
+    def __init__(self, directory=TABLEBASE_DIR):
+        self.directory = directory
+        self._tables = {}
+        self._files = []
+        self.max_pieces = max((len(parse_name(name)[1]) for name in self.available()), default=0)
+
+    def available(self):
+        if not os.path.isdir(self.directory):
+            return []
+        names = []
+        for filename in sorted(os.listdir(self.directory)):
+            if filename.endswith(SUFFIX):
+                try:
+                    names.append(parse_name(filename[:-len(SUFFIX)])[0])
+                except ValueError:
+                    continue
+        return names
+
+    def close(self):
+        for table in self._tables.values():
+            if table is not None:
+                table.close()
+        for f in self._files:
+            f.close()
+        self._tables.clear()
+        self._files.clear()
+
+    def table(self, name):
+        """
+        Table projetée en mémoire, ou None si son fichier est absent.
+        """
+        if name not in self._tables:
+            path = os.path.join(self.directory, name + SUFFIX)
+            if not os.path.exists(path):
+                self._tables[name] = None
+                return None
+            f = open(path, 'rb')
+            if f.seek(0, 2) != table_size(len(parse_name(name)[1])):
+                f.close()
+                raise ValueError(f"Table de finale corrompue : {path}")
+            self._files.append(f)
+            self._tables[name] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._tables[name]
+
+    def probe_position(self, codes, squares, stm):
+        """
+        (résultat, distance au mat) pour des pièces `codes` sur `squares`,
+        `stm` valant 0 si les blancs ont le trait ; None sans table.
+        """
+        if len(codes) == 2:
+            return 0, 0
+        name, swapped, order = _material(codes)
+        table = self.table(name)
+        if table is None:
+            return None
+        squares = [squares[i] for i in order]
+        if swapped:
+            squares = [square ^ 56 for square in squares]
+            stm ^= 1
+        return _decode(table[_index(squares, stm)])
+
+    def probe(self, rules):
+        """
+        (résultat, distance au mat en demi-coups) de la position de `rules`
+        pour le camp au trait — résultat 1 gain, 0 nulle, -1 perte — ou
+        None si la position n'est pas couverte.
+        """
+        plateau = rules.plateau
+        if plateau.nombre > self.max_pieces or rules.castling:
+            return None
+        codes, squares = [], []
+        for index, code in enumerate(plateau.cases):
+            if code:
+                if code & MASQUE_TYPE not in _ORDER:
+                    return None
+                codes.append(code)
+                squares.append(index)
+        return self.probe_position(codes, squares, 0 if rules.current_turn == 'blanc' else 1)
+
+
+def generate(name, directory=TABLEBASE_DIR):
+    """
+    Construit la table `name` (et les tables plus petites dont elle dépend)
+    dans `directory` ; renvoie le chemin du fichier écrit.
+    """
+    name, codes = parse_name(name)
+    path = os.path.join(directory, name + SUFFIX)
+    count = len(codes)
+    tablebases = Tablebases(directory)
+    # Tables atteintes par une prise, générées d'abord
+    captures = {}
+    for j in range(2, count):
+        rest = codes[:j] + codes[j + 1:]
+        sub = _material(rest)[0]
+        if len(rest) > 2 and tablebases.table(sub) is None:
+            tablebases._tables.pop(sub)
+            generate(sub, directory)
+        captures[j] = rest
+
+    logger.info("Génération de %s", name)
+    size = table_size(count)
+    values = bytearray(size)
+    remaining = bytearray(size)
+    exit_loss = bytearray(size)
+    state = bytearray(size)
+    RESOLVED, CANNOT_LOSE = 1, 2
+    buckets = [array('I') for _ in range(256)]
+    colours = [code & NOIR for code in codes]
+    kings = (0, 1)
+
+    # Passe initiale : mats, pats, coups restant dans la table et sorties par prise
+    index = -1
+    for stm in (0, 1):
+        side, other = stm * NOIR, (stm ^ 1) * NOIR
+        for king in TRIANGLE:
+            for rest in itertools.product(range(64), repeat=count - 1):
+                index += 1
+                squares = (king,) + rest
+                occupied = set(squares)
+                if len(occupied) < count or _attacked(codes, squares, squares[kings[stm ^ 1]], side):
+                    state[index] = RESOLVED
+                    continue
+                owner = {square: i for i, square in enumerate(squares)}
+                quiet = moves = 0
+                best_win = 0
+                for i in range(count):
+                    if colours[i] != side:
+                        continue
+                    for target in _targets(codes[i], squares[i], occupied):
+                        victim = owner.get(target, -1)
+                        if victim >= 0 and (colours[victim] == side or victim in kings):
+                            continue
+                        after = list(squares)
+                        after[i] = target
+                        if _attacked(codes, after, after[kings[stm]], other, victim):
+                            continue
+                        moves += 1
+                        if victim < 0:
+                            quiet += 1
+                            continue
+                        del after[victim]
+                        result, distance = tablebases.probe_position(captures[victim], after, stm ^ 1)
+                        if result < 0:
+                            best_win = min(best_win or 255, distance + 1)
+                        elif result > 0:
+                            exit_loss[index] = max(exit_loss[index], distance + 1)
+                        else:
+                            state[index] |= CANNOT_LOSE
+                if not moves:
+                    if _attacked(codes, squares, squares[kings[stm]], other):
+                        buckets[0].append(index)
+                    else:
+                        state[index] = RESOLVED
+                    continue
+                remaining[index] = quiet
+                if best_win:
+                    state[index] |= CANNOT_LOSE
+                    buckets[best_win].append(index)
+                elif not quiet and not state[index] & CANNOT_LOSE:
+                    buckets[exit_loss[index]].append(index)
+
+    # Propagation rétrograde, demi-coup par demi-coup
+    block = 64 ** (count - 1)
+    for ply in range(256):
+        for index in buckets[ply]:
+            if state[index] & RESOLVED:
+                continue
+            state[index] |= RESOLVED
+            values[index] = ply + 1
+            stm, rest = divmod(index, len(TRIANGLE) * block)
+            squares = [TRIANGLE[rest // block]]
+            for power in range(count - 2, -1, -1):
+                squares.append(rest // 64 ** power % 64)
+            mover = (stm ^ 1) * NOIR
+            # Toutes les images symétriques de la position rangées à cet index
+            images = {tuple(symmetry[square] for square in squares) for symmetry in SYMMETRIES}
+            for image in images:
+                if _index(image, stm) != index:
+                    continue
+                occupied = set(image)
+                for i in range(count):
+                    if colours[i] != mover:
+                        continue
+                    for origin in _targets(codes[i], image[i], occupied):
+                        if origin in occupied:
+                            continue
+                        before = list(image)
+                        before[i] = origin
+                        if TRIANGLE_INDEX[before[0]] < 0:
+                            continue
+                        if _attacked(codes, before, before[kings[stm]], mover):
+                            continue
+                        previous = _index(before, stm ^ 1)
+                        if state[previous] & RESOLVED:
+                            continue
+                        if ply + 1 > 254:
+                            raise ValueError(f"Distance au mat trop longue pour {name}")
+                        if not ply & 1:
+                            # La position est perdue pour son camp au trait : le coup précédent gagne
+                            buckets[ply + 1].append(previous)
+                        else:
+                            remaining[previous] -= 1
+                            if not remaining[previous] and not state[previous] & CANNOT_LOSE:
+                                buckets[max(ply + 1, exit_loss[previous])].append(previous)
+        buckets[ply] = None
+
+    tablebases.close()
+    os.makedirs(directory, exist_ok=True)
+    with open(path + '.tmp', 'wb') as f:
+        f.write(values)
+    os.replace(path + '.tmp', path)
+    logger.info("%s : %d positions gagnées, %d perdues", name,
+                sum(1 for value in values if value & 1 == 0 and value), sum(1 for value in values if value & 1))
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génération et consultation des tables de finales.")
+    parser.add_argument('--generate', nargs='+', metavar='TABLE', help="tables à construire (ou « all »)")
+    parser.add_argument('--pieces', type=int, default=MAX_PIECES, help="nombre de pièces maximal avec « all »")
+    parser.add_argument('--dir', default=TABLEBASE_DIR, help=f"répertoire des tables (défaut : {TABLEBASE_DIR})")
+    parser.add_argument('--fen', help="position à consulter")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.generate:
+        names = all_names(args.pieces) if args.generate == ['all'] else args.generate
+        for name in names:
+            if not os.path.exists(os.path.join(args.dir, parse_name(name)[0] + SUFFIX)):
+                generate(name, args.dir)
+    if args.fen:
+        from pgn import move_to_san
+
+        rules = ChessRules.from_fen(args.fen)
+        tablebases = Tablebases(args.dir)
+        probe = tablebases.probe(rules)
+        if probe is None:
+            print("Position absente des tables")
+            return 1
+        labels = {1: "gain", 0: "nulle", -1: "perte"}
+        print(f"{labels[probe[0]]} (mat en {probe[1]} demi-coups)" if probe[0] else "nulle")
+        for move in rules.generate_legal_moves(rules.current_turn):
+            san = move_to_san(rules, move)
+            rules.make_move(move)
+            result = tablebases.probe(rules)
+            rules.unmake_move()
+            if result is not None:
+                print(f"  {san:<8} {labels[-result[0]]:<6} {result[1] + 1 if result[0] else ''}")
+        tablebases.close()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+# Les modules du projet sont à plat à la racine du dépôt
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tablebase import generate  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def krk_dir(tmp_path_factory):
+    # KRvK se génère en quelques secondes ; les tables à 4 pièces sont bien trop longues ici
+    directory = tmp_path_factory.mktemp('tablebases')
+    generate('KRvK', str(directory))
+    return str(directory)
+
+
+@pytest.fixture(scope='session')
+def kqk_dir(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('tablebases')
+    generate('KQvK', str(directory))
+    return str(directory)
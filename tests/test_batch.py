@@ -0,0 +1,47 @@
+from batch import _outcome, validate_pgn_shard
+from ChessRules import ChessRules
+
+
+class FixedTablebases:
+    """
+    Tables de finales factices : même réponse pour toute position.
+    """
+
+    max_pieces = 4
+
+    def __init__(self, result):
+        self.result = result
+
+    def probe(self, rules):
+        return self.result
+
+
+def test_outcome_consults_tablebases_before_material_rule():
+    # Fou et cavalier contre roi : gain des Blancs selon les tables
+    rules = ChessRules.from_fen('8/8/4k3/8/8/2BNK3/8/8 w - - 0 1')
+    assert _outcome(rules, FixedTablebases((1, 33))) == '1-0'
+    assert _outcome(rules, FixedTablebases((-1, 20))) == '0-1'
+    rules = ChessRules.from_fen('8/8/4k3/8/8/2BNK3/8/8 b - - 0 1')
+    assert _outcome(rules, FixedTablebases((-1, 32))) == '1-0'
+
+
+def _validate(tmp_path, text, tablebases_dir=None):
+    path = tmp_path / 'parties.pgn'
+    path.write_text(text, encoding='utf-8')
+    return validate_pgn_shard(str(path), 0, path.stat().st_size, tablebases_dir=tablebases_dir)
+
+
+def test_minor_piece_win_is_not_reported_as_draw(tmp_path):
+    pgn = '[FEN "8/8/4k3/8/8/2BNK3/8/8 w - - 0 1"]\n[Result "1-0"]\n\n1. Bd4 Kd5 1-0\n'
+    stats = _validate(tmp_path, pgn)
+    assert stats['errors'] == []
+    assert stats['results'] == {'1-0': 1}
+
+
+def test_adjudicated_result_is_checked(tmp_path, krk_dir):
+    fen = '[FEN "8/8/4k3/8/8/4K3/8/4R3 w - - 0 1"]\n'
+    stats = _validate(tmp_path, fen + '[Result "1-0"]\n\n1-0\n', krk_dir)
+    assert stats['adjudicated'] == 1 and stats['errors'] == []
+    stats = _validate(tmp_path, fen + '[Result "1/2-1/2"]\n\n1/2-1/2\n', krk_dir)
+    assert stats['adjudicated'] == 1
+    assert [error['error'] for error in stats['errors']] == ["résultat annoncé 1/2-1/2, table de finales 1-0"]
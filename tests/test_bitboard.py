@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from ChessRules import ChessRules
+from pieceEchec import VIDE, PION, CAVALIER, FOU, TOUR, REINE, ROI, NOIR
+
+NO_CASTLING = {
+    'blanc': {'king_side': False, 'queen_side': False},
+    'noir': {'king_side': False, 'queen_side': False},
+}
+
+
+def _check_bitboards(plateau):
+    for code in range(16):
+        squares = {index for index, c in enumerate(plateau.cases) if c == code} if code else set()
+        assert {index for index in range(64) if plateau.bitboards[code] >> index & 1} == squares
+    for colour in (0, 1):
+        occupied = {index for index, code in enumerate(plateau.cases) if code and code >> 3 == colour}
+        assert {index for index in range(64) if plateau.occupation[colour] >> index & 1} == occupied
+
+
+def _random_position(rng, pieces):
+    # Deux rois et `pieces` pièces au hasard, sans pion sur les rangées extrêmes
+    squares = rng.sample(range(64), pieces + 2)
+    position = {squares[0]: ROI, squares[1]: ROI | NOIR}
+    for index in squares[2:]:
+        kind = rng.choice((PION, CAVALIER, FOU, TOUR, REINE))
+        if kind == PION and (index < 8 or index >= 56):
+            kind = CAVALIER
+        position[index] = kind | rng.choice((0, NOIR))
+    return position
+
+
+def _set_up(position, turn, representation):
+    rules = ChessRules(representation)
+    for index in range(64):
+        rules.plateau.poser(index, position.get(index, VIDE))
+    rules.castling_rights = NO_CASTLING
+    rules.en_passant_target = None
+    rules.current_turn = turn
+    return rules
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_bitboard_matches_array_board_on_random_positions(seed):
+    rng = random.Random(seed)
+    for _ in range(25):
+        position = _random_position(rng, rng.randint(2, 14))
+        turn = rng.choice(('blanc', 'noir'))
+        tableau = _set_up(position, turn, 'tableau')
+        bitboard = _set_up(position, turn, 'bitboard')
+        _check_bitboards(bitboard.plateau)
+        assert sorted(bitboard.generate_legal_moves(turn)) == sorted(tableau.generate_legal_moves(turn))
+        for couleur in ('blanc', 'noir'):
+            assert bitboard.is_in_check(couleur) == tableau.is_in_check(couleur)
+        for index in range(64):
+            for attacker in (0, NOIR):
+                assert bitboard.plateau.est_attaquee(index, attacker) == tableau.plateau.est_attaquee(index, attacker)
+
+
+def test_bitboard_starting_position():
+    tableau, bitboard = ChessRules('tableau'), ChessRules('bitboard')
+    assert bitboard.plateau.cases == tableau.plateau.cases
+    _check_bitboards(bitboard.plateau)
+    assert sorted(bitboard.generate_legal_moves('blanc')) == sorted(tableau.generate_legal_moves('blanc'))
+    assert len(bitboard.generate_legal_moves('blanc')) == 20
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_bitboard_matches_array_board_on_random_games(seed):
+    # Les deux représentations rejouent la même partie aléatoire en parallèle
+    rng = random.Random(seed)
+    tableau, bitboard = ChessRules('tableau'), ChessRules('bitboard')
+    start = list(tableau.plateau.cases)
+    for _ in range(80):
+        moves = sorted(tableau.generate_legal_moves(tableau.current_turn))
+        assert sorted(bitboard.generate_legal_moves(bitboard.current_turn)) == moves
+        assert bitboard.plateau.cases == tableau.plateau.cases
+        assert (bitboard.castling, bitboard.ep_square) == (tableau.castling, tableau.ep_square)
+        _check_bitboards(bitboard.plateau)
+        if not moves:
+            break
+        move = rng.choice(moves)
+        tableau.make_move(move)
+        bitboard.make_move(move)
+    while tableau.undo_stack:
+        tableau.unmake_move()
+        bitboard.unmake_move()
+    assert bitboard.plateau.cases == tableau.plateau.cases == start
+    assert (tableau.current_turn, tableau.castling, tableau.ep_square) == ('blanc', 15, -1)
+    _check_bitboards(bitboard.plateau)
@@ -0,0 +1,53 @@
+import pytest
+
+from book import OpeningBook, decode_move, encode_polyglot, polyglot_key, write_book
+from ChessRules import ChessRules
+from pgn import san_to_move
+
+
+def test_polyglot_key_vectors():
+    # Valeurs de référence publiées avec la spécification Polyglot
+    rules = ChessRules()
+    assert polyglot_key(rules) == 0x463b96181691fc9c
+    expected = [('e4', 0x823c9b50fd114196), ('d5', 0x0756b94461c50fb0), ('e5', 0x662fafb965db29d4),
+                ('f5', 0x22a48b5a8e47ff78), ('Ke2', 0x652a607ca3f242c1), ('Kf7', 0x00fdd303c946bdd9)]
+    for san, key in expected:
+        rules.make_move(san_to_move(rules, san))
+        assert polyglot_key(rules) == key, san
+    rules = ChessRules.from_fen('rnbqkbnr/p1pppppp/8/8/PpP4P/8/1P1PPPP1/RNBQKBNR b KQkq c3 0 3')
+    assert polyglot_key(rules) == 0x3c8123ea7b067637
+    rules.make_move(san_to_move(rules, 'bxc3'))
+    rules.make_move(san_to_move(rules, 'Ra3'))
+    assert polyglot_key(rules) == 0x5c3f9b829b279560
+
+
+@pytest.mark.parametrize('fen', ['r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1',
+                                 'r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 0 1',
+                                 '4k3/1P6/8/8/8/8/8/4K3 w - - 0 1'])
+def test_move_encoding_round_trip(fen):
+    rules = ChessRules.from_fen(fen)
+    for move in rules.generate_legal_moves(rules.current_turn):
+        assert decode_move(rules, encode_polyglot(move)) == move
+
+
+def test_book_lookup(tmp_path):
+    rules = ChessRules()
+    e4, d4 = san_to_move(rules, 'e4'), san_to_move(rules, 'd4')
+    start = polyglot_key(rules)
+    other = polyglot_key(ChessRules.from_fen('4k3/8/8/8/8/8/8/4K3 w - - 0 1'))
+    path = tmp_path / 'livre.bin'
+    write_book(str(path), [(start, encode_polyglot(d4), 10), (other, 0, 1), (start, encode_polyglot(e4), 30)])
+    with OpeningBook(str(path)) as book:
+        assert len(book) == 3
+        assert book.moves(rules) == [(e4, 30), (d4, 10)]
+        assert book.choose(rules) in (e4, d4)
+        rules.make_move(e4)
+        assert book.moves(rules) == [] and book.choose(rules) is None
+
+
+def test_empty_book(tmp_path):
+    path = tmp_path / 'vide.bin'
+    path.write_bytes(b'')
+    with OpeningBook(str(path)) as book:
+        assert len(book) == 0
+        assert book.moves(ChessRules()) == []
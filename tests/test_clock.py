@@ -0,0 +1,95 @@
+import pytest
+
+from clock import ChessClock, FISCHER, BRONSTEIN, DELAY, format_time
+
+
+class FakeTime:
+    """
+    Horloge monotone pilotée par le test (secondes).
+    """
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def now():
+    return FakeTime()
+
+
+def test_fischer_adds_increment(now):
+    clock = ChessClock(60000, 2000, FISCHER, now=now)
+    clock.start('blanc')
+    now.now += 5.25
+    assert clock.remaining_ms('blanc') == 54750
+    assert clock.press()
+    assert clock.remaining_ms('blanc') == 56750
+    assert clock.turn == 'noir'
+    now.now += 1
+    assert clock.remaining_ms('noir') == 59000
+
+
+def test_bronstein_returns_time_used_up_to_increment(now):
+    clock = ChessClock(60000, 3000, BRONSTEIN, now=now)
+    clock.start('blanc')
+    now.now += 1.5
+    clock.press()
+    assert clock.remaining_ms('blanc') == 60000
+    now.now += 10
+    clock.press()
+    assert clock.remaining_ms('noir') == 53000
+
+
+def test_delay_starts_counting_after_increment(now):
+    clock = ChessClock(60000, 3000, DELAY, now=now)
+    clock.start('blanc')
+    now.now += 2.9
+    assert clock.remaining_ms('blanc') == 60000
+    now.now += 1.1
+    assert clock.remaining_ms('blanc') == 59000
+    clock.press()
+    assert clock.remaining_ms('blanc') == 59000
+
+
+def test_flag_fall_gives_no_increment(now):
+    clock = ChessClock(30000, 1000, FISCHER, now=now)
+    clock.start('blanc')
+    now.now += 30.001
+    assert clock.flagged('blanc')
+    assert not clock.press()
+    assert clock.remaining_ms('blanc') == 0
+    assert clock.turn is None
+
+
+def test_stop_freezes_remaining_time(now):
+    clock = ChessClock(30000, now=now)
+    clock.start('noir')
+    now.now += 4
+    clock.stop()
+    now.now += 100
+    assert clock.remaining_ms('noir') == 26000
+    assert clock.next_change_ms() is None
+    assert not clock.press()
+
+
+def test_display_and_next_change(now):
+    assert format_time(754000) == '12:34'
+    assert format_time(9470) == '09.4'
+    clock = ChessClock(10500, now=now)
+    clock.start('blanc')
+    assert clock.display('blanc') == '00:10'
+    assert clock.next_change_ms() == 501
+    now.now += 0.501
+    assert clock.display('blanc') == '09.9'
+    assert clock.next_change_ms() == 100
+    delay = ChessClock(10500, 2000, DELAY, now=now)
+    delay.start('blanc')
+    assert delay.next_change_ms() == 2501
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        ChessClock(1000, mode='sablier')
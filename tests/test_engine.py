@@ -0,0 +1,29 @@
+import time
+
+from ChessRules import START_FEN
+from engine import EngineWorker
+from search import TimeManager
+
+
+def _wait_for(worker, kind, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for message in worker.poll():
+            if message[1] == kind:
+                return message
+        time.sleep(0.01)
+    return None
+
+
+def test_stop_before_the_search_starts_is_kept():
+    worker = EngineWorker()
+    try:
+        # La seconde recherche attend que le fil abandonne la première
+        worker.start_search(START_FEN, [], TimeManager())
+        generation = worker.start_search(START_FEN, [], TimeManager())
+        worker.stop()
+        message = _wait_for(worker, 'bestmove')
+        assert message is not None and message[0] == generation
+        assert message[2].move is not None
+    finally:
+        worker.shutdown()
@@ -0,0 +1,31 @@
+import random
+
+import pytest
+
+from ChessRules import ChessRules
+from evaluation import evaluate, evaluate_from_scratch, evaluate_white
+from perft import POSITIONS, perft
+
+
+@pytest.mark.parametrize('representation', ['tableau', 'bitboard'])
+def test_incremental_sums_match_a_full_scan(representation):
+    rng = random.Random(representation)
+    rules = ChessRules.from_fen(POSITIONS['kiwipete'][0], representation)
+    evaluate(rules)
+    for _ in range(60):
+        moves = rules.generate_legal_moves(rules.current_turn)
+        if not moves:
+            break
+        rules.make_move(rng.choice(moves))
+        plateau = rules.plateau
+        assert (plateau.mg, plateau.eg, plateau.phase) == evaluate_from_scratch(plateau)
+    rules.set_fen(POSITIONS['promotions'][0])
+    assert (rules.plateau.mg, rules.plateau.eg, rules.plateau.phase) == evaluate_from_scratch(rules.plateau)
+
+
+def test_board_without_evaluation_keeps_no_sums():
+    rules = ChessRules()
+    perft(rules, 2)
+    assert rules.plateau.pst is None
+    assert evaluate_white(rules) == 0
+    assert rules.plateau.pst is not None
@@ -0,0 +1,34 @@
+import pytest
+
+from ChessRules import ChessRules, START_FEN
+from game import Game
+from perft import POSITIONS
+
+
+@pytest.mark.parametrize('representation', ['tableau', 'bitboard'])
+@pytest.mark.parametrize('fen', [START_FEN] + [fen for fen, _ in POSITIONS.values()] + [
+    '8/8/4k3/8/8/4K3/8/4R3 w - - 50 80',
+    'rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3',
+])
+def test_fen_round_trip(fen, representation):
+    assert ChessRules.from_fen(fen, representation).to_fen() == fen
+
+
+def test_fen_follows_the_game():
+    game = Game()
+    for uci in ('e2e4', 'c7c5', 'g1f3'):
+        game.play(uci)
+    assert game.fen() == 'rnbqkbnr/pp1ppppp/8/2p5/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2'
+
+
+def test_set_fen_replaces_the_position():
+    rules = ChessRules.from_fen(POSITIONS['kiwipete'][0])
+    rules.set_fen(START_FEN)
+    assert rules.to_fen() == START_FEN
+    assert rules.undo_stack == []
+
+
+@pytest.mark.parametrize('fen', ['', '8/8/8 w - - 0 1', 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x KQkq - 0 1'])
+def test_invalid_fen_is_rejected(fen):
+    with pytest.raises(ValueError):
+        ChessRules.from_fen(fen)
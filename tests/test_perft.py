@@ -0,0 +1,31 @@
+import pytest
+
+from ChessRules import ChessRules
+from perft import POSITIONS, check_rules, perft, perft_checked
+
+
+@pytest.mark.parametrize('name', sorted(POSITIONS))
+def test_interface_validation_agrees_with_generator(name):
+    fen, expected = POSITIONS[name]
+    rules = ChessRules.from_fen(fen)
+    mismatches = []
+    assert perft_checked(rules, 2, mismatches) == expected[1]
+    assert mismatches == []
+
+
+def test_check_rules_reports_rejected_castling():
+    rules = ChessRules.from_fen(POSITIONS['kiwipete'][0])
+    king_move = rules.is_valid_king_move
+    # Validation de l'interface qui aurait perdu le roque
+    rules.is_valid_king_move = lambda *squares: king_move(*squares) and abs(squares[3] - squares[1]) < 2
+    assert sorted(uci for _, uci, *_ in check_rules(rules)) == ['e1c1', 'e1g1']
+
+
+@pytest.mark.parametrize('representation', ['tableau', 'bitboard'])
+@pytest.mark.parametrize('name', sorted(POSITIONS))
+def test_perft_reference_counts(name, representation):
+    fen, expected = POSITIONS[name]
+    rules = ChessRules.from_fen(fen, representation)
+    for depth in (1, 2, 3):
+        assert perft(rules, depth) == expected[depth - 1]
+    assert rules.to_fen() == fen
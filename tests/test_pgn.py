@@ -0,0 +1,73 @@
+import io
+import random
+
+import pytest
+
+from ChessRules import ChessRules
+from perft import POSITIONS
+from pgn import PGNError, move_to_san, read_games, replay, san_to_move, write_game
+
+OPERA = """[Event "Opéra de Paris"]
+[Site "Paris"]
+[Date "1858.??.??"]
+[Round "?"]
+[White "Morphy"]
+[Black "Duke Karl / Count Isouard"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 d6 3. d4 Bg4 {Ce clouage ne tiendra pas} 4. dxe5 Bxf3 5. Qxf3
+dxe5 6. Bc4 Nf6 7. Qb3 Qe7 8. Nc3 c6 9. Bg5 b5 10. Nxb5 cxb5 11. Bxb5+ Nbd7
+12. O-O-O Rd8 13. Rxd7 Rxd7 14. Rd1 Qe6 15. Bxd7+ Nxd7 16. Qb8+ Nxb8 17. Rd8# 1-0
+"""
+
+
+def test_read_and_replay_a_game():
+    games = list(read_games(io.StringIO(OPERA)))
+    assert len(games) == 1
+    game = games[0]
+    assert game.headers['White'] == 'Morphy'
+    assert game.result == '1-0'
+    assert len(game.moves) == 33
+    rules = game.rules()
+    list(replay(rules, game.moves))
+    assert rules.is_checkmate(rules.current_turn)
+
+
+def test_written_game_reads_back_identically():
+    game = next(read_games(io.StringIO(OPERA)))
+    moves = list(replay(game.rules(), game.moves))
+    out = io.StringIO()
+    write_game(out, moves, game.headers, result=game.result)
+    again = next(read_games(io.StringIO(out.getvalue())))
+    assert again.moves == game.moves
+    assert again.headers == game.headers
+    assert again.result == '1-0'
+
+
+@pytest.mark.parametrize('name', sorted(POSITIONS))
+def test_san_round_trip_for_every_legal_move(name):
+    # Promotions, roques, prises en passant et levées d'ambiguïté des positions de référence
+    rules = ChessRules.from_fen(POSITIONS[name][0])
+    rng = random.Random(name)
+    for _ in range(20):
+        moves = rules.generate_legal_moves(rules.current_turn)
+        if not moves:
+            break
+        for move in moves:
+            assert san_to_move(rules, move_to_san(rules, move)) == move
+        rules.make_move(rng.choice(moves))
+
+
+def test_san_details():
+    rules = ChessRules.from_fen(POSITIONS['kiwipete'][0])
+    sans = {move_to_san(rules, move) for move in rules.generate_legal_moves(rules.current_turn)}
+    assert {'O-O', 'O-O-O', 'Qxf6', 'Nxf7', 'Bxa6', 'd6'} <= sans
+    rules = ChessRules.from_fen('4k3/8/8/8/8/8/1p6/R3K3 b - - 0 1')
+    sans = {move_to_san(rules, move) for move in rules.generate_legal_moves(rules.current_turn)}
+    assert {'bxa1=Q+', 'bxa1=N', 'b1=Q+', 'b1=B'} <= sans
+
+
+def test_illegal_san_is_rejected():
+    rules = ChessRules()
+    with pytest.raises(PGNError):
+        san_to_move(rules, 'e5')
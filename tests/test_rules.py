@@ -0,0 +1,56 @@
+import pytest
+
+from game import Game, IllegalMoveError
+
+
+def test_fifty_move_rule_counts_half_moves():
+    # Horloge à 50 demi-coups : seulement 25 coups par camp, la partie continue
+    assert Game('8/8/4k3/8/8/4K3/8/4R3 w - - 50 80').status is None
+    assert Game('8/8/4k3/8/8/4K3/8/4R3 w - - 100 80').status == 'fifty_moves'
+
+
+def test_fifty_move_rule_reached_by_a_move():
+    game = Game('8/8/4k3/8/8/4K3/8/4R3 w - - 99 80')
+    assert game.rules.is_fifty_move_rule() is False
+    assert game.play('e1a1') == 'fifty_moves'
+    assert game.rules.is_fifty_move_rule() is True
+    assert game.result == '1/2-1/2'
+
+
+def test_checkmate_on_the_hundredth_half_move_wins():
+    game = Game('6k1/5ppp/8/8/8/8/8/R5K1 w - - 99 80')
+    assert game.play('a1a8') == 'checkmate'
+    assert game.result == '1-0'
+
+
+def test_promotion_letter_only_on_promotions():
+    game = Game()
+    with pytest.raises(IllegalMoveError):
+        game.play('e2e4q')
+    assert game.moves == []
+    game = Game('4k3/P7/8/8/8/8/7p/4K3 w - - 0 1')
+    assert game.play('a7a8n') is None
+    assert game.moves[-1].uci() == 'a7a8n'
+
+
+def test_threefold_repetition():
+    game = Game()
+    shuffle = ('g1f3', 'g8f6', 'f3g1', 'f6g8')
+    for uci in shuffle:
+        assert game.play(uci) is None
+    for uci in shuffle[:3]:
+        assert game.play(uci) is None
+    assert game.play(shuffle[3]) == 'repetition'
+
+
+def test_insufficient_material_only_for_dead_positions():
+    for fen in ('8/8/4k3/8/8/4K3/8/8 w - - 0 1',
+                '8/8/4k3/8/8/2B1K3/8/8 w - - 0 1',
+                '8/8/4k3/8/8/2N1K3/8/8 w - - 0 1',
+                '8/8/4kb2/8/8/2B1K3/8/8 w - - 0 1'):
+        assert Game(fen).status == 'insufficient_material', fen
+    for fen in ('8/8/4k3/8/8/2BNK3/8/8 w - - 0 1',
+                '8/8/4k3/8/8/2BBK3/8/8 w - - 0 1',
+                '8/8/2b1k3/8/8/2B1K3/8/8 w - - 0 1',
+                '8/8/2n1k3/8/8/2N1K3/8/8 w - - 0 1'):
+        assert Game(fen).status is None, fen
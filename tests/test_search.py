@@ -0,0 +1,10 @@
+from ChessRules import ChessRules, move_to_uci
+from search import Search, MATE_SCORE
+
+
+def test_mate_on_the_hundredth_half_move_is_found():
+    # Le mat du 100e demi-coup n'est pas une nulle par la règle des 50 coups
+    rules = ChessRules.from_fen('6k1/5ppp/8/8/8/8/8/R5K1 w - - 99 80')
+    result = Search(rules).search(max_depth=3)
+    assert move_to_uci(result.move) == 'a1a8'
+    assert result.score == MATE_SCORE - 1
@@ -0,0 +1,25 @@
+import pytest
+
+pytest.importorskip('tkinter')
+
+from skin_cache import MAX_ZOOM, scale_factors  # noqa: E402
+
+
+def test_exact_sizes_only_subsample():
+    assert scale_factors(256, 64) == (1, 4)
+    assert scale_factors(256, 128) == (1, 2)
+    assert scale_factors(256, 256) == (1, 1)
+
+
+def test_near_fit_within_tolerance():
+    # 60 pixels : 256 * 2 // 9 = 56, sans image intermédiaire de plus de 512 pixels
+    assert scale_factors(256, 60) == (2, 9)
+    for size in range(24, 129):
+        zoom, subsample = scale_factors(256, size)
+        assert zoom <= MAX_ZOOM
+        assert 0.8 * size <= 256 * zoom // subsample <= size
+
+
+def test_small_source_is_not_enlarged_past_the_square():
+    zoom, subsample = scale_factors(40, 60)
+    assert 40 * zoom // subsample <= 60
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from ChessRules import ChessRules, move_to_uci
+from search import Search, MATE_SCORE
+from tablebase import Tablebases, _decode
+
+
+def test_tablebase_distance_parity(krk_dir):
+    tablebases = Tablebases(krk_dir)
+    # Mat en un : le camp au trait gagne en 1 demi-coup ; après le mat, il est perdu en 0
+    rules = ChessRules.from_fen('4k3/8/4K3/8/8/8/8/R7 w - - 0 1')
+    assert tablebases.probe(rules) == (1, 1)
+    rules = ChessRules.from_fen('R3k3/8/4K3/8/8/8/8/8 b - - 0 1')
+    assert tablebases.probe(rules) == (-1, 0)
+    tablebases.close()
+
+
+@pytest.mark.parametrize('name, longest', [('KQvK', 19), ('KRvK', 31)])
+def test_longest_mates(name, longest, krk_dir, kqk_dir):
+    # Mat en 10 (KQvK) et en 16 (KRvK) coups au plus, soit 19 et 31 demi-coups
+    tablebases = Tablebases(kqk_dir if name == 'KQvK' else krk_dir)
+    wins = [distance for result, distance in map(_decode, bytes(tablebases.table(name))) if result == 1]
+    assert max(wins) == longest
+    tablebases.close()
+
+
+def _flip(fen):
+    # Même position, couleurs échangées et plateau retourné
+    placement, turn = fen.split()[:2]
+    ranks = placement.swapcase().split('/')[::-1]
+    return f"{'/'.join(ranks)} {'b' if turn == 'w' else 'w'} - - 0 1"
+
+
+def test_colour_flipped_positions_agree(krk_dir):
+    tablebases = Tablebases(krk_dir)
+    rng = random.Random(0)
+    for _ in range(300):
+        squares = rng.sample(range(64), 3)
+        board = ['1'] * 64
+        for square, piece in zip(squares, 'KRk'):
+            board[square] = piece
+        placement = '/'.join(''.join(board[rank * 8:rank * 8 + 8]) for rank in range(8))
+        fen = f"{placement} {rng.choice('wb')} - - 0 1"
+        expected = tablebases.probe(ChessRules.from_fen(fen))
+        assert tablebases.probe(ChessRules.from_fen(_flip(fen))) == expected
+    tablebases.close()
+
+
+def test_search_follows_the_tablebase_at_the_root(krk_dir):
+    tablebases = Tablebases(krk_dir)
+    rules = ChessRules.from_fen('8/8/8/3k4/8/8/8/R3K3 w - - 0 1')
+    result, distance = tablebases.probe(rules)
+    assert result == 1
+    # Dès la profondeur 1, le score est le mat exact annoncé par la table
+    found = Search(rules, tablebases=tablebases).search(max_depth=1)
+    assert found.score == MATE_SCORE - distance
+    rules.make_move(found.move)
+    assert tablebases.probe(rules) == (-1, distance - 1), move_to_uci(found.move)
+    tablebases.close()
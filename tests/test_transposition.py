@@ -0,0 +1,69 @@
+from multiprocessing import shared_memory
+
+from transposition import (
+    TranspositionTable, BOUND_EXACT, BOUND_LOWER, BOUND_UPPER, table_bytes,
+)
+
+
+def test_store_then_probe():
+    tt = TranspositionTable(1)
+    key = 0x123456789ABCDEF0
+    assert tt.probe(key) is None
+    tt.store(key, 4321, -250, 7, BOUND_LOWER)
+    assert tt.probe(key) == (4321, -250, 7, BOUND_LOWER)
+    # Même seau, autre clé : pas de faux positif
+    assert tt.probe(key ^ (1 << 60)) is None
+    assert (tt.stores, tt.hits) == (1, 1)
+
+
+def test_scores_keep_their_sign_and_range():
+    tt = TranspositionTable(1)
+    for key, score in enumerate((-100000, -1, 0, 1, 99999), start=1):
+        tt.store(key, 0, score, 1, BOUND_EXACT)
+        assert tt.probe(key)[1] == score
+
+
+def test_new_store_without_move_keeps_best_move():
+    tt = TranspositionTable(1)
+    tt.store(42, 777, 10, 3, BOUND_EXACT)
+    tt.store(42, 0, 30, 5, BOUND_UPPER)
+    assert tt.probe(42) == (777, 30, 5, BOUND_UPPER)
+
+
+def test_replacement_keeps_deeper_entry_of_the_same_search():
+    tt = TranspositionTable(1)
+    stride = tt.mask + 1
+    deep, shallow, newer = 5, 5 + stride, 5 + 2 * stride  # trois clés du même seau
+    tt.store(deep, 1, 0, 9, BOUND_EXACT)
+    tt.store(shallow, 2, 0, 2, BOUND_EXACT)
+    tt.store(newer, 3, 0, 1, BOUND_EXACT)
+    # La place prioritaire garde l'entrée profonde, la seconde est toujours remplacée
+    assert tt.probe(deep) == (1, 0, 9, BOUND_EXACT)
+    assert tt.probe(shallow) is None
+    assert tt.probe(newer) == (3, 0, 1, BOUND_EXACT)
+    tt.new_search()
+    tt.store(shallow, 2, 0, 2, BOUND_EXACT)
+    # Entrée d'une recherche précédente : remplaçable même plus profonde
+    assert tt.probe(deep) is None
+    assert tt.probe(shallow) == (2, 0, 2, BOUND_EXACT)
+
+
+def test_clear_and_bounded_memory():
+    tt = TranspositionTable(1)
+    assert len(tt) * 16 <= 1 << 20
+    tt.store(9, 1, 0, 1, BOUND_EXACT)
+    tt.clear()
+    assert tt.probe(9) is None
+
+
+def test_table_in_shared_buffer():
+    memory = shared_memory.SharedMemory(create=True, size=table_bytes(1))
+    try:
+        writer = TranspositionTable(1, buffer=memory.buf)
+        reader = TranspositionTable(1, buffer=memory.buf)
+        writer.store(31337, 12, 34, 5, BOUND_EXACT)
+        assert reader.probe(31337) == (12, 34, 5, BOUND_EXACT)
+        del writer, reader
+    finally:
+        memory.close()
+        memory.unlink()
@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from ChessRules import ChessRules, move_to_uci
+
+
+def _rebuilt_hash(rules, representation):
+    # Même position posée case par case : clé recalculée entièrement
+    copy = ChessRules(representation)
+    for index, code in enumerate(rules.plateau.cases):
+        copy.plateau.poser(index, code)
+    copy.current_turn = rules.current_turn
+    copy.castling = rules.castling
+    copy.ep_square = rules.ep_square
+    copy.reset_hash()
+    return copy.hash
+
+
+def _play(rules, *ucis):
+    for uci in ucis:
+        moves = [move for move in rules.generate_legal_moves(rules.current_turn) if move_to_uci(move) == uci]
+        assert moves, uci
+        rules.make_move(moves[0])
+
+
+@pytest.mark.parametrize('representation', ['tableau', 'bitboard'])
+@pytest.mark.parametrize('seed', range(5))
+def test_incremental_key_matches_key_from_scratch(seed, representation):
+    rng = random.Random(seed)
+    rules = ChessRules(representation)
+    keys = [rules.hash]
+    for _ in range(80):
+        moves = rules.generate_legal_moves(rules.current_turn)
+        if not moves:
+            break
+        rules.make_move(rng.choice(moves))
+        assert rules.hash == _rebuilt_hash(rules, representation)
+        assert rules.hash == rules.hash_history[-1]
+        keys.append(rules.hash)
+    while rules.undo_stack:
+        assert rules.hash == keys.pop()
+        rules.unmake_move()
+    assert rules.hash == keys.pop()
+
+
+def test_transpositions_share_a_key():
+    first, second = ChessRules(), ChessRules()
+    _play(first, 'g1f3', 'g8f6', 'b1c3')
+    _play(second, 'b1c3', 'g8f6', 'g1f3')
+    assert first.hash == second.hash
+
+
+def test_en_passant_only_counts_when_capture_is_possible():
+    # Double pas sans pion adverse à côté : même clé que sans case en passant
+    rules = ChessRules()
+    _play(rules, 'e2e4')
+    assert rules.ep_square >= 0
+    assert rules.hash == _rebuilt_hash(rules, 'tableau')
+    rules.ep_square = -1
+    assert rules._compute_hash() == rules.hash
+    # Le pion noir en d4 peut prendre en passant : la colonne change la clé
+    rules = ChessRules()
+    _play(rules, 'g1f3', 'd7d5', 'b1c3', 'd5d4', 'e2e4')
+    with_ep = rules.hash
+    rules.ep_square = -1
+    assert rules._compute_hash() != with_ep
+
+
+def test_position_edits_keep_history_and_attack_maps_in_sync():
+    rules = ChessRules.from_fen('4k3/8/8/8/3pP3/8/8/4K3 b - e3 0 1')
+    assert rules.is_square_under_attack('e3', 'noir')
+    rules.en_passant_target = None
+    assert rules.hash_history[-1] == rules.hash == ChessRules.from_fen('4k3/8/8/8/3pP3/8/8/4K3 b - - 0 1').hash
+    rules.set_piece('d4', None)
+    assert rules.hash_history[-1] == rules.hash == ChessRules.from_fen('4k3/8/8/8/4P3/8/8/4K3 b - - 0 1').hash
+    assert not rules.is_square_under_attack('e3', 'noir')
+    rules.castling_rights = {'blanc': {'king_side': False, 'queen_side': False},
+                             'noir': {'king_side': False, 'queen_side': False}}
+    assert rules.hash_history == [rules.hash]
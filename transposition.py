@@ -0,0 +1,153 @@
+"""
+Table de transposition à mémoire bornée pour la recherche.
+
+Les entrées sont rangées dans deux tableaux array('Q') de même taille : la
+clé de Zobrist complète et un mot de 64 bits regroupant
+    coup (18 bits) | borne (2) | profondeur (8) | âge (8) | score + 2**23 (24).
+Chaque seau compte deux places : la première est conservée tant qu'une
+recherche plus profonde (ou d'une recherche plus récente) ne la remplace pas,
+la seconde est toujours remplacée.
+
+La clé est rangée XORée avec le mot de données : une entrée écrite à moitié
+par un autre processus (table en mémoire partagée, voir parallel.py) ne
+correspond alors à aucune clé et est simplement ignorée.
+"""
+from array import array
+
+BOUND_NONE, BOUND_EXACT, BOUND_LOWER, BOUND_UPPER = range(4)
+
+ENTRY_BYTES = 16
+_SCORE_OFFSET = 1 << 23
+_MOVE_MASK = (1 << 18) - 1
+
+
+def _buckets(size_mb):
+    entries = max(2, size_mb * 1024 * 1024 // ENTRY_BYTES)
+    buckets = 1
+    while buckets * 4 <= entries:
+        buckets *= 2
+    return buckets
+
+
+def table_bytes(size_mb):
+    """
+    Taille en octets d'une table de `size_mb` mégaoctets (puissance de deux inférieure).
+    """
+    return _buckets(size_mb) * 2 * ENTRY_BYTES
+
+
+class TranspositionTable:
+    """
+    Table de transposition de `size_mb` mégaoctets indexée par le hachage de Zobrist.
+    """
+
+    def __init__(self, size_mb=16, buffer=None):
+        """
+        `buffer` (par exemple SharedMemory.buf) d'au moins table_bytes(size_mb)
+        octets remplace les tableaux privés, pour partager la table entre processus.
+        """
+        buckets = _buckets(size_mb)
+        self.size_mb = size_mb
+        self.mask = buckets - 1
+        if buffer is None:
+            self._raw = None
+            self.keys = array('Q', bytes(8 * 2 * buckets))
+            self.data = array('Q', bytes(8 * 2 * buckets))
+        else:
+            self._raw = memoryview(buffer).cast('B')[:table_bytes(size_mb)]
+            words = self._raw.cast('Q')
+            self.keys = words[:2 * buckets]
+            self.data = words[2 * buckets:]
+        self.age = 0
+        self.reset_stats()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def clear(self):
+        if self._raw is not None:
+            self._raw[:] = bytes(len(self._raw))
+        else:
+            self.keys = array('Q', bytes(8 * len(self.keys)))
+            self.data = array('Q', bytes(8 * len(self.data)))
+        self.age = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def new_search(self):
+        """
+        Change d'âge : les entrées des recherches précédentes deviennent remplaçables.
+        """
+        self.age = (self.age + 1) & 0xFF
+
+    def probe(self, key):
+        """
+        Entrée de la position `key` : (coup, score, profondeur, borne), ou None.
+        """
+        self.probes += 1
+        index = (key & self.mask) << 1
+        keys, data = self.keys, self.data
+        word = data[index]
+        if keys[index] ^ word != key:
+            word = data[index + 1]
+            if keys[index + 1] ^ word != key:
+                return None
+        bound = (word >> 18) & 3
+        if bound == BOUND_NONE:
+            return None
+        self.hits += 1
+        return word & _MOVE_MASK, (word >> 40) - _SCORE_OFFSET, (word >> 20) & 0xFF, bound
+
+    def store(self, key, move, score, depth, bound):
+        self.stores += 1
+        index = (key & self.mask) << 1
+        keys, data = self.keys, self.data
+        word = data[index]
+        same = keys[index] ^ word == key
+        # Place prioritaire : même position, place vide, entrée périmée ou moins profonde
+        if not (same or not (word >> 18) & 3
+                or (word >> 32) & 0xFF != self.age or (word >> 20) & 0xFF <= depth):
+            index += 1
+            word = data[index]
+            same = keys[index] ^ word == key
+        if same and not move:
+            # On garde le meilleur coup connu si la nouvelle recherche n'en a pas
+            move = word & _MOVE_MASK
+        elif not same and (word >> 18) & 3:
+            self.replacements += 1
+        word = (move & _MOVE_MASK) | (bound << 18) | (max(0, min(depth, 255)) << 20) \
+            | (self.age << 32) | ((score + _SCORE_OFFSET) << 40)
+        data[index] = word
+        keys[index] = key ^ word
+
+    def hashfull(self, sample=1000):
+        """
+        Remplissage en pour mille, estimé sur les premières places et l'âge courant.
+        """
+        sample = min(sample, len(self.data))
+        data, age = self.data, self.age
+        used = sum(1 for i in range(sample) if (data[i] >> 18) & 3 and (data[i] >> 32) & 0xFF == age)
+        return used * 1000 // sample
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def stats(self):
+        """
+        Statistiques de réglage : sondages, succès, écritures, remplacements et remplissage.
+        """
+        return {
+            'size_mb': self.size_mb,
+            'entries': len(self.keys),
+            'probes': self.probes,
+            'hits': self.hits,
+            'hit_rate': round(self.hit_rate(), 4),
+            'stores': self.stores,
+            'replacements': self.replacements,
+            'hashfull': self.hashfull(),
+        }